@@ -0,0 +1,131 @@
+"""
+기사 본문 추출기 벤치마크: 빠른 스트리밍 추출기(extract_article_text)와
+기존 BeautifulSoup 방식(extract_article_text_legacy)의 파싱 시간과 최대 메모리를 비교합니다.
+
+기본 코퍼스는 저장소에 포함된 benchmarks/fixtures/ 의 합성 기사 페이지 4개입니다
+(EUC-KR 신문사형, UTF-8 포털형 article#dic_area, 영문 통신사형 <article>, 컨테이너 없는 영문 블로그형).
+실제 언론사 페이지는 저작권 문제로 커밋하지 않고 benchmarks/corpus/ (gitignore)에 저장해 측정합니다.
+
+사용법:
+    # 합성 코퍼스로 바로 실행
+    python benchmarks/bench_extraction.py --repeat 5
+
+    # 실제 기사 저장 (URL 인자 또는 한 줄에 URL 하나씩 적은 파일) 후 실행
+    python benchmarks/bench_extraction.py --save https://www.yna.co.kr/view/... https://www.reuters.com/...
+    python benchmarks/bench_extraction.py --urls-file my_urls.txt
+    python benchmarks/bench_extraction.py --corpus benchmarks/corpus --repeat 5
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import news_automation_script_v4 as news  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus")
+FIXTURE_CORPUS = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def save_pages(urls: list, corpus_dir: str):
+    """URL의 HTML 원문(바이트)을 코퍼스 디렉터리에 저장합니다."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    for url in urls:
+        try:
+            response = news.http_get(url, timeout=(5, 10))
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  ❌ 저장 실패: {url} ({str(e)[:80]})")
+            continue
+        host = urlparse(url).netloc.replace(':', '_')
+        name = f"{host}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}.html"
+        with open(os.path.join(corpus_dir, name), 'wb') as f:
+            f.write(response.content)
+        print(f"  ✅ 저장: {name} ({len(response.content) / 1024:.0f}KB)")
+
+
+def load_corpus(corpus_dir: str) -> list:
+    """(파일명, 바이트) 목록을 반환합니다."""
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(corpus_dir, name), 'rb') as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def measure(extractor, markup: bytes, max_length: int, repeat: int) -> tuple:
+    """(최소 소요 시간 ms, 최대 메모리 KB, 추출 글자 수)를 반환합니다."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = extractor(markup, max_length)
+        best = min(best, time.perf_counter() - started)
+
+    # 메모리 측정은 tracemalloc 오버헤드가 시간 측정에 섞이지 않도록 따로 1회 실행
+    tracemalloc.start()
+    extractor(markup, max_length)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024, len(text)
+
+
+def run_benchmark(pages: list, max_length: int, repeat: int):
+    engines = [("fast", news.extract_article_text), ("legacy", news.extract_article_text_legacy)]
+    totals = {name: [0.0, 0.0] for name, _ in engines}
+
+    print(f"{'page':<40} {'KB':>6} | {'fast ms':>8} {'peak KB':>8} | {'legacy ms':>9} {'peak KB':>8} | same")
+    for name, markup in pages:
+        row = {}
+        for engine, extractor in engines:
+            elapsed, peak, length = measure(extractor, markup, max_length, repeat)
+            row[engine] = (elapsed, peak, length)
+            totals[engine][0] += elapsed
+            totals[engine][1] = max(totals[engine][1], peak)
+        same = news.extract_article_text(markup, max_length) == news.extract_article_text_legacy(markup, max_length)
+        print(f"{name[:40]:<40} {len(markup) / 1024:>6.0f} | "
+              f"{row['fast'][0]:>8.2f} {row['fast'][1]:>8.0f} | "
+              f"{row['legacy'][0]:>9.2f} {row['legacy'][1]:>8.0f} | {'Y' if same else 'N'}")
+
+    print("-" * 90)
+    fast_ms, legacy_ms = totals['fast'][0], totals['legacy'][0]
+    print(f"합계 시간: fast {fast_ms:.1f}ms / legacy {legacy_ms:.1f}ms "
+          f"({legacy_ms / fast_ms if fast_ms else 0:.1f}배)")
+    print(f"최대 메모리: fast {totals['fast'][1]:.0f}KB / legacy {totals['legacy'][1]:.0f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 본문 추출기 벤치마크")
+    parser.add_argument("--corpus", help="HTML 코퍼스 디렉터리 (기본: benchmarks/corpus, 없으면 benchmarks/fixtures)")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="URL을 받아 코퍼스에 저장")
+    parser.add_argument("--urls-file", help="저장할 URL 목록 파일 (한 줄에 하나, #으로 시작하면 무시)")
+    parser.add_argument("--repeat", type=int, default=5, help="페이지별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--max-length", type=int, default=5000, help="추출 최대 글자 수")
+    args = parser.parse_args()
+
+    urls = list(args.save or [])
+    if args.urls_file:
+        with open(args.urls_file, encoding='utf-8') as f:
+            urls += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if urls:
+        save_pages(urls, args.corpus or DEFAULT_CORPUS)
+        return
+
+    if not args.corpus:
+        args.corpus = DEFAULT_CORPUS if os.path.isdir(DEFAULT_CORPUS) and os.listdir(DEFAULT_CORPUS) else FIXTURE_CORPUS
+
+    if not os.path.isdir(args.corpus):
+        sys.exit(f"코퍼스 디렉터리가 없습니다: {args.corpus} (--save URL ... 로 먼저 저장하세요)")
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"코퍼스에 HTML 파일이 없습니다: {args.corpus}")
+    run_benchmark(pages, args.max_length, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+시작 시간 벤치마크: 스크립트 모듈을 새 인터프리터에서 import하는 데 걸리는 시간과
+`python -X importtime` 기준으로 비용이 큰 import를 측정합니다.
+매 실행이 새 컨테이너에서 시작되므로, 콜드 스타트 시간이 곧 실행마다 고정으로 드는 비용입니다.
+
+사용법:
+    # 기본 시작 시간 (패키지 확인 생략)
+    python benchmarks/bench_startup.py --repeat 5
+
+    # 패키지 확인(--check-deps)을 켰을 때와 비교
+    python benchmarks/bench_startup.py --repeat 5 --check-deps
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_NAME = "news_automation_script_v4"
+
+# 단계가 실행될 때만 불러와야 하는 무거운 모듈 (import 직후 로드되어 있으면 안 됨)
+HEAVY_MODULES = ["feedparser", "openai", "bs4", "lxml", "googleapiclient", "google_auth_oauthlib", "numpy", "tiktoken"]
+
+IMPORT_SNIPPET = (
+    f"import sys; sys.path.insert(0, {ROOT!r}); import {MODULE_NAME}; "
+    f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def run_import(check_deps: bool, importtime: bool = False) -> tuple:
+    """새 인터프리터에서 모듈을 import하고 (소요 시간 ms, stdout, stderr)를 반환합니다."""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", IMPORT_SNIPPET]
+    env = dict(os.environ, CHECK_DEPENDENCIES="true" if check_deps else "false")
+
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        sys.exit(f"모듈 import 실패:\n{completed.stderr[-2000:]}")
+    return elapsed, completed.stdout, completed.stderr
+
+
+def parse_importtime(stderr: str) -> tuple:
+    """
+    -X importtime 출력에서 스크립트 모듈이 직접 import한 항목만 골라냅니다.
+
+    Returns:
+        tuple: (모듈 누적 us, [(누적 us, 자체 us, 모듈명), ...] 누적 시간 내림차순)
+    """
+    children = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth == 0:
+            # 하위 import가 부모보다 먼저 출력되므로, 부모 줄에서 그동안 모은 항목을 확정
+            if name.strip() == MODULE_NAME:
+                return int(cumulative_us), sorted(children, reverse=True)
+            children = []
+        elif depth == 1:
+            children.append((int(cumulative_us), int(self_us), name.strip()))
+    return 0, []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크립트 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--top", type=int, default=15, help="표시할 최상위 import 개수")
+    parser.add_argument("--check-deps", action="store_true", help="CHECK_DEPENDENCIES=true 로 측정")
+    args = parser.parse_args()
+
+    # 바이트코드 캐시를 만들어 두고 측정 (첫 실행의 컴파일 비용 제외)
+    run_import(args.check_deps)
+
+    timings = [run_import(args.check_deps)[0] for _ in range(args.repeat)]
+    baseline = min(run_import(False)[0] for _ in range(args.repeat)) if args.check_deps else None
+    _, stdout, stderr = run_import(args.check_deps, importtime=True)
+    module_us, rows = parse_importtime(stderr)
+
+    print(f"{'module':<40} {'cumulative ms':>14} {'self ms':>9}")
+    for cumulative_us, self_us, name in rows[:args.top]:
+        print(f"{name[:40]:<40} {cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}")
+    print("-" * 65)
+
+    print(f"{MODULE_NAME} import (-X importtime): {module_us / 1000:.1f}ms")
+    print(f"인터프리터 시작 + import: 최소 {min(timings):.1f}ms / 최대 {max(timings):.1f}ms ({args.repeat}회)")
+    if baseline is not None:
+        print(f"패키지 확인 생략 시: 최소 {baseline:.1f}ms (확인 비용 {min(timings) - baseline:.1f}ms)")
+
+    # 'loaded:' 줄이 로드된 무거운 모듈 목록 (그 앞은 패키지 확인 메시지)
+    loaded_line = next((line for line in stdout.splitlines() if line.startswith("loaded:")), "loaded:")
+    loaded = [name for name in loaded_line[len("loaded:"):].split(",") if name]
+    if loaded:
+        print(f"⚠️ import 시점에 로드된 무거운 모듈: {', '.join(loaded)}")
+    else:
+        print("✅ 무거운 모듈은 import 시점에 로드되지 않았습니다.")
+
+
+if __name__ == "__main__":
+    main()
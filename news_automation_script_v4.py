@@ -1,49 +1,53 @@
+import importlib.util
+import os
 import subprocess
 import sys
 
-# 필요한 패키지 자동 설치
+# 필요한 패키지 확인 및 설치 (pip 패키지 이름 -> import 이름)
+REQUIRED_PACKAGES = {
+    'feedparser': 'feedparser',
+    'requests': 'requests',
+    'beautifulsoup4': 'bs4',
+    'lxml': 'lxml',
+    'openai': 'openai',
+    'google-api-python-client': 'googleapiclient',
+    'google-auth-httplib2': 'google_auth_httplib2',
+    'google-auth-oauthlib': 'google_auth_oauthlib',
+    'brotli': 'brotli',
+    'tiktoken': 'tiktoken',
+    'numpy': 'numpy',
+}
+
+
 def install_required_packages():
-    """필요한 패키지들을 자동으로 설치하는 함수"""
-    required_packages = [
-        'feedparser',
-        'requests', 
-        'beautifulsoup4',
-        'lxml',
-        'openai',
-        'google-api-python-client',
-        'google-auth-httplib2',
-        'google-auth-oauthlib'
-    ]
-    
-    for package in required_packages:
-        try:
-            # 패키지명에서 하이픈을 언더스코어로 변경하여 import 시도
-            import_name = package.replace('-', '_')
-            if import_name == 'beautifulsoup4':
-                import_name = 'bs4'
-            elif import_name == 'google_api_python_client':
-                import_name = 'googleapiclient'
-            
-            __import__(import_name)
-            print(f"{package} is already installed.")
-        except ImportError:
-            print(f"Installing {package}...")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"Successfully installed {package}")
-            except subprocess.CalledProcessError as e:
-                print(f"Failed to install {package}: {e}")
+    """
+    필요한 패키지가 설치되어 있는지 확인하고, 없는 패키지만 한 번에 설치합니다.
+    모듈을 실제로 import하지 않고 find_spec()으로 존재 여부만 확인하므로 빠릅니다.
+    """
+    missing = [package for package, import_name in REQUIRED_PACKAGES.items()
+               if importlib.util.find_spec(import_name) is None]
+    if not missing:
+        print("모든 필수 패키지가 설치되어 있습니다.")
+        return
+
+    print(f"Installing {', '.join(missing)}...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+        print(f"Successfully installed {', '.join(missing)}")
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to install {', '.join(missing)}: {e}")
 
-# 패키지 설치 실행
-print("Checking and installing required packages...")
-install_required_packages()
-print("Package installation completed.")
 
-import feedparser
+# 패키지 확인은 선택 사항: 매 실행이 새 컨테이너인 환경에서는 워크플로가 이미 설치하므로 기본으로 건너뜀
+# (python news_automation_script_v4.py --check-deps 또는 CHECK_DEPENDENCIES=true 로 실행)
+if '--check-deps' in sys.argv or os.environ.get("CHECK_DEPENDENCIES", "false").lower() == "true":
+    print("Checking and installing required packages...")
+    install_required_packages()
+    print("Package installation completed.")
+
 import requests
 import json
 import re
-import openai
 import os.path
 import datetime
 import smtplib
@@ -51,17 +55,31 @@ import getpass
 import urllib.parse
 import time
 import warnings
+import threading
+import sqlite3
+import atexit
+import codecs
+import hashlib
+import random
+import queue
+import html
+import zlib
+import shutil
+import string
+import tempfile
 import urllib3
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.utils import formatdate
+from email.utils import formatdate, parsedate_to_datetime
 from email.header import Header
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 from urllib.parse import urlparse, parse_qs
-from bs4 import BeautifulSoup
+
+# feedparser, openai, bs4, lxml, Google API 클라이언트는 import 비용이 커서
+# 해당 단계가 처음 실행될 때 함수 안에서 불러옵니다 (시작 시간 단축).
 
 # ==============================================================================
 # --- 1. 사용자 설정 (GitHub Actions Secrets에서 자동으로 불러옵니다) ---
@@ -103,9 +121,196 @@ SENDER_EMAIL = os.environ.get("SENDER_EMAIL")
 GMAIL_PASSWORD = os.environ.get("GMAIL_PASSWORD")
 RECEIVER_EMAIL = [email.strip() for email in os.environ.get("RECEIVER_EMAIL", "").split(',') if email.strip()]
 
+# 이메일 발송 설정 (로컬 테스트용 SMTP 서버(aiosmtpd 등)를 쓰려면 SMTP_HOST/PORT 지정, STARTTLS 끄기)
+# - SMTP_POOL_SIZE: 동시에 사용하는 SMTP 연결 수 (묶음 병렬 발송 수)
+# - SMTP_CHUNK_SIZE: 한 번의 SMTP 트랜잭션에 넣는 수신자 수
+# - SMTP_MAX_RETRIES: 실행 안에서 묶음별 재시도 횟수
+# - SMTP_RETRY_MAX_RUNS: 실패 수신자를 다음 실행에서 다시 시도하는 최대 횟수
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_USERNAME = os.environ.get("SMTP_USERNAME", SENDER_EMAIL)
+SMTP_TIMEOUT = float(os.environ.get("SMTP_TIMEOUT", "30"))
+SMTP_POOL_SIZE = int(os.environ.get("SMTP_POOL_SIZE", "2"))
+SMTP_CHUNK_SIZE = int(os.environ.get("SMTP_CHUNK_SIZE", "50"))
+SMTP_MAX_RETRIES = int(os.environ.get("SMTP_MAX_RETRIES", "3"))
+SMTP_RETRY_MAX_RUNS = int(os.environ.get("SMTP_RETRY_MAX_RUNS", "5"))
+
 # Google API 설정
 SCOPES = ['https://www.googleapis.com/auth/documents', 'https://www.googleapis.com/auth/drive']
 
+# 구글 API 접속 주소 재정의 (테스트용 로컬 대체 서버, 예: http://localhost:8080/)
+# 지정하면 token.json이 없을 때 인증 없이 접속합니다.
+GOOGLE_API_ENDPOINT = os.environ.get("GOOGLE_API_ENDPOINT")
+# 액세스 토큰 만료까지 남은 시간이 이보다 짧을 때만 갱신 (초)
+GOOGLE_TOKEN_REFRESH_MARGIN = float(os.environ.get("GOOGLE_TOKEN_REFRESH_MARGIN", "300"))
+
+# 구글 문서 batchUpdate 배치 크기 제한과 재시도 횟수 (배치 단위로 반영 상황을 기록해 이어 쓰기 가능)
+DOCS_BATCH_MAX_REQUESTS = int(os.environ.get("DOCS_BATCH_MAX_REQUESTS", "150"))
+DOCS_BATCH_MAX_BYTES = int(os.environ.get("DOCS_BATCH_MAX_BYTES", str(256 * 1024)))
+DOCS_MAX_RETRIES = int(os.environ.get("DOCS_MAX_RETRIES", "5"))
+
+# 분석 단계 시작 시 문서를 미리 만들고, 분석이 끝난 기사를 순서대로 바로 덧붙임
+DOCS_INCREMENTAL = os.environ.get("DOCS_INCREMENTAL", "true").lower() in ("1", "true", "yes")
+
+# URL 리디렉션 추적 동시성 설정 (환경 변수로 조정 가능)
+# - RESOLVE_MAX_WORKERS: 전체 동시 작업자 수 (1이면 순차 처리)
+# - RESOLVE_PER_HOST_CONCURRENCY: 같은 호스트에 동시에 보내는 최대 요청 수
+# - RESOLVE_PER_HOST_INTERVAL: 같은 호스트에 대한 요청 사이 최소 간격(초)
+RESOLVE_MAX_WORKERS = int(os.environ.get("RESOLVE_MAX_WORKERS", "16"))
+RESOLVE_PER_HOST_CONCURRENCY = int(os.environ.get("RESOLVE_PER_HOST_CONCURRENCY", "2"))
+RESOLVE_PER_HOST_INTERVAL = float(os.environ.get("RESOLVE_PER_HOST_INTERVAL", "0.5"))
+
+# 실행 간에 유지되는 로컬 상태 저장소 (GitHub Actions cache로 다음 실행에 전달)
+STATE_DB_PATH = os.environ.get("NEWS_STATE_DB", "news_state.sqlite3")
+
+# URL 추적 결과 캐시 유효 기간 (성공은 길게, 실패는 짧게 보관)
+URL_CACHE_TTL_HOURS = float(os.environ.get("URL_CACHE_TTL_HOURS", "168"))
+URL_CACHE_NEGATIVE_TTL_HOURS = float(os.environ.get("URL_CACHE_NEGATIVE_TTL_HOURS", "6"))
+
+# URL 추적 방식
+# - 'head': HEAD 요청으로 리디렉션만 따라감 (본문 미수신). HEAD를 거부하는 호스트는
+#           헤더만 받고 닫는 스트리밍 GET으로 대체하며, 해당 호스트를 기록해 다음부터 바로 GET 사용
+# - 'get' : 전체 GET (본문을 받아 본문 추출 단계에서 재사용)
+RESOLVE_METHOD = os.environ.get("RESOLVE_METHOD", "head").lower()
+
+# 기사 본문 추출 엔진
+# - 'fast'  : lxml 파서에 HTML을 조각 단위로 흘려 넣으며 본문 후보의 텍스트만 모으고,
+#             max_length만큼 모이면 파싱을 멈추는 스트리밍 추출기 (결과가 비면 기존 방식으로 재시도)
+# - 'legacy': 기존 BeautifulSoup 전체 트리 + 후보 탐색 방식
+EXTRACTOR_ENGINE = os.environ.get("EXTRACTOR_ENGINE", "fast").lower()
+EXTRACTOR_CHUNK_SIZE = 16 * 1024
+EXTRACTOR_MAX_BYTES = int(os.environ.get("EXTRACTOR_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# 호스트별 본문 추출 프로필
+# - EXTRACTION_PROFILE_MIN_CHARS: 이 글자 수 이상 본문을 내놓은 선택자만 학습/성공으로 인정
+# - EXTRACTION_PROFILE_MAX_FAILURES: 프로필이 연속으로 이만큼 실패하면 교체 또는 삭제
+EXTRACTION_PROFILE_MIN_CHARS = int(os.environ.get("EXTRACTION_PROFILE_MIN_CHARS", "200"))
+EXTRACTION_PROFILE_MAX_FAILURES = int(os.environ.get("EXTRACTION_PROFILE_MAX_FAILURES", "3"))
+
+# RSS 피드 동시 수집 작업자 수 (ETag/Last-Modified 조건부 요청으로 변경 없는 피드는 건너뜀)
+RSS_MAX_WORKERS = int(os.environ.get("RSS_MAX_WORKERS", "8"))
+
+# 네이버 검색 API 설정
+# - 초당 호출 한도와 일일 호출 한도(기본 25,000회)를 지키며 검색어를 동시에 조회
+# - 검색어마다 지난 실행에서 본 가장 최신 기사 시각에 도달할 때까지 start 값으로 페이지를 넘김
+NAVER_MAX_WORKERS = int(os.environ.get("NAVER_MAX_WORKERS", "4"))
+NAVER_RATE_PER_SEC = float(os.environ.get("NAVER_RATE_PER_SEC", "8"))
+NAVER_DAILY_QUOTA = int(os.environ.get("NAVER_DAILY_QUOTA", "25000"))
+NAVER_DISPLAY = int(os.environ.get("NAVER_DISPLAY", "20"))
+NAVER_MAX_PAGES = int(os.environ.get("NAVER_MAX_PAGES", "5"))
+NAVER_INITIAL_LOOKBACK_HOURS = float(os.environ.get("NAVER_INITIAL_LOOKBACK_HOURS", "24"))
+
+# 증분 실행 모드: 지난 실행에서 이미 선별/분석 단계를 거친 기사는 AI 선별·분석 대상에서 제외
+INCREMENTAL_MODE = os.environ.get("INCREMENTAL_MODE", "false").lower() in ("1", "true", "yes")
+
+# AI 심층 분석 설정
+# - ANALYSIS_PROMPT_VERSION: 분석 프롬프트를 바꾸면 함께 올려야 이전 캐시 결과가 재사용되지 않음
+# - 분석 결과 캐시: (모델, 프롬프트 버전, 제목, 본문)이 같으면 저장된 분석을 그대로 사용
+ANALYSIS_MODEL = "gpt-4o"
+ANALYSIS_PROMPT_VERSION = "2024-analysis-v2-json"
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "2000"))
+ANALYSIS_CACHE_MAX_AGE_DAYS = float(os.environ.get("ANALYSIS_CACHE_MAX_AGE_DAYS", "30"))
+
+# AI 심층 분석 동시 실행 설정
+# - ANALYSIS_MAX_IN_FLIGHT: 동시에 진행하는 분석(본문 수집 + API 호출) 수
+# - ANALYSIS_RPM / ANALYSIS_TPM: 분당 요청 수 / 분당 토큰 수 한도 (계정 등급에 맞게 조정)
+# - ANALYSIS_MAX_RETRIES: 429·일시적 오류 시 재시도 횟수 (Retry-After 헤더를 우선 적용)
+ANALYSIS_MAX_IN_FLIGHT = int(os.environ.get("ANALYSIS_MAX_IN_FLIGHT", "4"))
+ANALYSIS_RPM = float(os.environ.get("ANALYSIS_RPM", "60"))
+ANALYSIS_TPM = float(os.environ.get("ANALYSIS_TPM", "30000"))
+ANALYSIS_MAX_RETRIES = int(os.environ.get("ANALYSIS_MAX_RETRIES", "5"))
+
+# AI 선별 전 로컬 유사 제목 묶음(MinHash + LSH) 설정
+# - NEAR_DUP_THRESHOLD: 같은 묶음으로 볼 제목 n-gram 자카드 유사도 추정치 하한
+# - MINHASH_PERMUTATIONS = LSH_BANDS × 밴드당 행 수
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.5"))
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+TITLE_SHINGLE_SIZE = 3
+
+# AI 뉴스 선별 토너먼트 설정
+# - 선별 프롬프트가 SELECTION_PROMPT_TOKEN_THRESHOLD 토큰을 넘으면 후보를 SELECTION_CHUNK_TOKENS 크기의
+#   묶음으로 나눠 병렬로 예선(묶음별 SELECTION_CHUNK_WINNERS개)을 치르고, 예선 통과 기사로 결선을 진행
+SELECTION_COUNT = 20
+SELECTION_PROMPT_TOKEN_THRESHOLD = int(os.environ.get("SELECTION_PROMPT_TOKEN_THRESHOLD", "6000"))
+SELECTION_CHUNK_TOKENS = int(os.environ.get("SELECTION_CHUNK_TOKENS", "3000"))
+SELECTION_CHUNK_WINNERS = int(os.environ.get("SELECTION_CHUNK_WINNERS", "10"))
+SELECTION_MAX_WORKERS = int(os.environ.get("SELECTION_MAX_WORKERS", "4"))
+# 결선 목록이 여전히 기준을 넘을 때 예선을 다시 치르는 최대 단계 수 (넘으면 바로 결선)
+SELECTION_MAX_ROUNDS = int(os.environ.get("SELECTION_MAX_ROUNDS", "3"))
+
+# AI 선별 전 로컬 관련도 사전 순위화 (NumPy, CPU 전용)
+# - SELECTION_MODE: 'prerank'(로컬 점수 상위 PRERANK_TOP_K개만 AI에 전달) 또는 'llm'(기존 방식, 비교용)
+SELECTION_MODE = os.environ.get("SELECTION_MODE", "prerank").lower()
+PRERANK_TOP_K = int(os.environ.get("PRERANK_TOP_K", "150"))
+PRERANK_TITLE_WEIGHT = 2.0
+PRERANK_FEATURE_BITS = 20
+
+# 선별 프롬프트의 [선별 최우선 기준]을 옮긴 가중 키워드 (NAVER_QUERIES는 가중치 1.0으로 추가)
+PRERANK_PRIORITY_TERMS = {
+    "FCC": 3.0, "ETSI": 3.0, "3GPP": 3.0, "ITU": 3.0, "ITU-R": 3.0, "ofcom": 2.5,
+    "표준": 2.5, "표준화": 2.5, "standard": 2.0, "standardization": 2.5,
+    "정부": 2.0, "정부 발표": 2.5, "과기정통부": 2.5, "과학기술정보통신부": 2.5, "방통위": 2.0,
+    "정책": 2.0, "policy": 2.0, "규제": 2.0, "regulation": 2.0, "법안": 2.0, "bill": 1.5, "rule": 1.5,
+    "주파수": 2.0, "spectrum": 2.0, "할당": 1.5, "allocation": 1.5,
+    "위성": 1.5, "satellite": 1.5, "저궤도": 1.5, "6G": 1.5, "NTN": 1.5, "IMT-2030": 2.0,
+}
+
+# AI 분석 전 본문 압축
+# - COMPRESSION_TOKEN_BUDGET: 분석에 넘길 본문의 최대 토큰 수 (0이면 압축하지 않고 기존처럼 5000자 절단)
+#   기본값 3000은 기존 5000자 입력(한국어 기사 기준 약 3000토큰)과 비슷한 크기로, 예산 안의 기사는
+#   상용구·중복 문장만 빠지고 사실 문장은 그대로 전달됨 (긴 기사만 중요 문장 위주로 줄어듦)
+# - ARTICLE_MAX_CHARS: 압축 전에 추출할 본문 최대 글자 수 (잘리는 사실이 없도록 넉넉하게 추출)
+# - COMPRESSION_NEAR_DUP_THRESHOLD: 이 값 이상 비슷한 문장은 중복으로 보고 제거
+COMPRESSION_TOKEN_BUDGET = int(os.environ.get("COMPRESSION_TOKEN_BUDGET", "3000"))
+ARTICLE_MAX_CHARS = int(os.environ.get("ARTICLE_MAX_CHARS", "12000" if COMPRESSION_TOKEN_BUDGET > 0 else "5000"))
+COMPRESSION_NEAR_DUP_THRESHOLD = float(os.environ.get("COMPRESSION_NEAR_DUP_THRESHOLD", "0.8"))
+
+# 본문 수집 → AI 분석 → 보고서 조립 스트리밍 파이프라인 설정
+# - PIPELINE_FETCH_WORKERS: 본문 수집 작업자 수
+# - PIPELINE_QUEUE_SIZE: 단계 사이 대기열 크기 (분석보다 몇 건 앞서 본문을 받아 둘지)
+PIPELINE_FETCH_WORKERS = int(os.environ.get("PIPELINE_FETCH_WORKERS", "4"))
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "4"))
+
+# 지연 추적 모드: 수집 단계에서는 URL을 추적하지 않고, AI가 선별한 뉴스만 추적
+# - LAZY_RESOLVE_OTHER_NEWS: 선별되지 않은 '기타 뉴스'도 분석 중 백그라운드로 추적 (선택 사항, 기본 끔)
+#   끄면 기타 뉴스는 수집 단계의 링크(네이버 원문 링크, 구글 알리미에서 추출한 URL)를 그대로 사용
+LAZY_URL_RESOLUTION = os.environ.get("LAZY_URL_RESOLUTION", "false").lower() in ("1", "true", "yes")
+LAZY_RESOLVE_OTHER_NEWS = os.environ.get("LAZY_RESOLVE_OTHER_NEWS", "false").lower() in ("1", "true", "yes")
+
+# URL 추적 시 받은 응답 본문 보관 한도 (본문 추출 시 재다운로드 방지)
+# - 메모리 한도를 넘으면 오래된 본문부터 임시 디스크로 내보내고, 디스크 한도도 넘으면 폐기
+BODY_STORE_MAX_MEMORY_MB = float(os.environ.get("BODY_STORE_MAX_MEMORY_MB", "64"))
+BODY_STORE_MAX_DISK_MB = float(os.environ.get("BODY_STORE_MAX_DISK_MB", "256"))
+BODY_STORE_MAX_ITEM_KB = float(os.environ.get("BODY_STORE_MAX_ITEM_KB", "2048"))
+
+# 한국 언론사 도메인 → 언론사 이름
+SOURCE_MAPPING = {
+    'chosun': '조선일보', 'donga': '동아일보', 'joongang': '중앙일보',
+    'hankyoreh': '한겨레', 'hani': '한겨레', 'khan': '경향신문',
+    'mt': '머니투데이', 'mk': '매일경제', 'seoul': '서울신문',
+    'ytn': 'YTN', 'sbs': 'SBS', 'kbs': 'KBS', 'mbc': 'MBC'
+}
+
+# 주요 언론사(SOURCE_MAPPING) 기사 본문 선택자 초기값 (호스트 → 선택자)
+# - 실행 중 학습한 프로필과 함께 extraction_profiles 테이블에 저장되며, 레이아웃이 바뀌어
+#   연속으로 실패하면 일반 후보 탐색 결과로 자동 교체됨
+EXTRACTION_PROFILE_SEEDS = {
+    'chosun.com': 'section.article-body',
+    'donga.com': 'section.news_view',
+    'joongang.co.kr': 'div#article_body',
+    'hani.co.kr': 'div.article-text',
+    'khan.co.kr': 'div#articleBody',
+    'news.mt.co.kr': 'div#textBody',
+    'mk.co.kr': 'div.news_cnt_detail_wrap',
+    'ytn.co.kr': 'div.paragraph',
+    'news.sbs.co.kr': 'div.text_area',
+    'news.kbs.co.kr': 'div#cont_newstext',
+    'imnews.imbc.com': 'div.news_txt',
+    'n.news.naver.com': 'article#dic_area',
+}
+
 # ==============================================================================
 # --- 1. 헬퍼 함수 (✨ 새로워진 버전) ---
 # ==============================================================================
@@ -166,60 +371,499 @@ def extract_google_alerts_url(google_url: str) -> str:
         print(f"    (경고) URL 추출 실패: {str(e)[:100]}")
         return google_url
 
-def get_final_url_and_source(url: str, max_retries: int = 2) -> tuple:
+
+# ------------------------------------------------------------------------------
+# 공용 HTTP 클라이언트 (커넥션 풀 + keep-alive 재사용)
+# ------------------------------------------------------------------------------
+def _supported_accept_encoding() -> str:
+    """brotli 디코더가 설치되어 있으면 br 압축도 요청합니다 (urllib3가 자동 해제)."""
+    for module_name in ('brotli', 'brotlicffi'):
+        try:
+            __import__(module_name)
+            return 'gzip, deflate, br'
+        except ImportError:
+            continue
+    return 'gzip, deflate'
+
+
+DEFAULT_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+    'Accept-Encoding': _supported_accept_encoding(),
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# (연결 타임아웃, 읽기 타임아웃)
+DEFAULT_HTTP_TIMEOUT = (5, 10)
+
+# 기사가 몰리는 호스트는 커넥션 풀을 더 크게 잡음 (호스트별 풀 크기)
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))
+HTTP_HOST_POOL_MAXSIZE = {
+    'https://openapi.naver.com': 16,
+    'https://n.news.naver.com': 16,
+    'https://www.google.com': 16,
+}
+
+_http_session = None
+_http_session_lock = threading.Lock()
+_insecure_http_session = None  # SSL 검증 실패 시 재시도 전용 세션 (검증 없는 연결을 공용 풀과 분리)
+
+
+def get_http_session() -> requests.Session:
+    """모든 외부 요청이 공유하는 requests.Session을 (최초 1회) 생성하여 반환합니다."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HTTP_HEADERS)
+                default_adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=64, pool_maxsize=max(HTTP_POOL_MAXSIZE, RESOLVE_PER_HOST_CONCURRENCY)
+                )
+                session.mount('http://', default_adapter)
+                session.mount('https://', default_adapter)
+                for prefix, pool_size in HTTP_HOST_POOL_MAXSIZE.items():
+                    session.mount(prefix, requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                _http_session = session
+    return _http_session
+
+
+def get_insecure_http_session() -> requests.Session:
+    """
+    SSL 검증 없이 재시도할 때만 쓰는 별도 세션을 (최초 1회) 생성합니다.
+    검증하지 않은 연결이 공용 세션의 커넥션 풀에 섞여 재사용되지 않도록 분리합니다.
+    """
+    global _insecure_http_session
+    if _insecure_http_session is None:
+        with _http_session_lock:
+            if _insecure_http_session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HTTP_HEADERS)
+                session.verify = False
+                _insecure_http_session = session
+    return _insecure_http_session
+
+
+def http_request(method: str, url: str, headers: dict = None, timeout=DEFAULT_HTTP_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    공용 세션으로 HTTP 요청을 보냅니다.
+    SSL 검증에 실패하면 해당 요청만 별도 세션에서 검증 없이 재시도합니다.
+    (리디렉션 대상의 인증서 문제일 수 있으므로 호스트를 기억해 두지 않습니다.)
+
+    Args:
+        method (str): HTTP 메서드 ('GET', 'HEAD' 등)
+        url (str): 요청할 URL
+        headers (dict): 기본 헤더에 덧붙일 헤더
+        timeout: requests 타임아웃 값
+        **kwargs: requests.Session.request()에 그대로 전달할 인자
+
+    Returns:
+        requests.Response: 응답 객체
+    """
+    try:
+        return get_http_session().request(method, url, headers=headers, timeout=timeout, verify=True, **kwargs)
+    except requests.exceptions.SSLError:
+        return get_insecure_http_session().request(method, url, headers=headers, timeout=timeout, verify=False, **kwargs)
+
+
+def http_get(url: str, headers: dict = None, timeout=DEFAULT_HTTP_TIMEOUT, **kwargs) -> requests.Response:
+    """공용 세션으로 GET 요청을 보냅니다 (http_request() 참고)."""
+    return http_request('GET', url, headers=headers, timeout=timeout, **kwargs)
+
+
+def http_head(url: str, headers: dict = None, timeout=DEFAULT_HTTP_TIMEOUT, **kwargs) -> requests.Response:
+    """공용 세션으로 HEAD 요청을 보냅니다 (http_request() 참고)."""
+    return http_request('HEAD', url, headers=headers, timeout=timeout, **kwargs)
+
+
+# ------------------------------------------------------------------------------
+# 로컬 상태 저장소 (SQLite) 및 URL 추적 결과 캐시
+# ------------------------------------------------------------------------------
+_state_db = None
+_state_db_lock = threading.RLock()
+
+
+def get_state_db() -> sqlite3.Connection:
+    """
+    실행 간에 유지되는 SQLite 상태 저장소 연결을 (최초 1회) 열어 반환합니다.
+    여러 스레드가 공유하므로 쿼리는 반드시 _state_db_lock 안에서 실행해야 합니다.
+    """
+    global _state_db
+    with _state_db_lock:
+        if _state_db is None:
+            connection = sqlite3.connect(STATE_DB_PATH, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            _state_db = connection
+            atexit.register(close_state_db)
+        return _state_db
+
+
+def close_state_db():
+    """WAL 내용을 본 파일에 반영하고 연결을 닫습니다 (캐시 파일 하나만 보존하면 되도록)."""
+    global _state_db
+    with _state_db_lock:
+        if _state_db is not None:
+            try:
+                _state_db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                _state_db.close()
+            except sqlite3.Error as e:
+                print(f"    (경고) 상태 저장소 종료 중 오류: {e}")
+            _state_db = None
+
+
+class ResolvedUrlCache:
+    """
+    입력 URL → (최종 URL, 언론사 이름, 성공 여부, 시각)을 저장하는 영구 캐시.
+    실패 결과도 더 짧은 유효 기간으로 저장(negative caching)해 같은 실패를 반복하지 않습니다.
+    """
+
+    def __init__(self, ttl_hours: float = URL_CACHE_TTL_HOURS, negative_ttl_hours: float = URL_CACHE_NEGATIVE_TTL_HOURS):
+        self.ttl_seconds = ttl_hours * 3600
+        self.negative_ttl_seconds = negative_ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS resolved_urls (
+                    url TEXT PRIMARY KEY,
+                    final_url TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    success INTEGER NOT NULL,
+                    resolved_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+
+    def get(self, url: str):
+        """유효한 캐시 항목이 있으면 (최종 URL, 언론사 이름, 성공 여부)를, 없으면 None을 반환합니다."""
+        with _state_db_lock:
+            row = get_state_db().execute(
+                "SELECT final_url, source, success, resolved_at FROM resolved_urls WHERE url = ?", (url,)
+            ).fetchone()
+            if row:
+                final_url, source, success, resolved_at = row
+                ttl = self.ttl_seconds if success else self.negative_ttl_seconds
+                if time.time() - resolved_at < ttl:
+                    self.hits += 1
+                    return final_url, source, bool(success)
+            self.misses += 1
+            return None
+
+    def put(self, url: str, final_url: str, source: str, success: bool):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO resolved_urls (url, final_url, source, success, resolved_at) VALUES (?, ?, ?, ?, ?)",
+                (url, final_url, source, int(bool(success)), time.time())
+            )
+            db.commit()
+
+    def prune(self):
+        """유효 기간이 지난 항목을 삭제합니다."""
+        now = time.time()
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "DELETE FROM resolved_urls WHERE (success = 1 AND resolved_at < ?) OR (success = 0 AND resolved_at < ?)",
+                (now - self.ttl_seconds, now - self.negative_ttl_seconds)
+            )
+            db.commit()
+
+
+class HeadFallbackHosts:
+    """
+    HEAD 요청을 거부해 GET으로 대체해야 하는 호스트 목록 (상태 저장소에 영구 기록).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fallback_count = 0
+        self.newly_recorded = []
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS head_fallback_hosts (
+                    host TEXT PRIMARY KEY,
+                    head_status INTEGER,
+                    recorded_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+            self._hosts = {row[0] for row in db.execute("SELECT host FROM head_fallback_hosts")}
+
+    def needs_get(self, host: str) -> bool:
+        return host in self._hosts
+
+    def record(self, host: str, head_status: int = None):
+        """HEAD 대신 GET이 필요한 호스트를 기록합니다."""
+        with self._lock:
+            self.fallback_count += 1
+            if host in self._hosts:
+                return
+            self._hosts.add(host)
+            self.newly_recorded.append(host)
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO head_fallback_hosts (host, head_status, recorded_at) VALUES (?, ?, ?)",
+                (host, head_status, time.time())
+            )
+            db.commit()
+
+
+_head_fallback_hosts = None
+
+
+def get_head_fallback_hosts():
+    """HEAD 대체 호스트 목록을 반환합니다. 상태 저장소를 열 수 없으면 None."""
+    global _head_fallback_hosts
+    with _state_db_lock:
+        if _head_fallback_hosts is None:
+            try:
+                _head_fallback_hosts = HeadFallbackHosts()
+            except sqlite3.Error as e:
+                print(f"    (경고) HEAD 대체 호스트 목록을 열 수 없습니다: {e}")
+                return None
+        return _head_fallback_hosts
+
+
+_url_cache = None
+
+
+def get_url_cache():
+    """URL 추적 캐시를 반환합니다. 상태 저장소를 열 수 없으면 None (캐시 없이 동작)."""
+    global _url_cache
+    with _state_db_lock:
+        if _url_cache is None:
+            try:
+                _url_cache = ResolvedUrlCache()
+                _url_cache.prune()
+            except sqlite3.Error as e:
+                print(f"    (경고) URL 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                return None
+        return _url_cache
+
+
+# ------------------------------------------------------------------------------
+# 응답 본문 보관소 (URL 추적 응답을 본문 추출에 재사용)
+# ------------------------------------------------------------------------------
+class ResponseBodyStore:
+    """
+    URL 추적 과정에서 받은 HTML 응답 본문을 보관하는 LRU 저장소.
+    메모리 한도를 넘으면 가장 오래된 본문을 임시 디렉터리로 내보내고(spill),
+    디스크 한도까지 넘으면 폐기합니다. 본문은 한 번 꺼내 쓰면 삭제됩니다.
+    """
+
+    def __init__(self, max_memory_bytes: int, max_disk_bytes: int, max_item_bytes: int):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_item_bytes = max_item_bytes
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # entry_id -> (content, encoding)
+        self._memory_bytes = 0
+        self._disk = OrderedDict()    # entry_id -> (path, size, encoding)
+        self._disk_bytes = 0
+        self._aliases = {}            # url -> entry_id (입력 URL과 최종 URL 모두 등록)
+        self._entry_urls = {}         # entry_id -> {url, ...}
+        self._spill_dir = None
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def put(self, urls: list, content: bytes, encoding: str = None):
+        """주어진 URL들(입력/최종)에 대해 응답 본문을 보관합니다. 크기 한도를 넘는 본문은 무시합니다."""
+        if not content or len(content) > self.max_item_bytes:
+            return
+        entry_id = hashlib.sha1(urls[-1].encode('utf-8')).hexdigest()
+        with self._lock:
+            self._discard(entry_id)
+            self._memory[entry_id] = (content, encoding)
+            self._memory_bytes += len(content)
+            self._entry_urls[entry_id] = set(urls)
+            for url in urls:
+                self._aliases[url] = entry_id
+            self._enforce_limits()
+
+    def take(self, url: str):
+        """보관된 본문을 (content, encoding)으로 꺼내고 저장소에서 삭제합니다. 없으면 None."""
+        with self._lock:
+            entry_id = self._aliases.get(url)
+            if entry_id in self._memory:
+                content, encoding = self._memory[entry_id]
+            elif entry_id in self._disk:
+                path, _, encoding = self._disk[entry_id]
+                try:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                except OSError:
+                    content = None
+            else:
+                content = None
+
+            if entry_id:
+                self._discard(entry_id)
+            if content is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return content, encoding
+
+    def clear(self):
+        """보관 중인 본문과 임시 디렉터리를 모두 삭제합니다."""
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._aliases.clear()
+            self._entry_urls.clear()
+            self._memory_bytes = self._disk_bytes = 0
+            if self._spill_dir:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+
+    def _discard(self, entry_id: str):
+        if entry_id in self._memory:
+            content, _ = self._memory.pop(entry_id)
+            self._memory_bytes -= len(content)
+        if entry_id in self._disk:
+            path, size, _ = self._disk.pop(entry_id)
+            self._disk_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        for url in self._entry_urls.pop(entry_id, ()):
+            if self._aliases.get(url) == entry_id:
+                del self._aliases[url]
+
+    def _enforce_limits(self):
+        # 메모리 한도 초과분은 오래된 순서대로 디스크로 내보냄
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            entry_id, (content, encoding) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(content)
+            if not self._spill(entry_id, content, encoding):
+                self.evicted += 1
+                for url in self._entry_urls.pop(entry_id, ()):
+                    self._aliases.pop(url, None)
+        # 디스크 한도 초과분은 오래된 순서대로 폐기
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            entry_id = next(iter(self._disk))
+            self._discard(entry_id)
+            self.evicted += 1
+
+    def _spill(self, entry_id: str, content: bytes, encoding: str) -> bool:
+        if self.max_disk_bytes <= 0 or len(content) > self.max_disk_bytes:
+            return False
+        try:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix='news_bodies_')
+                atexit.register(self.clear)
+            path = os.path.join(self._spill_dir, entry_id)
+            with open(path, 'wb') as f:
+                f.write(content)
+        except OSError:
+            return False
+        self._disk[entry_id] = (path, len(content), encoding)
+        self._disk_bytes += len(content)
+        return True
+
+
+_body_store = ResponseBodyStore(
+    max_memory_bytes=int(BODY_STORE_MAX_MEMORY_MB * 1024 * 1024),
+    max_disk_bytes=int(BODY_STORE_MAX_DISK_MB * 1024 * 1024),
+    max_item_bytes=int(BODY_STORE_MAX_ITEM_KB * 1024),
+)
+
+
+def get_body_store() -> ResponseBodyStore:
+    """URL 추적 응답 본문 보관소를 반환합니다."""
+    return _body_store
+
+
+def extract_source_name(url: str) -> str:
+    """
+    URL의 도메인에서 언론사 이름을 추출합니다 (한국 주요 언론사는 SOURCE_MAPPING으로 변환).
+
+    Args:
+        url (str): 기사 URL
+
+    Returns:
+        str: 언론사 이름
+    """
+    domain = urlparse(url).netloc
+    domain_clean = domain.replace('www.', '').replace('m.', '')
+    source_parts = domain_clean.split('.')
+    if not source_parts[0]:
+        return "출처 불명"
+    return SOURCE_MAPPING.get(source_parts[0].lower(), source_parts[0].capitalize())
+
+
+def normalize_news_link(link: str) -> str:
+    """중복 제거용으로 URL을 정규화합니다 (프로토콜, www./m./amp., 쿼리, 프래그먼트 제거)."""
+    normalized_link = re.sub(r'^https?:\/\/(www\.|m\.|amp\.)?', '', link).rstrip('/')
+    # 쿼리 파라미터도 제거하여 더 정확한 중복 제거
+    return normalized_link.split('?')[0].split('#')[0]
+
+
+def _fetch_for_resolution(url: str, method: str) -> tuple:
+    """
+    URL 추적용 요청을 보냅니다.
+
+    Returns:
+        tuple: (응답 객체, 본문 수신 여부)
+    """
+    if method != 'head':
+        # 공용 세션 사용 (SSL 검증 실패 호스트는 자동으로 검증 없이 요청)
+        return http_get(url, allow_redirects=True), True
+
+    host = urlparse(url).netloc.lower()
+    fallback_hosts = get_head_fallback_hosts()
+    head_status = None
+    if not (fallback_hosts and fallback_hosts.needs_get(host)):
+        response = http_head(url, allow_redirects=True)
+        if response.status_code < 400:
+            return response, False
+        head_status = response.status_code
+
+    # HEAD 거부 호스트: 헤더만 받고 연결을 닫는 스트리밍 GET으로 대체
+    response = http_get(url, allow_redirects=True, stream=True)
+    response.close()
+    if fallback_hosts and (head_status is None or response.status_code < 400):
+        fallback_hosts.record(host, head_status)
+    return response, False
+
+
+def get_final_url_and_source(url: str, max_retries: int = 2, method: str = None) -> tuple:
     """
     리디렉션을 따라가 최종 URL을 찾고 출처를 추출합니다 (재시도 로직 포함)
     
     Args:
         url (str): 추적할 URL
         max_retries (int): 최대 재시도 횟수
+        method (str): 'head'(본문 미수신) 또는 'get'(본문 수신 후 보관). None이면 RESOLVE_METHOD
         
     Returns:
         tuple: (최종 URL, 추출된 언론사 이름, 성공 여부)
     """
+    method = method or RESOLVE_METHOD
     for attempt in range(max_retries + 1):
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            # 타임아웃 설정을 더 짧게 (SSL 검증 시도 후 실패시 비활성화)
-            try:
-                # 먼저 SSL 검증 활성화로 시도
-                response = requests.get(url, headers=headers, allow_redirects=True, 
-                                        timeout=(5, 10), verify=True)
-            except requests.exceptions.SSLError:
-                # SSL 오류 시 검증 비활성화로 재시도
-                response = requests.get(url, headers=headers, allow_redirects=True, 
-                                        timeout=(5, 10), verify=False)
-            
+            response, body_received = _fetch_for_resolution(url, method)
+
             # 상태 코드 체크 (404, 403 등도 허용하되 기록)
             if response.status_code >= 400:
                 print(f"    (정보) HTTP {response.status_code}: {url[:60]}...")
                 # 그래도 URL 파싱은 시도
                 
             final_url = response.url
-            parsed_url = urlparse(final_url)
-            domain = parsed_url.netloc
-            
-            # 도메인에서 언론사 이름 추출 (더 정교하게)
-            domain_clean = domain.replace('www.', '').replace('m.', '')
-            source_parts = domain_clean.split('.')
-            
-            # 한국 언론사 도메인 특별 처리
-            source_mapping = {
-                'chosun': '조선일보', 'donga': '동아일보', 'joongang': '중앙일보',
-                'hankyoreh': '한겨레', 'hani': '한겨레', 'khan': '경향신문',
-                'mt': '머니투데이', 'mk': '매일경제', 'seoul': '서울신문',
-                'ytn': 'YTN', 'sbs': 'SBS', 'kbs': 'KBS', 'mbc': 'MBC'
-            }
-            
-            source_name = source_mapping.get(source_parts[0].lower(), source_parts[0].capitalize())
+            source_name = extract_source_name(final_url)
+
+            # 정상 HTML 응답이면 본문을 보관해 get_article_content()에서 재다운로드 없이 사용
+            if body_received and response.status_code < 400 and 'html' in response.headers.get('Content-Type', '').lower():
+                get_body_store().put([url, final_url], response.content, response.encoding)
             
             return final_url, source_name, True
             
@@ -248,253 +892,1141 @@ def get_final_url_and_source(url: str, max_retries: int = 2) -> tuple:
         return url, fallback_source, False
     except:
         return url, "출처 불명", False
-        
 
-# 💡💡💡 --- [신규] 뉴스 본문 추출 함수 --- 💡💡💡
-def get_article_content(url: str, max_length: int = 5000) -> str:
+
+class HostThrottle:
     """
-    주어진 URL에서 뉴스 기사 본문을 추출합니다.
-    
-    Args:
-        url (str): 뉴스 기사 URL
-        max_length (int): API 토큰 제한을 위해 가져올 최대 글자 수
-        
-    Returns:
-        str: 추출 및 정제된 기사 본문 텍스트
+    호스트별 예의(politeness) 제한을 관리하는 클래스.
+    전역 time.sleep() 대신 같은 호스트에 대해서만 동시 요청 수와 요청 간격을 제한합니다.
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10, verify=False)
-        response.raise_for_status()
-
-        # HTML 파싱
-        soup = BeautifulSoup(response.text, 'lxml')
-
-        # 불필요한 태그 제거 (스크립트, 스타일, 광고 등)
-        for element in soup(["script", "style", "header", "footer", "nav", "aside"]):
-            element.decompose()
-
-        # 기사 본문 유력 후보 태그 탐색
-        article_body = soup.find('article') or \
-                       soup.find('div', id=re.compile(r'content|article|main', re.I)) or \
-                       soup.find('main')
-        
-        if article_body:
-            text = article_body.get_text(separator='\n', strip=True)
-        else:
-            # 후보가 없으면 모든 <p> 태그 텍스트를 조합
-            paragraphs = soup.find_all('p')
-            text = '\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50)
-            if not text: # 그래도 없으면 body 전체 텍스트 사용
-                 text = soup.body.get_text(separator='\n', strip=True)
 
+    def __init__(self, max_concurrency: int = 2, min_interval: float = 0.5):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
 
-        # 텍스트 정제
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        cleaned_text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        if not cleaned_text:
-            return "기사 본문을 추출하지 못했습니다."
+    def _semaphore_for(self, host: str):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._semaphores[host]
 
-        return cleaned_text[:max_length]
+    @contextmanager
+    def slot(self, url: str):
+        """해당 URL의 호스트에 요청을 보낼 수 있을 때까지 대기한 뒤 실행 권한을 부여합니다."""
+        host = urlparse(url).netloc.lower()
+        with self._semaphore_for(host):
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = start_at + self.min_interval
+            if start_at > now:
+                time.sleep(start_at - now)
+            yield
 
-    except requests.exceptions.RequestException as e:
-        return f"본문 수집 실패 (네트워크 오류): {e}"
-    except Exception as e:
-        return f"본문 수집 실패 (알 수 없는 오류): {e}"
 
+_host_throttle = None
+_host_throttle_lock = threading.Lock()
 
-# ==============================================================================
-# --- 2. 개선된 뉴스 수집 함수 (오류 처리 및 통계 추가) ---
-# ==============================================================================
 
-def get_news_data():
-    """여러 RSS 피드와 키워드에서 뉴스를 수집하고 실제 출처를 표기하는 함수"""
-    news_list = []
-    failed_urls = []  # 실패한 URL들 추적
-    
-    # 통계 추적용
-    stats = {
-        'google_alerts': {'total': 0, 'success': 0, 'failed': 0, 'connection_errors': 0},
-        'naver': {'total': 0, 'success': 0, 'failed': 0, 'connection_errors': 0}
-    }
-    
-    print("\n🔍 Google Alerts에서 뉴스를 수집합니다...")
-    
-    for i, rss_url in enumerate(GOOGLE_ALERTS_RSS_URLS, 1):
-        if not rss_url.strip(): 
-            continue
-            
-        print(f"  📡 RSS 피드 {i}/{len(GOOGLE_ALERTS_RSS_URLS)} 처리 중...")
-        
-        try:
-            # RSS 파싱 자체도 타임아웃 설정
-            import socket
-            old_timeout = socket.getdefaulttimeout()
-            socket.setdefaulttimeout(15)  # RSS 파싱 타임아웃 늘림
-            
-            feed = feedparser.parse(rss_url)
-            socket.setdefaulttimeout(old_timeout)
-            
-            if not hasattr(feed, 'entries') or not feed.entries:
-                print(f"    ⚠️  RSS 피드가 비어있거나 파싱 실패")
-                continue
-                
-            print(f"    📰 {len(feed.entries)}개 항목 발견")
-            
-            # 각 항목을 순차적으로 처리 (안정성 우선)
-            for j, entry in enumerate(feed.entries, 1):
-                stats['google_alerts']['total'] += 1
-                
-                print(f"        🔄 항목 {j}/{len(feed.entries)} 처리 중...", end=' ')
-                
-                try:
-                    # 구글 알리미 링크에서 실제 URL 추출
-                    extracted_url = extract_google_alerts_url(entry.link)
-                    
-                    # URL 길이 체크 (너무 긴 URL은 건너뛰기)
-                    if len(extracted_url) > 500:
-                        print("❌ (URL 너무 김)")
-                        stats['google_alerts']['failed'] += 1
-                        continue
-                    
-                    # 최종 URL과 출처 확인
-                    final_link, source, success = get_final_url_and_source(extracted_url)
-                    
-                    if success:
-                        stats['google_alerts']['success'] += 1
-                        print("✅")
-                    else:
-                        stats['google_alerts']['failed'] += 1
-                        failed_urls.append(extracted_url)
-                        # 연결 관련 오류인지 확인
-                        if "연결" in str(extracted_url) or "Connection" in str(extracted_url):
-                            stats['google_alerts']['connection_errors'] += 1
-                        print("❌")
-                    
-                    # 발행일 처리 개선
-                    try:
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            published_date = datetime.datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
-                        else:
-                            # published_parsed가 없으면 현재 날짜 사용
-                            published_date = datetime.datetime.now().strftime('%Y-%m-%d')
-                    except Exception as date_error:
-                        published_date = datetime.datetime.now().strftime('%Y-%m-%d')
-                        print(f"         (날짜 파싱 오류: {date_error})")
-                    
-                    news_list.append({
-                        "title": entry.title,
-                        "link": final_link,
-                        "published": published_date,
-                        "source": source,
-                        "extraction_success": success
-                    })
-                    
-                    # 각 요청 사이에 짧은 대기 (서버 부하 방지)
-                    time.sleep(0.5)
-                    
-                except Exception as item_error:
-                    stats['google_alerts']['failed'] += 1
-                    failed_urls.append(getattr(entry, 'link', 'Unknown URL'))
-                    print(f"❌ (오류: {str(item_error)[:50]})")
-                    continue
-                    
-        except Exception as feed_error:
-            print(f"  ❌ RSS 피드 전체 처리 실패: {str(feed_error)[:100]}")
-            continue
+def get_host_throttle() -> HostThrottle:
+    """모든 URL 추적 작업이 공유하는 호스트별 제한기를 반환합니다 (동시에 도는 추적 작업 사이에도 제한 적용)."""
+    global _host_throttle
+    with _host_throttle_lock:
+        if _host_throttle is None:
+            _host_throttle = HostThrottle(RESOLVE_PER_HOST_CONCURRENCY, RESOLVE_PER_HOST_INTERVAL)
+        return _host_throttle
 
-    print(f"\n📊 Google Alerts 통계:")
-    print(f"    • 총 처리: {stats['google_alerts']['total']}개")
-    print(f"    • 성공: {stats['google_alerts']['success']}개")
-    print(f"    • 실패: {stats['google_alerts']['failed']}개")
-    if stats['google_alerts']['connection_errors'] > 0:
-        print(f"    • 연결 오류: {stats['google_alerts']['connection_errors']}개")
 
-    print("\n🔍 Naver News에서 뉴스를 수집합니다...")
-    
-    for i, query in enumerate(NAVER_QUERIES, 1):
-        if not query.strip(): 
-            continue
-            
-        print(f"  🔍 검색어 {i}/{len(NAVER_QUERIES)}: '{query}'")
-        
+def resolve_urls_concurrently(urls: list, max_workers: int = None, throttle: HostThrottle = None,
+                              method: str = None) -> list:
+    """
+    여러 URL을 동시에 get_final_url_and_source()로 추적합니다.
+    이전 실행에서 추적한 URL은 네트워크 요청 없이 로컬 캐시에서 바로 가져옵니다.
+
+    Args:
+        urls (list): 추적할 URL 목록
+        max_workers (int): 전체 동시 작업자 수 (None이면 RESOLVE_MAX_WORKERS)
+        throttle (HostThrottle): 호스트별 제한기 (None이면 공용 제한기 get_host_throttle())
+        method (str): 추적 방식 ('head' 또는 'get', None이면 RESOLVE_METHOD)
+
+    Returns:
+        list: 입력과 같은 순서의 (최종 URL, 언론사 이름, 성공 여부) 튜플 목록
+    """
+    if not urls:
+        return []
+
+    max_workers = max(1, max_workers or RESOLVE_MAX_WORKERS)
+    throttle = throttle or get_host_throttle()
+    cache = get_url_cache()
+
+    def _resolve(url):
         try:
-            naver_url = "https://openapi.naver.com/v1/search/news.json"
-            headers = {
-                "X-Naver-Client-Id": NAVER_CLIENT_ID, 
-                "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-            }
-            params = {"query": query, "display": 20, "sort": "date"}
-            
-            response = requests.get(naver_url, headers=headers, params=params, timeout=15)
+            if cache:
+                cached = cache.get(url)
+                if cached:
+                    return cached
+            with throttle.slot(url):
+                result = get_final_url_and_source(url, method=method)
+            if cache:
+                cache.put(url, *result)
+            return result
+        except Exception as e:
+            print(f"    (경고) URL 추적 작업 실패: {str(e)[:100]}")
+            return url, "출처 불명", False
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        # map()은 입력 순서대로 결과를 돌려주므로 수집 순서가 유지됨
+        return list(executor.map(_resolve, urls))
+
+
+class ExtractionProfileStore:
+    """
+    호스트별 본문 추출 프로필(본문이 들어 있는 요소의 선택자)을 상태 저장소에 보관합니다.
+    프로필이 있는 호스트는 해당 선택자를 최우선 후보로 추출하고, 연속으로 실패하면
+    프로필을 버리고 일반 후보 탐색에서 새로 찾은 선택자로 교체합니다.
+    버린 프로필은 행을 지우지 않고 빈 선택자('')로 남겨, 다음 실행의 시드 등록으로 되살아나지 않게 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.learned = 0
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS extraction_profiles (
+                    host TEXT PRIMARY KEY,
+                    selector TEXT NOT NULL,
+                    successes INTEGER NOT NULL DEFAULT 0,
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            db.executemany(
+                "INSERT OR IGNORE INTO extraction_profiles (host, selector, updated_at) VALUES (?, ?, ?)",
+                [(host, selector, time.time()) for host, selector in EXTRACTION_PROFILE_SEEDS.items()]
+            )
+            db.commit()
+            self._profiles = {
+                host: [selector, failures]
+                for host, selector, failures in db.execute("SELECT host, selector, failures FROM extraction_profiles")
+            }
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def get(self, host: str) -> str:
+        """호스트의 선택자를 반환합니다. 프로필이 없으면 None."""
+        with self._lock:
+            profile = self._profiles.get(host)
+            return (profile[0] or None) if profile else None
+
+    def _save(self, host: str, selector: str, success: bool):
+        with _state_db_lock:
+            db = get_state_db()
+            if selector is None:
+                # 실패가 누적된 프로필은 빈 선택자로 남겨 둠 (시드가 INSERT OR IGNORE로 다시 들어오지 않도록)
+                db.execute(
+                    "UPDATE extraction_profiles SET selector = '', failures = 0, updated_at = ? WHERE host = ?",
+                    (time.time(), host)
+                )
+            elif success:
+                db.execute("""
+                    INSERT INTO extraction_profiles (host, selector, successes, failures, updated_at)
+                    VALUES (?, ?, 1, 0, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        successes = CASE WHEN selector = excluded.selector THEN successes + 1 ELSE 1 END,
+                        selector = excluded.selector, failures = 0, updated_at = excluded.updated_at
+                """, (host, selector, time.time()))
+            else:
+                db.execute(
+                    "UPDATE extraction_profiles SET failures = failures + 1, updated_at = ? WHERE host = ?",
+                    (time.time(), host)
+                )
+            db.commit()
+
+    def record(self, host: str, profile_selector: str, matched_selector: str, good: bool):
+        """
+        추출 결과를 반영합니다.
+
+        Args:
+            host (str): 호스트
+            profile_selector (str): 이번 추출에 사용한 프로필 선택자 (없으면 None)
+            matched_selector (str): 실제로 본문을 내놓은 요소의 선택자 (일반 <p>/body 대체면 None)
+            good (bool): 본문이 EXTRACTION_PROFILE_MIN_CHARS 이상인지 여부
+        """
+        learned = matched_selector if good else None
+        with self._lock:
+            if profile_selector and learned == profile_selector:
+                self.hits += 1
+                self._profiles[host] = [profile_selector, 0]
+                save = (profile_selector, True)
+            elif profile_selector:
+                self.misses += 1
+                profile = self._profiles.setdefault(host, [profile_selector, 0])
+                profile[1] += 1
+                if profile[1] < EXTRACTION_PROFILE_MAX_FAILURES:
+                    save = (profile_selector, False)
+                elif learned:
+                    # 레이아웃이 바뀐 것으로 보고 일반 탐색에서 찾은 선택자로 교체
+                    self.learned += 1
+                    self._profiles[host] = [learned, 0]
+                    save = (learned, True)
+                else:
+                    self._profiles[host] = ['', 0]
+                    save = (None, False)
+            elif learned:
+                self.learned += 1
+                self._profiles[host] = [learned, 0]
+                save = (learned, True)
+            else:
+                return
+        self._save(host, *save)
+
+
+_extraction_profiles = None
+
+
+def get_extraction_profiles():
+    """본문 추출 프로필 저장소를 반환합니다. 상태 저장소를 열 수 없으면 None (일반 탐색만 사용)."""
+    global _extraction_profiles
+    with _state_db_lock:
+        if _extraction_profiles is None:
+            try:
+                _extraction_profiles = ExtractionProfileStore()
+            except sqlite3.Error as e:
+                print(f"    (경고) 본문 추출 프로필을 열 수 없어 일반 탐색만 사용합니다: {e}")
+                return None
+        return _extraction_profiles
+
+
+_SELECTOR_PATTERN = re.compile(r'^([a-z][a-z0-9]*)?(?:#([\w\-]+))?(?:\.([\w\-]+))?$', re.I)
+
+
+def parse_simple_selector(selector: str) -> tuple:
+    """
+    'tag', 'tag#id', 'tag.class', '#id', '.class' 형태의 단순 선택자를 (tag, id, class)로 분해합니다.
+    지원하지 않는 형태이면 None을 반환합니다.
+    """
+    match = _SELECTOR_PATTERN.match((selector or '').strip())
+    if not match or not any(match.groups()):
+        return None
+    tag, element_id, class_name = match.groups()
+    return (tag.lower() if tag else None), element_id, class_name
+
+
+def _clean_text_fragments(text: str):
+    """텍스트 조각을 줄/이중 공백 단위로 나누어 공백을 정리한 문구들을 돌려줍니다."""
+    for line in text.splitlines():
+        for phrase in line.split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                yield phrase
+
+
+class _BoundedTextCollector:
+    """max_length에 도달하면 더 이상 텍스트를 받지 않는 정제 텍스트 버퍼"""
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+        self.parts = []
+        self.length = 0
+
+    @property
+    def full(self) -> bool:
+        return self.length >= self.max_length
+
+    def add(self, phrase: str):
+        if not self.full:
+            self.parts.append(phrase)
+            self.length += len(phrase) + 1
+
+    def text(self) -> str:
+        return '\n'.join(self.parts)[:self.max_length]
+
+
+class _ArticleTextTarget:
+    """
+    lxml 파서 target: 트리를 만들지 않고 시작/종료 태그와 텍스트 이벤트만 받아
+    기존 추출 순서(article → div#content|article|main → main → 긴 <p> → body)의
+    후보별 텍스트를 동시에 모읍니다. 후보마다 max_length까지만 보관하므로 메모리 사용량이 제한됩니다.
+    호스트 프로필 선택자가 주어지면 그 요소를 최우선 후보로 삼습니다.
+    """
+
+    SKIP_TAGS = frozenset(["script", "style", "header", "footer", "nav", "aside", "noscript", "template"])
+    CONTAINER_ID_PATTERN = re.compile(r'content|article|main', re.I)
+    CONTAINER_PRIORITY = ('profile', 'article', 'div', 'main')
+    MIN_PARAGRAPH_LENGTH = 50
+
+    def __init__(self, max_length: int, selector: str = None):
+        self.max_length = max_length
+        self.selector = selector
+        self.selector_parts = parse_simple_selector(selector) if selector else None
+        self.stack = []
+        self.skip_depth = 0
+        self.in_head = False
+        self.pending = []
+        # 후보 이름 → [열린 깊이, 수집 버퍼, 종료 여부, 해당 요소의 선택자]
+        self.containers = {}
+        self.paragraph_parts = None
+        self.paragraphs = _BoundedTextCollector(max_length)
+        self.body = _BoundedTextCollector(max_length)
+        self.done = False
+        self.matched_selector = None
+
+    def _flush(self):
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+        if self.skip_depth or self.in_head:
+            return
+        if self.paragraph_parts is not None:
+            stripped = text.strip()
+            if stripped:
+                self.paragraph_parts.append(stripped)
+        for phrase in _clean_text_fragments(text):
+            self.body.add(phrase)
+            for container in self.containers.values():
+                if not container[2]:
+                    container[1].add(phrase)
+
+    def _matches_profile(self, tag: str, attrib) -> bool:
+        if not self.selector_parts:
+            return False
+        selector_tag, element_id, class_name = self.selector_parts
+        return (not selector_tag or selector_tag == tag) and \
+               (not element_id or attrib.get('id') == element_id) and \
+               (not class_name or class_name in (attrib.get('class') or '').split())
+
+    def _container_kind(self, tag: str, attrib) -> tuple:
+        """(후보 이름, 학습용 선택자)를 반환합니다. 후보가 아니면 (None, None)."""
+        element_id = attrib.get('id')
+        if tag == 'article':
+            return 'article', f"article#{element_id}" if element_id else 'article'
+        if tag == 'main':
+            return 'main', 'main'
+        if tag == 'div' and self.CONTAINER_ID_PATTERN.search(element_id or ''):
+            return 'div', f"div#{element_id}"
+        return None, None
+
+    def _open_container(self, kind: str, selector: str):
+        if kind not in self.containers:
+            self.containers[kind] = [len(self.stack), _BoundedTextCollector(self.max_length), False, selector]
+
+    def start(self, tag, attrib):
+        self._flush()
+        if not isinstance(tag, str):
+            return
+        tag = tag.lower()
+        self.stack.append(tag)
+        if tag == 'head':
+            self.in_head = True
+        if self.skip_depth or tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self._matches_profile(tag, attrib):
+            self._open_container('profile', self.selector)
+        kind, selector = self._container_kind(tag, attrib)
+        if kind:
+            self._open_container(kind, selector)
+        if tag == 'p':
+            self.paragraph_parts = []
+
+    def _is_usable(self, kind: str) -> bool:
+        container = self.containers.get(kind)
+        if not container or not container[1].parts:
+            return False
+        # 프로필 요소는 충분한 본문이 있어야 인정 (빈 껍데기만 남은 옛 레이아웃이면 일반 탐색으로)
+        return kind != 'profile' or container[1].length >= EXTRACTION_PROFILE_MIN_CHARS
+
+    def end(self, tag):
+        self._flush()
+        if not isinstance(tag, str):
+            return
+        tag = tag.lower()
+        # 짝이 맞지 않는 종료 태그는 무시하고, 자동으로 닫힌 요소들은 함께 정리
+        if tag not in self.stack:
+            return
+        while self.stack:
+            depth = len(self.stack)
+            current = self.stack.pop()
+            if self.skip_depth:
+                self.skip_depth -= 1
+            elif current == 'p' and self.paragraph_parts is not None:
+                paragraph = ''.join(self.paragraph_parts)
+                if len(paragraph) > self.MIN_PARAGRAPH_LENGTH:
+                    self.paragraphs.add(paragraph)
+                self.paragraph_parts = None
+            if current == 'head':
+                self.in_head = False
+            for container in self.containers.values():
+                if not container[2] and container[0] == depth:
+                    container[2] = True
+            if current == tag:
+                break
+        # 최우선 후보(프로필 요소, 없으면 <article>)가 끝났거나 가득 찼으면 나머지 문서는 볼 필요가 없음
+        first = self.containers.get('profile') if self.selector_parts else self.containers.get('article')
+        if first and (first[1].full or (first[2] and self._is_usable('profile' if self.selector_parts else 'article'))):
+            self.done = True
+
+    def data(self, data):
+        self.pending.append(data)
+        if len(self.pending) > 64:
+            self.pending = [''.join(self.pending)]
+
+    def close(self) -> str:
+        self._flush()
+        for kind in self.CONTAINER_PRIORITY:
+            if self._is_usable(kind):
+                self.matched_selector = self.containers[kind][3]
+                return self.containers[kind][1].text()
+        if self.paragraphs.parts:
+            return self.paragraphs.text()
+        return self.body.text()
+
+
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-]+)', re.I)
+
+
+def extract_article(markup, max_length: int = 5000, selector: str = None) -> tuple:
+    """
+    lxml 스트리밍 파서로 HTML에서 기사 본문을 추출합니다 (트리를 만들지 않음).
+    EXTRACTOR_CHUNK_SIZE 단위로 파서에 넣다가 본문이 충분히 모이면 즉시 멈춥니다.
+    bytes 입력은 조각마다 점진적으로 디코딩하므로 문서 전체를 문자열로 복사하지 않습니다.
+
+    Args:
+        markup (str | bytes): HTML 문서 (bytes이면 meta charset으로 인코딩 판단)
+        max_length (int): 가져올 최대 글자 수
+        selector (str): 호스트 프로필 선택자 (최우선 후보, 없으면 일반 후보 탐색만 수행)
+
+    Returns:
+        tuple: (정제된 본문 텍스트, 본문을 내놓은 요소의 선택자 또는 None)
+    """
+    decoder = None
+    if isinstance(markup, bytes):
+        match = _META_CHARSET_PATTERN.search(markup[:4096])
+        encoding = match.group(1).decode('ascii').lower() if match else 'utf-8'
+        if encoding in ('ks_c_5601-1987', 'euc-kr', 'ksc5601'):
+            encoding = 'cp949'  # 국내 언론사 페이지의 EUC-KR 선언은 대부분 CP949 확장 문자를 포함
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    from lxml import etree
+
+    target = _ArticleTextTarget(max_length, selector)
+    parser = etree.HTMLParser(target=target, remove_comments=True)
+    fed_bytes = 0
+    for offset in range(0, len(markup), EXTRACTOR_CHUNK_SIZE):
+        chunk = markup[offset:offset + EXTRACTOR_CHUNK_SIZE]
+        parser.feed(decoder.decode(chunk) if decoder else chunk)
+        if target.done:
+            return target.close(), target.matched_selector
+        # EXTRACTOR_MAX_BYTES는 바이트 기준 (str 입력은 UTF-8로 환산, 한글은 글자당 3바이트)
+        fed_bytes += len(chunk) if decoder else len(chunk.encode('utf-8'))
+        if fed_bytes >= EXTRACTOR_MAX_BYTES:
+            break
+    else:
+        tail = decoder.decode(b'', final=True) if decoder else ''
+        if tail:
+            parser.feed(tail)
+    try:
+        text = parser.close()
+    except etree.LxmlError:
+        text = target.close()
+    return text, target.matched_selector
+
+
+def extract_article_text(markup, max_length: int = 5000) -> str:
+    """일반 후보 탐색만으로 본문 텍스트를 추출합니다 (추출 실패 시 빈 문자열)."""
+    return extract_article(markup, max_length)[0]
+
+
+def extract_article_text_legacy(markup, max_length: int = 5000, selector: str = None) -> str:
+    """
+    기존 BeautifulSoup 기반 본문 추출 (빠른 추출기가 실패했을 때의 대체 경로 및 벤치마크 비교 기준).
+
+    Args:
+        markup (str | bytes): HTML 문서
+        max_length (int): 가져올 최대 글자 수
+        selector (str): 호스트 프로필 선택자 (본문이 충분하면 최우선 사용)
+
+    Returns:
+        str: 정제된 본문 텍스트 (추출 실패 시 빈 문자열)
+    """
+    from bs4 import BeautifulSoup
+
+    # HTML 파싱
+    soup = BeautifulSoup(markup, 'lxml')
+
+    # 불필요한 태그 제거 (스크립트, 스타일, 광고 등)
+    for element in soup(["script", "style", "header", "footer", "nav", "aside"]):
+        element.decompose()
+
+    # 호스트 프로필 선택자가 있으면 먼저 시도
+    if selector:
+        profile_body = soup.select_one(selector)
+        if profile_body:
+            text = '\n'.join(_clean_text_fragments(profile_body.get_text(separator='\n', strip=True)))
+            if len(text) >= EXTRACTION_PROFILE_MIN_CHARS:
+                return text[:max_length]
+
+    # 기사 본문 유력 후보 태그 탐색
+    article_body = soup.find('article') or \
+                   soup.find('div', id=re.compile(r'content|article|main', re.I)) or \
+                   soup.find('main')
+
+    if article_body:
+        text = article_body.get_text(separator='\n', strip=True)
+    else:
+        # 후보가 없으면 모든 <p> 태그 텍스트를 조합
+        paragraphs = soup.find_all('p')
+        text = '\n'.join(p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50)
+        if not text and soup.body: # 그래도 없으면 body 전체 텍스트 사용
+             text = soup.body.get_text(separator='\n', strip=True)
+
+    # 텍스트 정제
+    return '\n'.join(_clean_text_fragments(text))[:max_length]
+
+
+# 본문 수집 실패 시 get_article_content가 본문 대신 돌려주는 안내 문구
+ARTICLE_FAILURE_PREFIX = "본문 수집 실패"
+ARTICLE_EMPTY_MESSAGE = "기사 본문을 추출하지 못했습니다."
+
+
+# 💡💡💡 --- [신규] 뉴스 본문 추출 함수 --- 💡💡💡
+def get_article_content(url: str, max_length: int = 5000) -> str:
+    """
+    주어진 URL에서 뉴스 기사 본문을 추출합니다.
+    
+    Args:
+        url (str): 뉴스 기사 URL
+        max_length (int): API 토큰 제한을 위해 가져올 최대 글자 수
+        
+    Returns:
+        str: 추출 및 정제된 기사 본문 텍스트
+    """
+    try:
+        # URL 추적 단계에서 받아 둔 본문이 있으면 재사용 (두 번째 다운로드 생략)
+        cached_body = get_body_store().take(url)
+        if cached_body:
+            content, encoding = cached_body
+            # 인코딩 헤더가 없으면 바이트 그대로 넘겨 meta charset 기반 감지에 맡김
+            markup = content.decode(encoding, errors='replace') if encoding else content
+        else:
+            response = http_get(url, timeout=(5, 10))
             response.raise_for_status()
-            data = response.json()
-            
+            markup = response.text
+
+        # 이 호스트에서 본문을 잘 내놓았던 선택자가 있으면 최우선 후보로 사용
+        profiles = get_extraction_profiles()
+        host = ExtractionProfileStore.host_key(url)
+        selector = profiles.get(host) if profiles else None
+
+        cleaned_text = ''
+        if EXTRACTOR_ENGINE != 'legacy':
+            try:
+                cleaned_text, matched_selector = extract_article(markup, max_length, selector)
+                if profiles:
+                    profiles.record(host, selector, matched_selector,
+                                    len(cleaned_text) >= EXTRACTION_PROFILE_MIN_CHARS)
+            except Exception as e:
+                print(f"    (정보) 빠른 본문 추출 실패, 기존 방식으로 재시도: {str(e)[:100]}")
+        if not cleaned_text:
+            cleaned_text = extract_article_text_legacy(markup, max_length, selector)
+
+        if not cleaned_text:
+            return ARTICLE_EMPTY_MESSAGE
+
+        return cleaned_text
+
+    except requests.exceptions.RequestException as e:
+        return f"{ARTICLE_FAILURE_PREFIX} (네트워크 오류): {e}"
+    except Exception as e:
+        return f"{ARTICLE_FAILURE_PREFIX} (알 수 없는 오류): {e}"
+
+
+def is_article_fetch_failure(content: str) -> bool:
+    """
+    get_article_content가 돌려준 값이 본문이 아니라 실패 안내 문구인지 확인합니다.
+    본문에 '실패' 같은 단어가 들어 있어도 실패로 오인하지 않도록 문구 형태를 정확히 비교합니다.
+    """
+    return content == ARTICLE_EMPTY_MESSAGE or content.startswith(ARTICLE_FAILURE_PREFIX)
+
+
+# ==============================================================================
+# --- 2. 개선된 뉴스 수집 함수 (오류 처리 및 통계 추가) ---
+# ==============================================================================
+
+class FeedStateStore:
+    """
+    RSS 피드별 ETag / Last-Modified 값을 상태 저장소에 보관하여
+    다음 실행에서 조건부 GET(304 Not Modified)을 보낼 수 있게 합니다.
+    새로 받은 값은 stage()로 모아 두었다가, 보고서까지 정상 완료된 뒤 commit_pending()으로 저장합니다.
+    (중간에 실패한 실행이 값을 먼저 저장하면 다음 실행이 304를 받아 그 기사들을 영영 놓치게 됨)
+    """
+
+    def __init__(self):
+        self._pending = {}
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+
+    def get(self, url: str) -> tuple:
+        """(etag, last_modified)를 반환합니다. 기록이 없으면 (None, None)."""
+        with _state_db_lock:
+            row = get_state_db().execute(
+                "SELECT etag, last_modified FROM feed_state WHERE url = ?", (url,)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def put(self, url: str, etag: str, last_modified: str):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO feed_state (url, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, time.time())
+            )
+            db.commit()
+
+    def stage(self, url: str, etag: str, last_modified: str):
+        """이번 실행에서 받은 값을 저장 대기 상태로 보관합니다."""
+        with _state_db_lock:
+            self._pending[url] = (etag, last_modified)
+
+    def commit_pending(self) -> int:
+        """대기 중인 값을 모두 저장하고 저장한 피드 수를 반환합니다."""
+        with _state_db_lock:
+            pending, self._pending = self._pending, {}
+            for url, (etag, last_modified) in pending.items():
+                self.put(url, etag, last_modified)
+        return len(pending)
+
+
+_feed_state = None
+
+
+def get_feed_state():
+    """피드 상태 저장소를 반환합니다. 상태 저장소를 열 수 없으면 None."""
+    global _feed_state
+    with _state_db_lock:
+        if _feed_state is None:
+            try:
+                _feed_state = FeedStateStore()
+            except sqlite3.Error as e:
+                print(f"    (경고) 피드 상태 저장소를 열 수 없어 조건부 요청 없이 진행합니다: {e}")
+                return None
+        return _feed_state
+
+
+def fetch_feed(rss_url: str, feed_state: FeedStateStore = None) -> dict:
+    """
+    공용 HTTP 세션으로 RSS 피드를 조건부 GET하여 파싱합니다.
+
+    Args:
+        rss_url (str): RSS 피드 주소
+        feed_state (FeedStateStore): ETag/Last-Modified 저장소 (None이면 항상 전체 수신)
+
+    Returns:
+        dict: {'status': 'ok'|'not_modified'|'error', 'feed': 파싱 결과, 'elapsed': 초, 'error': 오류 메시지,
+               'validators': 새로 받은 (ETag, Last-Modified) — 저장은 호출자가 실행 성공 후에 함}
+    """
+    started = time.monotonic()
+    result = {'status': 'error', 'feed': None, 'elapsed': 0.0, 'error': None, 'validators': None}
+    try:
+        headers = {'Accept': 'application/atom+xml,application/rss+xml,application/xml;q=0.9,*/*;q=0.8'}
+        if feed_state:
+            etag, last_modified = feed_state.get(rss_url)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        response = http_get(rss_url, headers=headers, timeout=(5, 15))
+        if response.status_code == 304:
+            result['status'] = 'not_modified'
+        else:
+            response.raise_for_status()
+            import feedparser
+            result['feed'] = feedparser.parse(response.content)
+            result['status'] = 'ok'
+            result['validators'] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    except Exception as e:
+        result['error'] = str(e)[:100]
+    result['elapsed'] = time.monotonic() - started
+    return result
+
+
+class TokenBucket:
+    """초당 rate개의 토큰이 채워지는 토큰 버킷 (여러 스레드에서 공유하는 호출 속도 제한기)"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = max(rate, 0.001)
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 수 있을 때까지 대기합니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+KST = datetime.timezone(datetime.timedelta(hours=9), 'KST')
+
+
+class ApiQuotaTracker:
+    """
+    API별 일일 호출량을 상태 저장소에 누적 기록하고 한도를 확인합니다.
+    날짜는 API 제공자가 한도를 초기화하는 시간대(reset_tz) 기준으로 나눕니다.
+    """
+
+    def __init__(self, api: str, daily_limit: int, reset_tz: datetime.tzinfo = KST):
+        self.api = api
+        self.daily_limit = daily_limit
+        self.reset_tz = reset_tz
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS api_quota (
+                    api TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    used INTEGER NOT NULL,
+                    PRIMARY KEY (api, day)
+                )
+            """)
+            db.commit()
+
+    def _today(self) -> str:
+        return datetime.datetime.now(self.reset_tz).date().isoformat()
+
+    def used_today(self) -> int:
+        with _state_db_lock:
+            row = get_state_db().execute(
+                "SELECT used FROM api_quota WHERE api = ? AND day = ?", (self.api, self._today())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def try_consume(self, calls: int = 1) -> bool:
+        """한도 내이면 호출량을 기록하고 True, 한도를 넘으면 False를 반환합니다."""
+        with _state_db_lock:
+            db = get_state_db()
+            day = self._today()
+            row = db.execute("SELECT used FROM api_quota WHERE api = ? AND day = ?", (self.api, day)).fetchone()
+            used = row[0] if row else 0
+            if used + calls > self.daily_limit:
+                return False
+            db.execute(
+                "INSERT OR REPLACE INTO api_quota (api, day, used) VALUES (?, ?, ?)", (self.api, day, used + calls)
+            )
+            db.commit()
+            return True
+
+
+class NaverSearchClient:
+    """
+    네이버 뉴스 검색 API 클라이언트.
+    토큰 버킷으로 초당 호출을 제한하고, 일일 한도를 영구 기록하며,
+    검색어별로 지난 실행 이후의 기사에 도달할 때까지 페이지를 넘겨 조회합니다.
+    """
+
+    API_URL = "https://openapi.naver.com/v1/search/news.json"
+    MAX_START = 1000  # 네이버 API의 start 최대값
+
+    def __init__(self, client_id: str, client_secret: str, rate_per_sec: float = NAVER_RATE_PER_SEC,
+                 daily_quota: int = NAVER_DAILY_QUOTA, display: int = NAVER_DISPLAY,
+                 max_pages: int = NAVER_MAX_PAGES, max_retries: int = 3):
+        self.headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
+        self.display = min(max(display, 1), 100)
+        self.max_pages = max(1, max_pages)
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate_per_sec)
+        self.quota = ApiQuotaTracker('naver_search', daily_quota, reset_tz=KST)  # 네이버는 KST 자정에 한도 초기화
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'pages': 0, 'rate_limited': 0, 'quota_exhausted': False}
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS naver_query_state (
+                    query TEXT PRIMARY KEY,
+                    newest_pub_ts REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+
+    @staticmethod
+    def parse_pub_timestamp(pub_date: str):
+        """네이버 pubDate(RFC 822)를 epoch 초로 변환합니다. 실패하면 None."""
+        try:
+            return parsedate_to_datetime(pub_date).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def _get_watermark(self, query: str) -> float:
+        with _state_db_lock:
+            row = get_state_db().execute(
+                "SELECT newest_pub_ts FROM naver_query_state WHERE query = ?", (query,)
+            ).fetchone()
+        if row:
+            return row[0]
+        return time.time() - NAVER_INITIAL_LOOKBACK_HOURS * 3600
+
+    def _set_watermark(self, query: str, newest_pub_ts: float):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO naver_query_state (query, newest_pub_ts, updated_at) VALUES (?, ?, ?)",
+                (query, newest_pub_ts, time.time())
+            )
+            db.commit()
+
+    def _request_page(self, query: str, start: int) -> dict:
+        params = {"query": query, "display": self.display, "start": start, "sort": "date"}
+        for attempt in range(self.max_retries + 1):
+            if not self.quota.try_consume():
+                with self._lock:
+                    self.stats['quota_exhausted'] = True
+                raise RuntimeError("네이버 API 일일 호출 한도에 도달했습니다.")
+            self.bucket.acquire()
+            with self._lock:
+                self.stats['requests'] += 1
+            response = http_get(self.API_URL, headers=self.headers, params=params, timeout=(5, 15))
+            if response.status_code == 429 and attempt < self.max_retries:
+                with self._lock:
+                    self.stats['rate_limited'] += 1
+                retry_after = response.headers.get('Retry-After')
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+                time.sleep(delay)
+                continue
+            response.raise_for_status()
+            with self._lock:
+                self.stats['pages'] += 1
+            return response.json()
+        raise RuntimeError("네이버 API 호출 재시도 횟수를 초과했습니다.")
+
+    def search(self, query: str) -> tuple:
+        """
+        검색어 하나를 조회합니다. 지난 실행에서 본 기사보다 오래된 기사가 나오거나
+        결과가 더 없거나 max_pages에 도달하면 페이지 넘기기를 멈춥니다.
+        중간 페이지에서 오류가 나거나 지난 기사에 닿기 전에 max_pages에 걸리면, 받은 페이지가 지난 실행의
+        기준 시각까지 이어지지 않았으므로 기준 시각은 옮기지 않습니다 (다음 실행에서 빈 구간을 다시 조회).
+        기준 시각은 지난 기사에 닿았거나 결과를 끝까지 받은 경우에만 앞으로 옮깁니다.
+
+        Returns:
+            tuple: (네이버 API items 목록 (최신순), 오류 메시지 또는 None)
+        """
+        watermark = self._get_watermark(query)
+        collected = []
+        newest_ts = None
+        covered = False
+        start = 1
+        for _ in range(self.max_pages):
+            try:
+                data = self._request_page(query, start)
+            except Exception as e:
+                return collected, str(e)[:100]
             items = data.get("items", [])
-            print(f"    📰 {len(items)}개 발견")
+            collected.extend(items)
+
+            timestamps = [ts for ts in (self.parse_pub_timestamp(item.get('pubDate')) for item in items) if ts]
+            if timestamps:
+                newest_ts = max(newest_ts or 0, max(timestamps))
+            reached_seen = bool(timestamps) and min(timestamps) <= watermark
+            start += self.display
+            exhausted = len(items) < self.display or start > self.MAX_START
+            if reached_seen or exhausted:
+                covered = True
+                break
+
+        if newest_ts and covered:
+            self._set_watermark(query, max(newest_ts, watermark))
+        return collected, None
+
+    def search_all(self, queries: list, max_workers: int = NAVER_MAX_WORKERS) -> list:
+        """
+        여러 검색어를 동시에 조회합니다.
+
+        Returns:
+            list: 입력 순서대로 (검색어, items, 오류 메시지 또는 None) 튜플 목록
+                  (오류가 있어도 오류 전에 받은 페이지의 items는 포함)
+        """
+        def _search(query):
+            try:
+                return (query, *self.search(query))
+            except Exception as e:
+                return query, [], str(e)[:100]
+
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+            return list(executor.map(_search, queries))
+
+
+def get_news_data():
+    """여러 RSS 피드와 키워드에서 뉴스를 수집하고 실제 출처를 표기하는 함수"""
+    news_list = []
+    failed_urls = []  # 실패한 URL들 추적
+    pending_items = []  # 리디렉션 추적 대기 중인 항목 (수집 순서 유지)
+    
+    # 통계 추적용
+    stats = {
+        'google_alerts': {'total': 0, 'success': 0, 'failed': 0, 'connection_errors': 0, 'deferred': 0},
+        'naver': {'total': 0, 'success': 0, 'failed': 0, 'connection_errors': 0, 'deferred': 0}
+    }
+    
+    print("\n🔍 Google Alerts에서 뉴스를 수집합니다...")
+
+    # 모든 피드를 동시에 조건부 GET (요청별 타임아웃, 변경 없는 피드는 304로 건너뜀)
+    rss_urls = [rss_url for rss_url in GOOGLE_ALERTS_RSS_URLS if rss_url.strip()]
+    feed_state = get_feed_state()
+    rss_started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(RSS_MAX_WORKERS, len(rss_urls) or 1))) as executor:
+        feed_results = list(executor.map(lambda rss_url: fetch_feed(rss_url, feed_state), rss_urls))
+    if feed_state:
+        for rss_url, feed_result in zip(rss_urls, feed_results):
+            if feed_result['validators']:
+                feed_state.stage(rss_url, *feed_result['validators'])
+    stats['rss'] = {
+        'fetched': sum(1 for r in feed_results if r['status'] == 'ok'),
+        'not_modified': sum(1 for r in feed_results if r['status'] == 'not_modified'),
+        'failed': sum(1 for r in feed_results if r['status'] == 'error'),
+        'elapsed': time.monotonic() - rss_started,
+        'feed_times': [r['elapsed'] for r in feed_results],
+    }
+    
+    for i, feed_result in enumerate(feed_results, 1):
+        print(f"  📡 RSS 피드 {i}/{len(rss_urls)} 처리 중... ({feed_result['elapsed']:.2f}초)")
+        
+        try:
+            if feed_result['status'] == 'not_modified':
+                print(f"    ⏭️  변경 없음 (304), 건너뜀")
+                continue
+            if feed_result['status'] == 'error':
+                raise RuntimeError(feed_result['error'])
+
+            feed = feed_result['feed']
             
-            for j, item in enumerate(items, 1):
-                stats['naver']['total'] += 1
+            if not hasattr(feed, 'entries') or not feed.entries:
+                print(f"    ⚠️  RSS 피드가 비어있거나 파싱 실패")
+                continue
                 
-                print(f"        🔄 항목 {j}/{len(items)} 처리 중...", end=' ')
+            print(f"    📰 {len(feed.entries)}개 항목 발견")
+            
+            # 항목 정보만 먼저 모으고, 리디렉션 추적은 뒤에서 한꺼번에 병렬 처리
+            for j, entry in enumerate(feed.entries, 1):
+                stats['google_alerts']['total'] += 1
                 
                 try:
-                    clean_title = re.sub('<[^>]*>', '', item["title"])
+                    # 구글 알리미 링크에서 실제 URL 추출
+                    extracted_url = extract_google_alerts_url(entry.link)
                     
-                    # 날짜 파싱 개선
+                    # URL 길이 체크 (너무 긴 URL은 건너뛰기)
+                    if len(extracted_url) > 500:
+                        print(f"        ❌ 항목 {j}/{len(feed.entries)} (URL 너무 김)")
+                        stats['google_alerts']['failed'] += 1
+                        continue
+                    
+                    # 발행일 처리 개선
                     try:
-                        published_date = datetime.datetime.strptime(
-                            item['pubDate'], '%a, %d %b %Y %H:%M:%S +0900'
-                        ).strftime('%Y-%m-%d')
+                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                            published_date = datetime.datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
+                        else:
+                            # published_parsed가 없으면 현재 날짜 사용
+                            published_date = datetime.datetime.now().strftime('%Y-%m-%d')
                     except Exception as date_error:
                         published_date = datetime.datetime.now().strftime('%Y-%m-%d')
-                
-                    raw_link = item.get("originallink", item["link"])
-                    
-                    # URL 유효성 기본 체크
-                    if not raw_link.startswith('http'):
-                        print("❌ (잘못된 URL)")
-                        stats['naver']['failed'] += 1
-                        continue
-                    
-                    final_link, source, success = get_final_url_and_source(raw_link)
-                    
-                    if success:
-                        stats['naver']['success'] += 1
-                        print("✅")
-                    else:
-                        stats['naver']['failed'] += 1
-                        failed_urls.append(raw_link)
-                        print("❌")
+                        print(f"         (날짜 파싱 오류: {date_error})")
                     
-                    news_list.append({
-                        "title": clean_title,
-                        "link": final_link,
+                    pending_items.append({
+                        "stats_key": "google_alerts",
+                        "title": entry.title,
+                        "url": extracted_url,
                         "published": published_date,
-                        "source": source,
-                        "extraction_success": success
+                        "snippet": html.unescape(re.sub('<[^>]*>', '', getattr(entry, 'summary', '') or '')).strip(),
                     })
                     
-                    # 네이버도 요청 간 대기
-                    time.sleep(0.3)
-                    
                 except Exception as item_error:
-                    stats['naver']['failed'] += 1
-                    print(f"❌ (오류: {str(item_error)[:50]})")
+                    stats['google_alerts']['failed'] += 1
+                    failed_urls.append(getattr(entry, 'link', 'Unknown URL'))
+                    print(f"        ❌ 항목 {j}/{len(feed.entries)} (오류: {str(item_error)[:50]})")
                     continue
                     
-        except Exception as e:
+        except Exception as feed_error:
+            print(f"  ❌ RSS 피드 전체 처리 실패: {str(feed_error)[:100]}")
+            continue
+
+    print("\n🔍 Naver News에서 뉴스를 수집합니다...")
+
+    # 검색어를 동시에 조회 (초당/일일 호출 한도 준수, 지난 실행 이후 기사까지 페이지 조회)
+    queries = [query for query in NAVER_QUERIES if query.strip()]
+    try:
+        naver_client = NaverSearchClient(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET)
+        naver_results = naver_client.search_all(queries)
+    except Exception as e:
+        print(f"  ❌ 네이버 뉴스 API 클라이언트 초기화 실패: {str(e)[:100]}")
+        naver_client = None
+        naver_results = []
+    
+    for i, (query, items, error) in enumerate(naver_results, 1):
+        print(f"  🔍 검색어 {i}/{len(queries)}: '{query}'")
+        
+        try:
+            if error and not items:
+                raise RuntimeError(error)
+            if error:
+                print(f"    ⚠️ 일부 페이지만 받았습니다 (받은 기사는 사용): {error}")
+            
+            print(f"    📰 {len(items)}개 발견")
+            
+            for j, item in enumerate(items, 1):
+                stats['naver']['total'] += 1
+                
+                try:
+                    clean_title = re.sub('<[^>]*>', '', item["title"])
+                    
+                    # 날짜 파싱 개선
+                    try:
+                        published_date = datetime.datetime.strptime(
+                            item['pubDate'], '%a, %d %b %Y %H:%M:%S +0900'
+                        ).strftime('%Y-%m-%d')
+                    except Exception as date_error:
+                        published_date = datetime.datetime.now().strftime('%Y-%m-%d')
+                
+                    raw_link = item.get("originallink", item["link"])
+                    
+                    # URL 유효성 기본 체크
+                    if not raw_link.startswith('http'):
+                        print(f"        ❌ 항목 {j}/{len(items)} (잘못된 URL)")
+                        stats['naver']['failed'] += 1
+                        continue
+                    
+                    pending_items.append({
+                        "stats_key": "naver",
+                        "title": clean_title,
+                        "url": raw_link,
+                        "published": published_date,
+                        "snippet": html.unescape(re.sub('<[^>]*>', '', item.get("description", ""))).strip(),
+                    })
+                    
+                except Exception as item_error:
+                    stats['naver']['failed'] += 1
+                    print(f"        ❌ 항목 {j}/{len(items)} (오류: {str(item_error)[:50]})")
+                    continue
+                    
+        except Exception as e:
             print(f"  ❌ 네이버 뉴스 API 실패: {str(e)[:100]}")
             continue
 
+    if LAZY_URL_RESOLUTION:
+        # 지연 추적: 추출된 URL과 도메인 기반 출처만 기록하고 네트워크 요청은 선별 이후로 미룸
+        print(f"\n🔗 지연 추적 모드: {len(pending_items)}개 항목의 URL 추적을 AI 선별 이후로 미룹니다.")
+        resolved = [(pending['url'], extract_source_name(pending['url']), None) for pending in pending_items]
+    else:
+        # 모든 항목의 최종 URL을 호스트별 제한 하에 병렬로 추적
+        print(f"\n🔗 {len(pending_items)}개 항목의 최종 URL을 추적합니다 "
+              f"(동시 작업 {RESOLVE_MAX_WORKERS}개, 호스트당 {RESOLVE_PER_HOST_CONCURRENCY}개)...")
+        resolve_started = time.monotonic()
+        cache = get_url_cache()
+        hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+        resolved = resolve_urls_concurrently([pending['url'] for pending in pending_items])
+        if cache:
+            stats['url_cache'] = {'hits': cache.hits - hits_before, 'misses': cache.misses - misses_before}
+        print(f"    ⏱️  URL 추적 소요 시간: {time.monotonic() - resolve_started:.1f}초")
+        fallback_hosts = get_head_fallback_hosts()
+        if RESOLVE_METHOD == 'head' and fallback_hosts:
+            stats['head_fallback'] = {'count': fallback_hosts.fallback_count, 'new_hosts': list(fallback_hosts.newly_recorded)}
+
+    for pending, (final_link, source, success) in zip(pending_items, resolved):
+        bucket = stats[pending['stats_key']]
+        if success is None:
+            bucket['deferred'] += 1
+        elif success:
+            bucket['success'] += 1
+        else:
+            bucket['failed'] += 1
+            failed_urls.append(pending['url'])
+            # 연결 관련 오류인지 확인
+            if pending['stats_key'] == 'google_alerts' and ("연결" in str(pending['url']) or "Connection" in str(pending['url'])):
+                bucket['connection_errors'] += 1
+
+        news_list.append({
+            "title": pending['title'],
+            "link": final_link,
+            "published": pending['published'],
+            "source": source,
+            "snippet": pending['snippet'],
+            "extraction_success": success,
+            "original_url": pending['url'],
+            "resolved": success is not None
+        })
+
+    print(f"\n📊 RSS 피드 통계:")
+    rss_total = len(stats['rss']['feed_times'])
+    if rss_total:
+        print(f"    • 피드 수신: {stats['rss']['fetched']}개, 변경 없음(304): {stats['rss']['not_modified']}개 "
+              f"({stats['rss']['not_modified'] / rss_total * 100:.0f}%), 실패: {stats['rss']['failed']}개")
+        print(f"    • 피드별 소요 시간: 평균 {sum(stats['rss']['feed_times']) / rss_total:.2f}초, "
+              f"최대 {max(stats['rss']['feed_times']):.2f}초 (전체 {stats['rss']['elapsed']:.2f}초)")
+
+    print(f"\n📊 Google Alerts 통계:")
+    print(f"    • 총 처리: {stats['google_alerts']['total']}개")
+    print(f"    • 성공: {stats['google_alerts']['success']}개")
+    print(f"    • 실패: {stats['google_alerts']['failed']}개")
+    if stats['google_alerts']['deferred'] > 0:
+        print(f"    • 추적 보류(지연 모드): {stats['google_alerts']['deferred']}개")
+    if stats['google_alerts']['connection_errors'] > 0:
+        print(f"    • 연결 오류: {stats['google_alerts']['connection_errors']}개")
+
     print(f"\n📊 Naver News 통계:")
     print(f"    • 총 처리: {stats['naver']['total']}개")
     print(f"    • 성공: {stats['naver']['success']}개")
     print(f"    • 실패: {stats['naver']['failed']}개")
+    if stats['naver']['deferred'] > 0:
+        print(f"    • 추적 보류(지연 모드): {stats['naver']['deferred']}개")
+
+    if naver_client:
+        stats['naver_api'] = dict(naver_client.stats, quota_used_today=naver_client.quota.used_today())
+        print(f"    • API 호출: {stats['naver_api']['requests']}회 ({stats['naver_api']['pages']}페이지), "
+              f"429 응답: {stats['naver_api']['rate_limited']}회, "
+              f"오늘 사용량: {stats['naver_api']['quota_used_today']}/{NAVER_DAILY_QUOTA}")
+        if stats['naver_api']['quota_exhausted']:
+            print(f"    ⚠️  일일 호출 한도에 도달하여 일부 검색어를 건너뛰었습니다.")
+
+    if 'url_cache' in stats:
+        print(f"\n📊 URL 캐시 통계:")
+        print(f"    • 캐시 적중: {stats['url_cache']['hits']}개")
+        print(f"    • 캐시 미스(네트워크 추적): {stats['url_cache']['misses']}개")
+
+    if stats.get('head_fallback', {}).get('count'):
+        print(f"\n📊 HEAD 거부로 GET 대체: {stats['head_fallback']['count']}건")
+        if stats['head_fallback']['new_hosts']:
+            print(f"    • 새로 기록된 호스트: {', '.join(stats['head_fallback']['new_hosts'][:10])}")
 
     # 실패한 URL 상위 5개 출력 (디버깅용)
     if failed_urls:
@@ -510,11 +2042,9 @@ def get_news_data():
     unique_news_items = []
     
     for item in news_list:
-        # URL 정규화 개선
+        # URL 정규화 개선 (지연 모드에서는 추출된 원본 URL 기준의 사전 중복 제거)
         try:
-            normalized_link = re.sub(r'^https?:\/\/(www\.|m\.|amp\.)?', '', item['link']).rstrip('/')
-            # 쿼리 파라미터도 제거하여 더 정확한 중복 제거
-            normalized_link = normalized_link.split('?')[0].split('#')[0]
+            normalized_link = normalize_news_link(item['link'])
             
             if normalized_link not in seen_links:
                 unique_news_items.append(item)
@@ -529,9 +2059,16 @@ def get_news_data():
     total_items = stats['google_alerts']['total'] + stats['naver']['total']
     total_success = stats['google_alerts']['success'] + stats['naver']['success']
     total_failed = stats['google_alerts']['failed'] + stats['naver']['failed']
+    total_deferred = stats['google_alerts']['deferred'] + stats['naver']['deferred']
+    total_attempted = total_items - total_deferred
     
-    if total_items > 0:
-        success_rate = (total_success / total_items * 100)
+    if total_deferred > 0:
+        print(f"\n📈 최종 결과 (지연 추적 모드):")
+        print(f"    • 전체 수집: {total_items}개")
+        print(f"    • 추적 보류: {total_deferred}개 (선별 후 추적)")
+        print(f"    • 수집 단계 실패: {total_failed}개")
+    elif total_attempted > 0:
+        success_rate = (total_success / total_attempted * 100)
         print(f"\n📈 최종 결과:")
         print(f"    • 전체 시도: {total_items}개")
         print(f"    • 성공: {total_success}개 ({success_rate:.1f}%)")
@@ -547,172 +2084,1648 @@ def get_news_data():
     return unique_news_items
 
 
+def resolve_news_items(news_items: list, method: str = 'get') -> list:
+    """
+    지연 추적 모드에서 아직 추적되지 않은 뉴스 항목들의 최종 URL과 출처를 채웁니다.
+
+    Args:
+        news_items (list): get_news_data()가 반환한 뉴스 항목 목록 (제자리에서 갱신)
+        method (str): 추적 방식. 곧 본문을 추출할 항목은 'get'으로 받아 본문을 재사용
+
+    Returns:
+        list: 최종 URL 기준으로 중복이 제거된 뉴스 항목 목록 (순서 유지)
+    """
+    pending = [item for item in news_items if not item.get('resolved', True)]
+    if pending:
+        resolved = resolve_urls_concurrently([item['original_url'] for item in pending], method=method)
+        for item, (final_link, source, success) in zip(pending, resolved):
+            item['link'] = final_link
+            item['source'] = source
+            item['extraction_success'] = success
+            item['resolved'] = True
+
+    # 서로 다른 원본 URL이 같은 기사로 리디렉션될 수 있으므로 한 번 더 중복 제거
+    seen_links = set()
+    unique_items = []
+    for item in news_items:
+        normalized_link = normalize_news_link(item['link'])
+        if normalized_link not in seen_links:
+            seen_links.add(normalized_link)
+            unique_items.append(item)
+    return unique_items
+
+
+def start_background_resolution(news_items: list) -> Future:
+    """
+    기타 뉴스 목록의 URL 추적을 백그라운드 스레드에서 시작합니다.
+
+    Returns:
+        Future: result()가 최종 URL 기준으로 중복이 제거된 기타 뉴스 목록을 반환
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="other-news-resolver")
+    future = executor.submit(resolve_news_items, news_items, 'head')
+    executor.shutdown(wait=False)
+    return future
+
+
+class ArticleStore:
+    """
+    실행 간에 유지되는 기사 저장소. 중복 제거와 같은 정규화 URL을 키로
+    최초 수집 시각, URL 추적 결과, 분석 상태를 기록합니다.
+
+    분석 상태: 'new'(수집만 됨) → 'selected' / 'not_selected' → 'analyzed' / 'failed'
+    """
+
+    # 증분 모드에서 다시 처리하지 않는 상태 (선별 단계를 정상적으로 거친 기사)
+    SETTLED_STATUSES = ('not_selected', 'analyzed')
+
+    def __init__(self):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    article_key TEXT PRIMARY KEY,
+                    title TEXT,
+                    final_url TEXT,
+                    source TEXT,
+                    resolved INTEGER NOT NULL DEFAULT 0,
+                    resolution_success INTEGER,
+                    analysis_status TEXT NOT NULL DEFAULT 'new',
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    analyzed_at REAL
+                )
+            """)
+            db.commit()
+
+    @staticmethod
+    def key_for(item: dict) -> str:
+        """수집 시점 링크를 정규화한 기사 키 (지연 추적 모드에서도 실행 간에 동일)"""
+        if 'article_key' not in item:
+            item['article_key'] = normalize_news_link(item.get('original_url') or item['link'])
+        return item['article_key']
+
+    def record_seen(self, news_items: list) -> list:
+        """
+        수집된 기사들을 기록하고, 증분 처리 대상(처음 보았거나 아직 선별/분석이 끝나지 않은 기사)을 반환합니다.
+
+        Returns:
+            list: 처리 대상 뉴스 항목 목록 (입력 순서 유지)
+        """
+        now = time.time()
+        pending = []
+        with _state_db_lock:
+            db = get_state_db()
+            for item in news_items:
+                key = self.key_for(item)
+                row = db.execute("SELECT analysis_status FROM articles WHERE article_key = ?", (key,)).fetchone()
+                if row is None:
+                    db.execute(
+                        "INSERT INTO articles (article_key, title, final_url, source, resolved, resolution_success, "
+                        "first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, item['title'], item['link'], item['source'], int(item.get('resolved', True)),
+                         None if item.get('extraction_success') is None else int(item['extraction_success']), now, now)
+                    )
+                    pending.append(item)
+                else:
+                    db.execute("UPDATE articles SET last_seen = ? WHERE article_key = ?", (now, key))
+                    if row[0] not in self.SETTLED_STATUSES:
+                        pending.append(item)
+            db.commit()
+        return pending
+
+    def update_status(self, news_items: list, status: str):
+        """기사들의 분석 상태와 (그 시점의) URL 추적 결과를 갱신합니다."""
+        now = time.time()
+        with _state_db_lock:
+            db = get_state_db()
+            for item in news_items:
+                db.execute(
+                    "UPDATE articles SET analysis_status = ?, final_url = ?, source = ?, resolved = ?, "
+                    "resolution_success = ?, analyzed_at = CASE WHEN ? IN ('analyzed', 'failed') THEN ? ELSE analyzed_at END "
+                    "WHERE article_key = ?",
+                    (status, item['link'], item['source'], int(item.get('resolved', True)),
+                     None if item.get('extraction_success') is None else int(item['extraction_success']),
+                     status, now, self.key_for(item))
+                )
+            db.commit()
+
+
+_article_store = None
+
+
+def get_article_store():
+    """기사 저장소를 반환합니다. 상태 저장소를 열 수 없으면 None."""
+    global _article_store
+    with _state_db_lock:
+        if _article_store is None:
+            try:
+                _article_store = ArticleStore()
+            except sqlite3.Error as e:
+                print(f"    (경고) 기사 저장소를 열 수 없습니다: {e}")
+                return None
+        return _article_store
+
+
 # ==============================================================================
 # --- 3. (신규) AI 뉴스 선별 함수 (로직 구체화) ---
 # ==============================================================================
+_openai_client = None
+_openai_client_lock = threading.Lock()
+_tiktoken_encoding = None
+
+
+def get_openai_client():
+    """
+    모든 단계가 공유하는 OpenAI 클라이언트를 (최초 1회) 생성합니다.
+    재시도는 call_openai_with_retry()에서 직접 제어하므로 SDK 자체 재시도는 끕니다.
+    """
+    global _openai_client
+    with _openai_client_lock:
+        if _openai_client is None:
+            import openai
+            _openai_client = openai.OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+        return _openai_client
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 셉니다. tiktoken이 설치되어 있으면 실제 토크나이저를,
+    없으면 보수적인 근사치(한글 1자≈1토큰, 그 외 4자≈1토큰)를 사용합니다.
+    """
+    global _tiktoken_encoding
+    if _tiktoken_encoding is None:
+        try:
+            import tiktoken
+            try:
+                _tiktoken_encoding = tiktoken.encoding_for_model(ANALYSIS_MODEL)
+            except KeyError:
+                _tiktoken_encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # 미설치이거나 인코딩 파일을 내려받지 못하면 근사치 사용
+            _tiktoken_encoding = False
+    if _tiktoken_encoding:
+        return len(_tiktoken_encoding.encode(text))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+
+class OpenAIRateLimiter:
+    """분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 제한하는 속도 제한기"""
+
+    def __init__(self, requests_per_minute: float = ANALYSIS_RPM, tokens_per_minute: float = ANALYSIS_TPM):
+        self.request_bucket = TokenBucket(requests_per_minute / 60.0, capacity=max(1.0, requests_per_minute / 60.0 * 5))
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+        self.tokens_per_minute = tokens_per_minute
+
+    def acquire(self, estimated_tokens: int):
+        self.request_bucket.acquire()
+        self.token_bucket.acquire(min(float(estimated_tokens), self.tokens_per_minute))
+
+
+_openai_rate_limiter = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    global _openai_rate_limiter
+    with _openai_client_lock:
+        if _openai_rate_limiter is None:
+            _openai_rate_limiter = OpenAIRateLimiter()
+        return _openai_rate_limiter
+
+
+def _retry_after_seconds(error) -> float:
+    """OpenAI 오류 응답의 retry-after-ms / retry-after 헤더 값을 초 단위로 반환합니다 (없으면 None)."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def call_openai_with_retry(max_retries: int = ANALYSIS_MAX_RETRIES, **request):
+    """
+    속도 제한기를 거쳐 chat.completions.create()를 호출하고, 429·일시적 오류는
+    Retry-After 헤더(없으면 지수 백오프 + 지터)만큼 기다린 뒤 재시도합니다.
+
+    Args:
+        max_retries (int): 최대 재시도 횟수
+        **request: chat.completions.create()에 전달할 인자
+
+    Returns:
+        ChatCompletion: API 응답
+    """
+    import openai
+
+    client = get_openai_client()
+    prompt_text = "".join(message.get("content", "") for message in request.get("messages", []))
+    estimated_tokens = count_tokens(prompt_text) + request.get("max_tokens", 500)
+    retryable = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+
+    for attempt in range(max_retries + 1):
+        get_openai_rate_limiter().acquire(estimated_tokens)
+        try:
+            return client.chat.completions.create(**request)
+        except retryable as e:
+            if attempt >= max_retries:
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+            print(f"      (재시도 {attempt + 1}/{max_retries}) {type(e).__name__}: {delay:.1f}초 후 다시 시도합니다.")
+            time.sleep(delay)
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_minhash_rng = random.Random(20240601)  # 실행마다 같은 결과가 나오도록 고정 시드
+_MINHASH_PARAMS = [(_minhash_rng.randrange(1, _MERSENNE_PRIME), _minhash_rng.randrange(0, _MERSENNE_PRIME))
+                   for _ in range(MINHASH_PERMUTATIONS)]
+
+
+def normalize_title(title: str) -> str:
+    """유사도 비교용 제목 정규화 (HTML 태그/엔티티, 끝의 ' - 언론사' 표기, 기호와 공백 제거, 소문자화)"""
+    text = html.unescape(re.sub(r'<[^>]*>', '', title or ''))
+    text = re.sub(r'\s+[-|–—]\s+[^-|–—]{1,30}$', '', text)
+    return re.sub(r'[^0-9a-z가-힣]+', '', text.lower())
+
+
+def title_minhash(title: str) -> tuple:
+    """정규화된 제목의 문자 n-gram 집합에 대한 MinHash 서명을 계산합니다."""
+    text = normalize_title(title)
+    if len(text) <= TITLE_SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + TITLE_SHINGLE_SIZE] for i in range(len(text) - TITLE_SHINGLE_SIZE + 1)}
+    # crc32는 실행 간에 값이 같으므로 (파이썬 hash()와 달리) 묶음 결과가 재현 가능함
+    base_hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in base_hashes) for a, b in _MINHASH_PARAMS)
+
+
+def cluster_near_duplicates(news_items: list, threshold: float = NEAR_DUP_THRESHOLD) -> list:
+    """
+    MinHash 서명과 LSH 밴드 색인으로 제목이 거의 같은 뉴스들을 묶습니다.
+
+    Args:
+        news_items (list): 뉴스 항목 목록
+        threshold (float): 같은 묶음으로 볼 추정 자카드 유사도 하한
+
+    Returns:
+        list: 인덱스 목록의 목록 (각 묶음은 원래 순서대로, 묶음들은 첫 항목 순서대로)
+    """
+    signatures = [title_minhash(item['title']) for item in news_items]
+    rows_per_band = MINHASH_PERMUTATIONS // LSH_BANDS
+    parent = list(range(len(news_items)))
+
+    def _find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for index, signature in enumerate(signatures):
+        for band in range(LSH_BANDS):
+            band_key = (band, signature[band * rows_per_band:(band + 1) * rows_per_band])
+            buckets.setdefault(band_key, []).append(index)
+
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                agreement = sum(1 for x, y in zip(signatures[i], signatures[j]) if x == y) / MINHASH_PERMUTATIONS
+                if agreement >= threshold:
+                    root_i, root_j = _find(i), _find(j)
+                    if root_i != root_j:
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = {}
+    for index in range(len(news_items)):
+        clusters.setdefault(_find(index), []).append(index)
+    return list(clusters.values())
+
+
+def select_cluster_representatives(news_items: list) -> list:
+    """
+    유사 제목 묶음마다 대표 기사 하나만 남깁니다. 대표에는 묶음 크기(cluster_size)를
+    화제성 지표로 기록하고, 나머지 기사는 duplicates에 보관합니다.
+    대표는 URL 추적에 성공한 기사 → 최신 발행일 → 더 긴 제목 순으로 고릅니다.
+    """
+    representatives = []
+    for cluster in cluster_near_duplicates(news_items):
+        members = [news_items[i] for i in cluster]
+        representative = max(members, key=lambda item: (
+            item.get('extraction_success') is not False, item.get('published', ''), len(item.get('title', ''))
+        ))
+        representative['cluster_size'] = len(members)
+        representative['duplicates'] = [item for item in members if item is not representative]
+        representatives.append(representative)
+    return representatives
+
+
+class LocalRelevanceRanker:
+    """
+    제목·요약문의 문자 2/3-gram을 해시 특성(hashing trick)으로 만들고 TF-IDF로 가중한 뒤,
+    정책 키워드 프로필 벡터와의 유사도로 후보 뉴스를 점수화하는 CPU 전용 사전 순위화기.
+    n-gram 해시 계산까지 NumPy 배열 연산으로 처리해 수천 건도 수 밀리초 안에 점수화합니다.
+    """
+
+    def __init__(self, profile_terms: dict, feature_bits: int = PRERANK_FEATURE_BITS):
+        import numpy
+        self.np = numpy
+        self.dimension = 1 << feature_bits
+        self.profile = self._build_profile(profile_terms)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' ' + ' '.join(re.sub(r'[^0-9a-z가-힣]+', ' ', (text or '').lower()).split()) + ' '
+
+    def _hashed_ngrams(self, texts: list) -> tuple:
+        """
+        텍스트 목록 전체를 한 번에 n-gram 해시로 변환합니다.
+
+        Returns:
+            tuple: (문서 번호 배열, 특성 번호 배열) - n-gram 하나당 한 원소
+        """
+        np = self.np
+        normalized = [self._normalize(text) for text in texts]
+        lengths = np.fromiter((len(text) for text in normalized), dtype=np.int64, count=len(normalized))
+        # 문서 사이에 NUL 문자를 넣어 이어 붙이고 코드 포인트 배열로 변환
+        codes = np.frombuffer('\x00'.join(normalized).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        doc_of_position = np.repeat(np.arange(len(texts), dtype=np.int64), lengths + 1)[:len(codes)]
+
+        doc_parts, feature_parts = [], []
+        mask = np.uint64(self.dimension - 1)
+        multiplier = np.uint64(1000003)
+        for n in (2, 3):
+            if len(codes) < n:
+                continue
+            windows = [codes[k:len(codes) - n + 1 + k] for k in range(n)]
+            valid = np.ones(len(windows[0]), dtype=bool)
+            hashed = np.full(len(windows[0]), np.uint64(n * 0x9E3779B1))
+            for window in windows:
+                valid &= window != 0
+                hashed = (hashed * multiplier) ^ window  # uint64 곱셈은 자연스럽게 2^64로 나머지 연산됨
+            hashed ^= hashed >> np.uint64(29)
+            doc_parts.append(doc_of_position[:len(valid)][valid])
+            feature_parts.append((hashed[valid] & mask).astype(np.int64))
+        if not doc_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(doc_parts), np.concatenate(feature_parts)
+
+    def _build_profile(self, profile_terms: dict):
+        np = self.np
+        profile = np.zeros(self.dimension, dtype=np.float64)
+        terms = list(profile_terms)
+        docs, features = self._hashed_ngrams(terms)
+        weights = np.array([profile_terms[term] for term in terms], dtype=np.float64)
+        keys, counts = np.unique(docs * self.dimension + features, return_counts=True)
+        term_ids, term_features = keys // self.dimension, keys % self.dimension
+        values = counts.astype(np.float64)
+        # 키워드마다 n-gram 벡터를 L2 정규화한 뒤 가중치를 곱해 합산
+        norms = np.sqrt(np.bincount(term_ids, weights=values ** 2, minlength=len(terms)))
+        np.add.at(profile, term_features, values / norms[term_ids] * weights[term_ids])
+        return profile
+
+    def score(self, news_items: list):
+        """각 뉴스 항목의 관련도 점수 배열을 반환합니다 (입력 순서)."""
+        np = self.np
+        count = len(news_items)
+        title_docs, title_features = self._hashed_ngrams([item.get('title', '') for item in news_items])
+        snippet_docs, snippet_features = self._hashed_ngrams([item.get('snippet', '') for item in news_items])
+
+        keys = np.concatenate([title_docs * self.dimension + title_features,
+                               snippet_docs * self.dimension + snippet_features])
+        weights = np.concatenate([np.full(len(title_docs), PRERANK_TITLE_WEIGHT), np.ones(len(snippet_docs))])
+        if not len(keys):
+            return np.zeros(count)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        term_frequency = np.bincount(inverse, weights=weights)
+        docs, features = unique_keys // self.dimension, unique_keys % self.dimension
+
+        # TF-IDF (sublinear tf, smoothed idf) 후 문서 벡터 L2 정규화
+        document_frequency = np.bincount(features, minlength=self.dimension)
+        idf = np.log((1.0 + count) / (1.0 + document_frequency[features])) + 1.0
+        values = (1.0 + np.log(term_frequency)) * idf
+        norms = np.sqrt(np.bincount(docs, weights=values ** 2, minlength=count))
+        scores = np.bincount(docs, weights=values * self.profile[features], minlength=count)
+        return np.divide(scores, norms, out=np.zeros(count), where=norms > 0)
+
+    def top_k(self, news_items: list, k: int) -> list:
+        """점수 상위 k개 항목을 원래 순서(최신순)를 유지한 채 반환합니다."""
+        if len(news_items) <= k:
+            return list(news_items)
+        scores = self.score(news_items)
+        keep = self.np.sort(self.np.argsort(-scores, kind='stable')[:k])
+        for index, item_score in enumerate(scores):
+            news_items[index]['relevance_score'] = float(item_score)
+        return [news_items[i] for i in keep]
+
+
+def prerank_candidates(news_items: list, top_k: int = PRERANK_TOP_K) -> list:
+    """
+    로컬 관련도 점수로 상위 top_k개 후보만 남깁니다.
+    numpy가 없거나 점수화에 실패하면 후보를 그대로 반환합니다 (AI 단독 선별).
+    """
+    if len(news_items) <= top_k:
+        return news_items
+    try:
+        started = time.perf_counter()
+        profile_terms = {query: 1.0 for query in NAVER_QUERIES if query.strip()}
+        profile_terms.update(PRERANK_PRIORITY_TERMS)
+        ranked = LocalRelevanceRanker(profile_terms).top_k(news_items, top_k)
+        print(f"  > 로컬 사전 순위화: {len(news_items)}개 → 상위 {len(ranked)}개 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        return ranked
+    except ImportError:
+        print("  (정보) numpy가 없어 로컬 사전 순위화를 건너뜁니다.")
+    except Exception as e:
+        print(f"  (경고) 로컬 사전 순위화 실패: {str(e)[:100]}")
+    return news_items
+
+
+def format_selection_line(index: int, item: dict) -> str:
+    """선별 프롬프트의 뉴스 목록 한 줄을 만듭니다."""
+    popularity = f" (관련 기사 {item['cluster_size']}건)" if item.get('cluster_size', 1) > 1 else ""
+    return f"{index}: {item['title']}{popularity}\n"
+
+
+def build_selection_prompt(candidates: list, select_count: int = SELECTION_COUNT) -> str:
+    """후보 목록으로 뉴스 선별 프롬프트를 만듭니다."""
+    formatted_news_list = "".join(format_selection_line(i, item) for i, item in enumerate(candidates))
+
+    return f"""
+    당신은 ICT 표준 정책 최고 전문가의 수석 보좌관입니다.
+    당신의 임무는 아래 뉴스 목록에서 먼저 내용이 중복되는 기사들을 제거한 뒤, '표준 정책 입안자'의 관점에서 가장 중요한 뉴스 {select_count}개를 선별하는 것입니다.
+
+    [작업 절차]
+    1. **중복 제거**: 아래 뉴스 목록은 제목이 거의 같은 기사를 이미 하나로 묶은 대표 기사 목록입니다. 제목은 다르지만 사실상 동일한 사건이나 주제를 다루는 기사들이 남아 있다면 하나의 그룹으로 묶고, 각 그룹에서 가장 포괄적인 대표 기사 하나만 남깁니다. 제목 뒤 '(관련 기사 N건)'은 같은 사건을 다룬 기사 수로, 화제성 지표로 참고합니다.
+    2. **최종 선별**: 중복이 제거된 뉴스 목록에서, 아래 [선별 최우선 기준]에 따라 가장 중요한 뉴스 {select_count}개를 최종적으로 선별합니다.
+
+    [선별 최우선 기준]
+    정책적 중요도를 최우선으로 고려하며, 특히 아래 주제를 다루는 국내외 뉴스에 높은 가중치를 부여합니다.
+    - **해외 주요국 정책/규제**: 미국(FCC), 유럽(ETSI) 등 해외 주요국의 ICT 정책, 법안, 규제 변화
+    - **국제 표준화 동향**: 3GPP, ITU 등 국제 표준화 기구의 주요 결정 및 논의 사항
+    - **국내 정부 계획 및 발표**: 국내 정부 부처가 발표하는 ICT 정책, 법안, 기술 개발 계획
+    - **산업계 핵심 동향**: ICT 산업 및 시장 판도에 큰 영향을 미치는 국내외 기업의 기술 개발 및 사업 전략
+    - **정책 비판 및 대안**: 현재 정책의 문제점을 지적하거나 새로운 대안을 제시하는 기사
+
+
+    [뉴스 목록]
+    {formatted_news_list}
+
+    [요청]
+    위 절차와 기준에 따라 최종적으로 선별된 뉴스의 번호 {select_count}개만 쉼표(,)로 구분하여 응답해 주십시오.
+    예시: 3, 8, 12, 15, 21, 23, 25, 30, 31, 33, 40, 41, 42, 45, 50
+    (설명이나 다른 텍스트는 절대 포함하지 마세요. 번호만 응답해야 합니다.)
+    """
+
+
+def request_selection(candidates: list, select_count: int = SELECTION_COUNT, label: str = "") -> list:
+    """
+    후보 목록에 대해 선별 API를 한 번 호출하고 선택된 항목을 반환합니다.
+
+    Raises:
+        ValueError: 유효한 인덱스를 하나도 받지 못한 경우
+    """
+    prompt = build_selection_prompt(candidates, select_count)
+    response = call_openai_with_retry(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": f"당신은 ICT 표준 정책 전문가의 유능한 보좌관입니다. 주어진 뉴스 목록에서 중복을 제거하고, 정책적 중요도가 가장 높은 {select_count}개를 골라 번호만 응답합니다."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.0,
+    )
+    selected_indices_str = response.choices[0].message.content
+    print(f"  > AI가 선별한 뉴스 인덱스{label}: {selected_indices_str}")
+
+    selected_indices = []
+    for token in re.findall(r'\d+', selected_indices_str):
+        index = int(token)
+        if index < len(candidates) and index not in selected_indices:
+            selected_indices.append(index)
+    filtered_news = [candidates[i] for i in selected_indices]
+
+    if not filtered_news:
+        raise ValueError("AI가 유효한 인덱스를 반환하지 않았습니다.")
+    return filtered_news
+
+
+def split_by_token_budget(candidates: list, chunk_tokens: int = SELECTION_CHUNK_TOKENS) -> list:
+    """프롬프트 목록 줄의 토큰 수 합이 chunk_tokens를 넘지 않도록 후보를 순서대로 나눕니다."""
+    chunks, current, current_tokens = [], [], 0
+    for item in candidates:
+        line_tokens = count_tokens(format_selection_line(len(current), item))
+        if current and current_tokens + line_tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += line_tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run_selection_tournament(candidates: list, select_count: int = SELECTION_COUNT, round_number: int = 1) -> list:
+    """
+    후보를 토큰 예산 단위 묶음으로 나눠 병렬로 예선을 치르고, 예선 통과 기사로 결선을 진행합니다.
+    예선에 실패한 묶음은 발행일이 최신인 기사로 대체합니다.
+    예선으로 후보가 줄지 않았거나 SELECTION_MAX_ROUNDS 단계에 도달하면 더 나누지 않고 바로 결선을 치릅니다.
+    """
+    chunks = split_by_token_budget(candidates)
+    winners_per_chunk = max(1, SELECTION_CHUNK_WINNERS)
+    print(f"  > 토너먼트 선별: 후보 {len(candidates)}개를 {len(chunks)}개 묶음으로 나눠 예선 진행 (묶음별 {winners_per_chunk}개)")
+
+    def _heat(indexed_chunk):
+        n, chunk = indexed_chunk
+        count = min(winners_per_chunk, len(chunk))
+        try:
+            return request_selection(chunk, count, label=f" (예선 {n + 1}/{len(chunks)})")
+        except Exception as e:
+            print(f"  (경고) 예선 {n + 1} 선별 실패: {e}. 묶음의 최신 뉴스 {count}개로 대체합니다.")
+            return sorted(chunk, key=lambda item: item.get('published', ''), reverse=True)[:count]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(SELECTION_MAX_WORKERS, len(chunks)))) as executor:
+        heat_results = list(executor.map(_heat, enumerate(chunks)))
+    finalists = [item for winners in heat_results for item in winners]
+
+    if len(finalists) <= select_count:
+        return finalists
+    # 결선 목록도 기준을 넘으면 한 번 더 토너먼트 진행 (후보가 실제로 줄어든 경우에만, 최대 단계 수 이내)
+    narrowed = len(finalists) < len(candidates)
+    if (narrowed and round_number < SELECTION_MAX_ROUNDS
+            and count_tokens(build_selection_prompt(finalists, select_count)) > SELECTION_PROMPT_TOKEN_THRESHOLD):
+        return run_selection_tournament(finalists, select_count, round_number + 1)
+    return request_selection(finalists, select_count, label=" (결선)")
+
+
 def filter_news_by_ai(news_items):
     """AI를 사용해 정책 입안자에게 가장 관련성 높은 뉴스를 선별하는 함수"""
     print("\n[🚀 작업 중] AI가 정책 입안자를 위해 뉴스를 선별하고 있습니다...")
+    if not news_items:
+        print("  > 선별할 뉴스가 없습니다.")
+        return []
     if not OPENAI_API_KEY or OPENAI_API_KEY == "YOUR_OPENAI_API_KEY":
         print("  (경고) OpenAI API 키가 없어 뉴스 선별을 건너뛰고 최신 뉴스 20개를 분석합니다.")
         return news_items[:20]
 
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    # 제목이 거의 같은 기사는 로컬에서 먼저 묶어 대표 기사만 프롬프트에 포함
+    candidates = select_cluster_representatives(news_items)
+    print(f"  > 유사 제목 묶음: {len(news_items)}개 → 대표 기사 {len(candidates)}개")
+
+    # 로컬 관련도 상위 후보만 AI에 전달 (SELECTION_MODE=llm이면 전체 후보를 AI가 직접 선별)
+    if SELECTION_MODE == 'prerank':
+        candidates = prerank_candidates(candidates)
+
+    try:
+        # 프롬프트 크기를 토큰으로 측정해 기준 이하이면 한 번에, 넘으면 묶음 토너먼트로 선별
+        prompt_tokens = count_tokens(build_selection_prompt(candidates))
+        print(f"  > 선별 프롬프트 크기: 약 {prompt_tokens:,} 토큰")
+        if prompt_tokens > SELECTION_PROMPT_TOKEN_THRESHOLD:
+            return run_selection_tournament(candidates)
+        return request_selection(candidates)
+
+    except Exception as e:
+        print(f"  (경고) AI 뉴스 선별 실패: {e}. 최신 뉴스 20개로 대체합니다.")
+        return news_items[:20]
+
+# ==============================================================================
+# --- 4. AI 심층 분석 함수 (프롬프트 수정) ---
+# ==============================================================================
+class AnalysisCache:
+    """
+    analyze_news_with_ai() 결과를 (모델, 프롬프트 버전, 제목, 본문)의 해시로 저장하는 캐시.
+    오래된 항목과 최대 개수를 넘는 항목(가장 오래 쓰이지 않은 순)은 prune()으로 정리합니다.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, max_age_days: float = ANALYSIS_CACHE_MAX_AGE_DAYS):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    total_tokens INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, title: str, content: str) -> str:
+        payload = json.dumps([model, prompt_version, title, content], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, cache_key: str):
+        """저장된 분석 결과를 반환합니다. 없으면 None."""
+        with _state_db_lock:
+            db = get_state_db()
+            row = db.execute(
+                "SELECT analysis, total_tokens FROM analysis_cache WHERE cache_key = ? AND created_at >= ?",
+                (cache_key, time.time() - self.max_age_seconds)
+            ).fetchone()
+            if row:
+                db.execute("UPDATE analysis_cache SET last_used_at = ? WHERE cache_key = ?", (time.time(), cache_key))
+                db.commit()
+        with self._lock:
+            if row:
+                self.hits += 1
+                self.tokens_saved += row[1]
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, cache_key: str, model: str, prompt_version: str, analysis: str, total_tokens: int):
+        now = time.time()
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO analysis_cache (cache_key, model, prompt_version, analysis, total_tokens, "
+                "created_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, model, prompt_version, analysis, total_tokens, now, now)
+            )
+            db.commit()
+
+    def prune(self):
+        """기간이 지난 항목을 지우고, 최대 개수를 넘으면 가장 오래 쓰이지 않은 항목부터 삭제합니다."""
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("DELETE FROM analysis_cache WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+            db.execute(
+                "DELETE FROM analysis_cache WHERE cache_key NOT IN "
+                "(SELECT cache_key FROM analysis_cache ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            db.commit()
+
+
+_analysis_cache = None
+
+
+def get_analysis_cache():
+    """분석 결과 캐시를 반환합니다. 상태 저장소를 열 수 없으면 None (캐시 없이 동작)."""
+    global _analysis_cache
+    with _state_db_lock:
+        if _analysis_cache is None:
+            try:
+                _analysis_cache = AnalysisCache()
+                _analysis_cache.prune()
+            except sqlite3.Error as e:
+                print(f"    (경고) 분석 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                return None
+        return _analysis_cache
+
+
+# ------------------------------------------------------------------------------
+# 본문 압축 (AI 분석 입력 토큰 절감)
+# ------------------------------------------------------------------------------
+_SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?。])\s+(?=\S)')
+# 상용구 패턴은 줄 전체(또는 줄 머리)에만 맞추고, _BOILERPLATE_MAX_CHARS보다 긴 문장은 검사하지 않음
+# (본문 문장 속 '구독자', '댓글', 'copyright' 같은 단어로 사실 문장이 지워지지 않도록)
+_BOILERPLATE_MAX_CHARS = 100
+_BOILERPLATE_PATTERNS = [re.compile(pattern, re.I) for pattern in (
+    r'^[^@]{0,20}[\w.+-]+@[\w-]+\.[\w.]+\W*$',                       # 기자 이름 + 이메일만 있는 줄
+    r'^\s*\(?[가-힣]{2,4}\s*(기자|특파원|논설위원|객원기자)\s*\)?\s*$',     # 기자 이름만 있는 줄
+    r'^\W*(ⓒ|©|copyright\s*(©|ⓒ|\(c\)|\d{4})|all rights reserved|무단\s*전재|재배포\s*금지|저작권자\s*[(:ⓒ©])',
+    r'^\s*(관련\s*기사|관련\s*뉴스|많이\s*본|추천\s*기사|인기\s*기사|함께\s*보면|related\b|read more|more from)',
+    r'^\W*((구독|좋아요|공유하기|공유|댓글|스크랩|뉴스스탠드)(하기)?\s*\d*\W*)+$',   # 버튼 문구만 있는 줄
+    r'^\W*(기사\s*제보|카카오톡\s*제보|제보는\s*카카오톡|네이버\s*메인에서)',
+    r'(구독|팔로우)\s*(하기|하세요|해\s*주세요|바랍니다)\W*$',
+    r'^\s*[\[<(]?\s*(사진|그래픽|영상|이미지)\s*[=:]|^\s*\[?사진\s*제공',
+    r'^\s*(입력|수정|등록|승인|기사\s*입력)\s*[:]?\s*\d{4}[.\-]',
+)]
+_NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*\s*(?:%|퍼센트|억|만|조|천|원|달러|유로|엔|GHz|MHz|kHz|Gbps|Mbps|nm|개국|개사|명|건|대|년|월|일|분기)?', re.I)
+_QUOTE_PATTERN = re.compile(r'["“”‘’\'][^"“”‘’\']{4,}["“”‘’\']')
+_ENTITY_PATTERN = re.compile(
+    r'\b[A-Z][A-Za-z0-9&\-]*[A-Z0-9][A-Za-z0-9&\-]*\b'            # FCC, 3GPP, IMT-2030, SKT
+    r'|\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b'                          # 영문 고유명사 구
+    r'|[가-힣]{2,}(?:부|처|청|원|위원회|협회|연구원|공사|재단|전자|텔레콤|그룹|은행|대학교)(?=[\s,·은는이가을를의에와과도]|$)'
+)
+
+
+def split_sentences(text: str) -> list:
+    """줄바꿈과 문장 부호를 기준으로 본문을 문장 목록으로 나눕니다."""
+    sentences = []
+    for line in text.splitlines():
+        sentences.extend(part.strip() for part in _SENTENCE_SPLIT_PATTERN.split(line) if part.strip())
+    return sentences
+
+
+def _sentence_shingles(sentence: str) -> set:
+    text = normalize_title(sentence)
+    if len(text) <= TITLE_SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + TITLE_SHINGLE_SIZE] for i in range(len(text) - TITLE_SHINGLE_SIZE + 1)}
+
+
+class ArticleCompressor:
+    """
+    기사 본문을 AI 분석에 넘기기 전에 토큰 예산(count_tokens 기준) 안으로 줄입니다.
+    문장 단위로 나눈 뒤 바이라인·저작권·관련기사 같은 상투 문구와 거의 같은 문장을 버리고,
+    수치·고유명사·인용문·제목 단어가 많은 문장을 우선 골라 원래 순서대로 이어 붙입니다.
+    """
+
+    def __init__(self, token_budget: int = COMPRESSION_TOKEN_BUDGET,
+                 near_dup_threshold: float = COMPRESSION_NEAR_DUP_THRESHOLD):
+        self.token_budget = token_budget
+        self.near_dup_threshold = near_dup_threshold
+        self._lock = threading.Lock()
+        self.articles = 0
+        self.original_tokens = 0
+        self.compressed_tokens = 0
+
+    @staticmethod
+    def is_boilerplate(sentence: str) -> bool:
+        if len(sentence) < 10 and not re.search(r'\d', sentence):
+            return True
+        if len(sentence) > _BOILERPLATE_MAX_CHARS:
+            return False
+        return any(pattern.search(sentence) for pattern in _BOILERPLATE_PATTERNS)
+
+    def _deduplicate(self, sentences: list) -> list:
+        """정규화 후 같거나 문자 3-gram 자카드 유사도가 임계값 이상인 문장은 처음 것만 남깁니다."""
+        kept, kept_shingles = [], []
+        for sentence in sentences:
+            shingles = _sentence_shingles(sentence)
+            if any(len(shingles & other) / len(shingles | other) >= self.near_dup_threshold for other in kept_shingles):
+                continue
+            kept.append(sentence)
+            kept_shingles.append(shingles)
+        return kept
+
+    @staticmethod
+    def score_sentence(sentence: str, position: int, title_terms: set) -> float:
+        """수치, 고유명사, 인용문, 제목 단어, 기사 앞부분일수록 높은 점수를 줍니다."""
+        score = 1.5 * len(_NUMBER_PATTERN.findall(sentence))
+        score += 1.0 * len(_ENTITY_PATTERN.findall(sentence))
+        score += 2.0 * len(_QUOTE_PATTERN.findall(sentence))
+        if title_terms:
+            words = set(re.findall(r'[0-9A-Za-z가-힣]{2,}', sentence.lower()))
+            score += 1.0 * len(words & title_terms)
+        score += 1.5 / (1 + position)  # 리드 문장 가중
+        # 아주 짧은 문장이 토큰당 점수로 과대평가되지 않도록 약간 보정
+        return score + min(len(sentence), 200) / 200
+
+    def compress(self, text: str, title: str = '') -> str:
+        """
+        본문을 토큰 예산 안으로 압축합니다.
+
+        Args:
+            text (str): 추출된 본문
+            title (str): 기사 제목 (제목 단어가 들어간 문장을 우선)
+
+        Returns:
+            str: 압축된 본문 (예산 이하이면 상투 문구/중복만 제거한 본문)
+        """
+        original_tokens = count_tokens(text)
+        sentences = self._deduplicate([s for s in split_sentences(text) if not self.is_boilerplate(s)])
+        if not sentences:
+            return text
+
+        token_counts = [count_tokens(sentence) + 1 for sentence in sentences]
+        if sum(token_counts) <= self.token_budget:
+            chosen = range(len(sentences))
+        else:
+            title_terms = set(re.findall(r'[0-9A-Za-z가-힣]{2,}', (title or '').lower()))
+            scores = [self.score_sentence(sentence, i, title_terms) for i, sentence in enumerate(sentences)]
+            # 리드 문장은 항상 포함하고, 나머지는 토큰당 점수가 높은 순으로 예산까지 채움
+            chosen, used = {0}, token_counts[0]
+            for i in sorted(range(1, len(sentences)), key=lambda k: scores[k] / token_counts[k], reverse=True):
+                if used + token_counts[i] <= self.token_budget:
+                    chosen.add(i)
+                    used += token_counts[i]
+            chosen = sorted(chosen)
+
+        compressed = '\n'.join(sentences[i] for i in chosen)
+        with self._lock:
+            self.articles += 1
+            self.original_tokens += original_tokens
+            self.compressed_tokens += count_tokens(compressed)
+        return compressed
+
+
+_article_compressor = None
+_article_compressor_lock = threading.Lock()
+
+
+def get_article_compressor():
+    """본문 압축기를 반환합니다. COMPRESSION_TOKEN_BUDGET이 0 이하이면 None (압축 없이 전달)."""
+    global _article_compressor
+    if COMPRESSION_TOKEN_BUDGET <= 0:
+        return None
+    with _article_compressor_lock:
+        if _article_compressor is None:
+            _article_compressor = ArticleCompressor()
+        return _article_compressor
+
+
+# ------------------------------------------------------------------------------
+# 분석 결과 레코드 (JSON 응답을 한 번만 검증해 모든 렌더러가 공유)
+# ------------------------------------------------------------------------------
+ANALYSIS_FAILED_MESSAGE = "AI 심층 분석에 실패했습니다."
+ANALYSIS_SKIPPED_MESSAGE = "OpenAI API 키가 설정되지 않아 분석을 건너뜁니다."
+
+
+@dataclass
+class AnalysisRecord:
+    """
+    뉴스 1건의 심층 분석 결과.
+
+    Attributes:
+        summary (list): '주요 내용 요약' 항목 (글머리 기호 없는 문장)
+        implications (list): '시사점 및 전망' 항목
+        source_format (str): 'json'(정상 응답), 'markdown'(기존 형식 응답 대체 파싱), 'raw'(형식 해석 불가), 'error'
+        error (str): 분석 실패·건너뜀 사유 (정상이면 None)
+    """
+    summary: list = field(default_factory=list)
+    implications: list = field(default_factory=list)
+    source_format: str = 'json'
+    error: str = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @classmethod
+    def failed(cls, message: str = ANALYSIS_FAILED_MESSAGE):
+        return cls(source_format='error', error=message)
+
+
+_BULLET_PREFIX_PATTERN = re.compile(r'^\s*(?:(?:ㅇ|[-•*·▪◦])\s*|\d+[.)]\s+)')
+
+
+def _clean_bullets(values) -> list:
+    """문자열 또는 문자열 목록을 글머리 기호·마크다운 강조를 뺀 항목 목록으로 정리합니다."""
+    if isinstance(values, str):
+        values = values.splitlines()
+    if not isinstance(values, list):
+        return []
+    bullets = []
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        text = _BULLET_PREFIX_PATTERN.sub('', re.sub(r'\*+', '', value)).strip()
+        if text:
+            bullets.append(text)
+    return bullets
+
+
+_MARKDOWN_SECTION_PATTERN = re.compile(
+    r'^[#\s*]*(?:(1)\.\s*주요\s*내용\s*요약|(2)\.\s*시사점\s*및\s*전망)[\s*]*$', re.M
+)
+
+
+def parse_markdown_analysis(text: str) -> AnalysisRecord:
+    """
+    기존 마크다운 형식('### **1. 주요 내용 요약**' ...) 응답을 레코드로 변환하는 대체 파서.
+    '###', '**' 유무와 관계없이 두 섹션 제목을 한 번의 정규식 탐색으로 찾습니다.
+    """
+    sections = {}
+    matches = list(_MARKDOWN_SECTION_PATTERN.finditer(text or ''))
+    for k, match in enumerate(matches):
+        end = matches[k + 1].start() if k + 1 < len(matches) else len(text)
+        sections[match.group(1) or match.group(2)] = _clean_bullets(text[match.end():end])
+    if sections.get('1'):
+        return AnalysisRecord(summary=sections['1'], implications=sections.get('2', []), source_format='markdown')
+    if sections.get('2'):
+        # JSON 응답과 같은 기준: 주요 내용 요약이 비어 있으면 분석 실패로 처리
+        return AnalysisRecord.failed()
+    # 섹션 제목을 찾지 못하면 응답 전체를 요약 항목으로 사용 (제목 줄은 제외)
+    lines = [line for line in _clean_bullets(text or '') if not line.startswith('#')]
+    return AnalysisRecord(summary=lines, source_format='raw') if lines else AnalysisRecord.failed()
+
+
+def parse_analysis_response(text: str) -> AnalysisRecord:
+    """
+    분석 응답을 검증해 AnalysisRecord로 변환합니다.
+    {"summary": [...], "implications": [...]} JSON이 아니면 마크다운 대체 파서를 사용합니다.
+    """
+    payload = (text or '').strip()
+    payload = re.sub(r'^```(?:json)?\s*|\s*```$', '', payload)  # 코드 블록으로 감싼 응답 허용
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        summary = _clean_bullets(data.get('summary'))
+        implications = _clean_bullets(data.get('implications'))
+        if summary:
+            return AnalysisRecord(summary=summary, implications=implications, source_format='json')
+    return parse_markdown_analysis(text)
+
+
+def analyze_news_with_ai(news_item) -> AnalysisRecord:
+    """AI에게 뉴스를 보내 JSON 형식의 심층 분석을 요청하고, 검증된 AnalysisRecord를 반환하는 함수"""
+    if not OPENAI_API_KEY or OPENAI_API_KEY == "YOUR_OPENAI_API_KEY":
+        return AnalysisRecord.failed(ANALYSIS_SKIPPED_MESSAGE)
+
+    # 같은 입력(모델, 프롬프트 버전, 제목, 본문)으로 이미 분석한 결과가 있으면 그대로 사용
+    cache = get_analysis_cache()
+    cache_key = AnalysisCache.make_key(
+        ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION, news_item['title'], news_item.get('content', '')
+    )
+    if cache:
+        cached_analysis = cache.get(cache_key)
+        if cached_analysis:
+            print(f"      -> 분석 캐시 적중 (API 호출 생략)")
+            return parse_analysis_response(cached_analysis)
+    
+    # 💡💡💡 --- [수정] 프롬프트에 '뉴스 본문' 추가 --- 💡💡💡
+    prompt = f"""
+    # Mission
+    당신은 주어진 뉴스 기사 1개를 분석하여, ICT 표준·정책 전문가를 위한 '심층 분석 보고서'를 생성하는 AI 애널리스트입니다. 보고서의 모든 내용은 반드시 기사 본문에 명시된 사실, 데이터, 인용에 근거해야 하며, 당신의 사전 지식이나 외부 정보를 추가해서는 안 됩니다. 분석은 기사의 단편적 정보를 연결하여 기술, 정책, 시장 관점의 구체적인 시사점을 도출하는 데 초점을 맞춥니다.
+
+    # Persona
+    - **정체성:** 20년 경력의 ICT 표준·정책 전문 애널리스트.
+    - **전문성:** 기사 속 데이터와 인용문을 근거로, 기술적·정책적·시장적 인과관계를 분석하고 실질적인 파급효과를 예측하는 데 능숙함.
+    - **핵심 원칙:** 철저한 '기사 기반(Article-Based)' 분석. 모든 분석과 전망은 기사의 특정 문장이나 수치에 기반하여 논리를 전개함.
+
+    # Process (Step-by-Step)
+    1.  **[1단계: 핵심 정보 추출]**
+    - 기사에서 '누가, 언제, 어디서, 무엇을, 어떻게, 왜'에 해당하는 6하 원칙 기반의 핵심 사실(fact)을 모두 추출하여 목록화합니다.
+    - 기사에 언급된 모든 구체적인 수치, 통계, 일정, 고유명사(인물, 기업, 기관, 기술명)를 정확히 식별합니다.
+    - 주요 이해관계자들의 발언을 인용문 형태로 그대로 추출합니다.
+
+    2.  **[2단계: 분석 및 보고서 작성]**
+    - 아래 **[OUTPUT FORMAT]**에 정의된 구조에 따라 보고서를 작성합니다.
+    - **[주요 내용 요약]** 파트: 1단계에서 추출한 객관적 사실만을 사용하여 기사의 핵심 내용을 재구성합니다. 어떠한 주관적 해석이나 외부 정보도 포함하지 않습니다.
+    - **[시사점 및 전망]** 파트: **[주요 내용 요약]**에서 정리된 특정 사실이나 발언을 직접 인용하며, 그것이 왜 중요한지, 어떤 구체적인 영향을 미칠 것인지를 논리적으로 연결하여 분석합니다. "A라는 발언은 B라는 기술 표준 논의에 C와 같은 영향을 미칠 것"과 같이 명확하게 서술합니다.
+    - 문장은 '~로 분석됨', '~로 판단됨', '~를 시사함' 등 **전문가적 판단을 가미한 서술형 문체**로 작성할 것.
+
+    # CONSTRAINTS
+    - **엄격한 근거 제시:** 모든 분석과 전망은 "기사에 따르면...", "OOO의 발언을 통해 볼 때..." 와 같이 명확한 근거를 제시해야 합니다.
+    - **추론 금지:** 기사에 명시되지 않은 내용은 절대 언급하지 마십시오.
+    - **구체성:** "큰 영향을 미칠 것"과 같은 추상적 표현 대신, "어떤 가치사슬(e.g., 칩셋, 단말, 플랫폼)에 어떤 변화를 유발할 것"처럼 구체적으로 서술하십시오.
+    - **전문가적 문체:** '~로 판단됨', '~를 의미함', '~가 예상됨' 등 전문가의 분석적 어조를 일관되게 사용하십시오.
+        
+    # Input Data
+    - 뉴스 제목: {news_item['title']}
+    - 원문 링크: {news_item['link']}
+    - 뉴스 본문:
+    ---
+    {news_item.get('content', '본문 내용을 가져올 수 없었습니다.')}
+    ---
+
+    # OUTPUT FORMAT (JSON)
+    아래 구조의 JSON 객체 하나만 출력하십시오. 마크다운, 코드 블록, 설명 문장을 덧붙이지 마십시오.
+    {{"summary": ["...", "..."], "implications": ["..."]}}
+
+    - "summary" (1. 주요 내용 요약): 문자열 배열, 2~4개 항목. 각 항목은 글머리 기호 없이 1~2개의 문장으로 작성.
+      ① 핵심 내용 요약(누가, 무엇을 했는가) ② 사건의 배경과 원인 ③ 핵심 수치·일정·데이터와 그 의미 ④ 주요 인물·기관의 발언이나 공식 입장 순서로 작성하며, 기사에 해당 내용이 없는 항목은 생략
+    - "implications" (2. 시사점 및 전망): 문자열 배열, 1~2개 항목. 기사 내용이 ICT 기술, 표준, 정책, 산업에 미치는 영향과 전망을 1~2문장으로 압축하여 서술
+    """
+    
+    try:
+        response = call_openai_with_retry(
+            model=ANALYSIS_MODEL,
+            messages=[
+                {"role": "system", "content": "당신은 ICT 표준 정책 분석 최고 전문가입니다. 제공된 기사 본문만을 근거로 '주요 내용 요약'과 '시사점 및 전망'을 작성하며, 결과는 지정된 JSON 객체로만 응답합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3, max_tokens=1500, # 토큰 길이 상향
+            response_format={"type": "json_object"},
+        )
+        analysis = response.choices[0].message.content
+        record = parse_analysis_response(analysis)
+        if record.source_format != 'json':
+            print(f"      (정보) JSON 형식이 아닌 응답을 대체 파서로 처리했습니다 ({record.source_format})")
+        # 형식을 해석할 수 있었던 응답만 캐시 (깨진 응답이 다음 실행에 재사용되지 않도록)
+        if cache and record.ok and record.source_format != 'raw':
+            total_tokens = response.usage.total_tokens if getattr(response, 'usage', None) else 0
+            cache.put(cache_key, ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION, analysis, total_tokens)
+        return record
+    except Exception as e:
+        print(f"  (경고) AI 심층 분석 실패 ({news_item['title']}): {e}")
+        return AnalysisRecord.failed()
+
+
+class PipelineStageStats:
+    """파이프라인 단계별 처리 건수, 작업 시간, 대기(유휴) 시간, 입력 대기열 깊이를 기록합니다."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.idle_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, queue_depth: int):
+        with self._lock:
+            self.idle_seconds += seconds
+            self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+            self._depth_total += queue_depth
+            self._depth_samples += 1
+
+    def record_work(self, seconds: float):
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += seconds
+
+    @property
+    def avg_queue_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+
+_PIPELINE_STOP = object()
+
+
+def _timed_get(work_queue: queue.Queue, stats: PipelineStageStats):
+    """대기열에서 항목을 꺼내며 대기 시간과 대기열 깊이를 기록합니다."""
+    depth = work_queue.qsize()
+    waited_from = time.monotonic()
+    entry = work_queue.get()
+    stats.record_wait(time.monotonic() - waited_from, depth)
+    return entry
+
+
+def run_analysis_pipeline(news_items: list, on_result=None, fetch_workers: int = PIPELINE_FETCH_WORKERS,
+                          analysis_workers: int = ANALYSIS_MAX_IN_FLIGHT, queue_size: int = PIPELINE_QUEUE_SIZE) -> list:
+    """
+    본문 수집 → AI 분석 → 보고서 조립을 크기가 제한된 대기열로 연결한 스트리밍 파이프라인.
+    N번째 기사를 분석하는 동안 N+1..N+k번째 기사의 본문을 미리 받아 두고,
+    분석이 끝난 결과는 원래 순서대로 on_result(index, item)에 바로 넘겨 조립을 시작할 수 있게 합니다.
+
+    Args:
+        news_items (list): 분석할 뉴스 항목 목록 (제자리에서 content / analysis_result 추가)
+        on_result (callable): 원래 순서대로 결과가 준비될 때마다 호출할 함수 (index, item)
+        fetch_workers (int): 본문 수집 작업자 수
+        analysis_workers (int): 동시에 진행할 AI 분석 수
+        queue_size (int): 단계 사이 대기열 최대 크기
+
+    Returns:
+        list: 입력과 같은 순서의 분석 완료 뉴스 항목 목록
+    """
+    if not news_items:
+        return []
+
+    total = len(news_items)
+    fetch_workers = max(1, min(fetch_workers, total))
+    analysis_workers = max(1, min(analysis_workers, total))
+    fetch_queue = queue.Queue()
+    analysis_queue = queue.Queue(maxsize=max(1, queue_size))
+    result_queue = queue.Queue()
+    stage_stats = {name: PipelineStageStats(name) for name in ('본문 수집', 'AI 분석', '보고서 조립')}
+    remaining = {'fetch': fetch_workers, 'analysis': analysis_workers}
+    compressor = get_article_compressor()
+    remaining_lock = threading.Lock()
+
+    def _worker_finished(stage: str, next_queue: queue.Queue, stop_count: int):
+        # 단계의 마지막 작업자가 끝나면 다음 단계 작업자 수만큼 종료 신호 전달
+        with remaining_lock:
+            remaining[stage] -= 1
+            is_last = remaining[stage] == 0
+        if is_last:
+            for _ in range(stop_count):
+                next_queue.put(_PIPELINE_STOP)
+
+    def _fetch_worker():
+        stats = stage_stats['본문 수집']
+        while True:
+            entry = _timed_get(fetch_queue, stats)
+            if entry is _PIPELINE_STOP:
+                break
+            i, item = entry
+            started = time.monotonic()
+            try:
+                item['content'] = get_article_content(item['link'], max_length=ARTICLE_MAX_CHARS)
+            except Exception as e:
+                item['content'] = f"{ARTICLE_FAILURE_PREFIX} (알 수 없는 오류): {e}"
+            if is_article_fetch_failure(item['content']):
+                print(f"      (경고) [{i+1}] {item['content'][:150]}")
+            elif compressor:
+                # 상투 문구·중복 문장을 빼고 정보량 높은 문장만 토큰 예산 안으로 선별
+                try:
+                    item['content'] = compressor.compress(item['content'], item['title'])
+                except Exception as e:
+                    print(f"      (정보) [{i+1}] 본문 압축 실패, 원문 앞부분 사용: {str(e)[:100]}")
+                    item['content'] = item['content'][:5000]
+            stats.record_work(time.monotonic() - started)
+            analysis_queue.put((i, item))  # 분석 대기열이 가득 차면 여기서 대기 (역압)
+        _worker_finished('fetch', analysis_queue, analysis_workers)
+
+    def _analysis_worker():
+        stats = stage_stats['AI 분석']
+        while True:
+            entry = _timed_get(analysis_queue, stats)
+            if entry is _PIPELINE_STOP:
+                break
+            i, item = entry
+            started = time.monotonic()
+            print(f"  ({i+1}/{total}) 분석 중: {item['title'][:40]}...")
+            try:
+                item['analysis_result'] = analyze_news_with_ai(item)
+            except Exception as e:
+                print(f"  (경고) AI 심층 분석 실패 ({item['title']}): {e}")
+                item['analysis_result'] = AnalysisRecord.failed()
+            stats.record_work(time.monotonic() - started)
+            result_queue.put((i, item))
+        _worker_finished('analysis', result_queue, 1)
+
+    started = time.monotonic()
+    for entry in enumerate(news_items):
+        fetch_queue.put(entry)
+    for _ in range(fetch_workers):
+        fetch_queue.put(_PIPELINE_STOP)
+
+    threads = [threading.Thread(target=_fetch_worker, name=f"pipeline-fetch-{n}", daemon=True) for n in range(fetch_workers)]
+    threads += [threading.Thread(target=_analysis_worker, name=f"pipeline-analysis-{n}", daemon=True) for n in range(analysis_workers)]
+    for thread in threads:
+        thread.start()
+
+    # 보고서 조립 단계 (메인 스레드): 도착한 결과를 원래 순서대로 내보냄
+    results = [None] * total
+    assembly_stats = stage_stats['보고서 조립']
+    next_index = 0
+    while True:
+        entry = _timed_get(result_queue, assembly_stats)
+        if entry is _PIPELINE_STOP:
+            break
+        i, item = entry
+        results[i] = item
+        while next_index < total and results[next_index] is not None:
+            assembled_from = time.monotonic()
+            if on_result:
+                try:
+                    on_result(next_index, results[next_index])
+                except Exception as e:
+                    print(f"  (경고) 보고서 조립 중 오류 ({next_index + 1}번): {e}")
+            assembly_stats.record_work(time.monotonic() - assembled_from)
+            next_index += 1
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - started
+    print(f"\n⏱️  파이프라인 소요 시간: {elapsed:.1f}초 (본문 수집 {fetch_workers}개, AI 분석 {analysis_workers}개 동시)")
+    for stats in stage_stats.values():
+        print(f"    • {stats.name}: 처리 {stats.processed}건, 작업 {stats.busy_seconds:.1f}초, "
+              f"유휴 {stats.idle_seconds:.1f}초, 입력 대기열 평균 {stats.avg_queue_depth:.1f} / 최대 {stats.max_queue_depth}")
+    if compressor and compressor.articles:
+        saved = compressor.original_tokens - compressor.compressed_tokens
+        print(f"    • 본문 압축: {compressor.articles}건, 입력 토큰 {compressor.original_tokens:,} → "
+              f"{compressor.compressed_tokens:,} ({saved / max(1, compressor.original_tokens) * 100:.0f}% 절감)")
+    return [item for item in results if item is not None]
+
+
+# ==============================================================================
+# --- 5. 구글 문서 생성 함수 (디자인 개선) ---
+# ==============================================================================
+
+
+_google_services = None
+_google_services_lock = threading.Lock()
+
+
+def _token_needs_refresh(creds, margin_seconds: float = GOOGLE_TOKEN_REFRESH_MARGIN) -> bool:
+    """액세스 토큰이 없거나 만료까지 margin_seconds 이내로 남았으면 True."""
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False  # 만료 시각을 모르면 그대로 쓰고, 401 응답 시 클라이언트가 자동 갱신
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)  # google-auth는 naive UTC 사용
+    return (creds.expiry - now).total_seconds() <= margin_seconds
+
+
+def load_google_credentials():
+    """
+    token.json의 자격 증명을 읽고, 만료가 임박했을 때만 갱신해 다시 저장합니다.
+    토큰이 없으면 브라우저 인증을 진행하고, 로컬 대체 서버를 쓰는 테스트에서는 익명 자격 증명을 반환합니다.
+    """
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
+    creds = None
+    if os.path.exists('token.json'):
+        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    elif GOOGLE_API_ENDPOINT:
+        from google.auth.credentials import AnonymousCredentials
+        return AnonymousCredentials()
+
+    if creds and not _token_needs_refresh(creds):
+        return creds
+    if creds and creds.refresh_token:
+        creds.refresh(Request())
+    else:
+        flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+        creds = flow.run_local_server(port=0)
+    with open('token.json', 'w') as token:
+        token.write(creds.to_json())
+    return creds
+
+
+def _google_client_options(service_path: str):
+    """
+    GOOGLE_API_ENDPOINT가 지정되면 서비스별 접속 주소를 만듭니다.
+    api_endpoint는 discovery 문서의 rootUrl + servicePath 전체를 대체하므로 servicePath를 직접 붙입니다.
+    """
+    if not GOOGLE_API_ENDPOINT:
+        return None
+    return {'api_endpoint': urllib.parse.urljoin(GOOGLE_API_ENDPOINT.rstrip('/') + '/', service_path)}
+
+
+def get_google_docs_service():
+    """
+    Google Docs와 Drive API 서비스를 (최초 1회) 인증·생성하고 이후에는 재사용합니다.
+    discovery 문서는 네트워크로 받지 않고 google-api-python-client에 포함된 정적 문서를 사용합니다.
+
+    Returns:
+        tuple: (docs_service, drive_service)
+    """
+    global _google_services
+    with _google_services_lock:
+        if _google_services is None:
+            from googleapiclient.discovery import build
+
+            started = time.monotonic()
+            creds = load_google_credentials()
+            options = {'credentials': creds, 'static_discovery': True, 'cache_discovery': False}
+            docs_service = build('docs', 'v1', client_options=_google_client_options(''), **options)
+            drive_service = build('drive', 'v3', client_options=_google_client_options('drive/v3/'), **options)
+            _google_services = (docs_service, drive_service)
+            print(f"  > 구글 서비스 준비 완료 ({(time.monotonic() - started) * 1000:.0f}ms)")
+        return _google_services
+
+
+class DocsRequestBuilder:
+    """
+    Google Docs batchUpdate 요청 목록을 만들며 삽입 위치를 UTF-16 코드 단위로 추적합니다.
+    (Docs API의 index는 UTF-16 기준이라 이모지 등 보조 평면 문자는 2칸을 차지함)
+    삽입 1건과 그 스타일 요청들을 하나의 단위로 묶어, 배치를 나눌 때 단위가 쪼개지지 않게 합니다.
+    """
+
+    def __init__(self, start_index: int = 1):
+        self.start_index = start_index
+        self.index = start_index
+        self.units = []  # (요청 목록, 삽입 후 위치)
+
+    @staticmethod
+    def utf16_len(text: str) -> int:
+        return len(text.encode('utf-16-le')) // 2
+
+    def add_text(self, text: str, text_style: tuple = None, paragraph_style: tuple = None, style_trim: int = 0) -> tuple:
+        """
+        현재 위치에 텍스트를 삽입하고 스타일을 적용하는 요청을 추가합니다.
+
+        Args:
+            text (str): 삽입할 텍스트
+            text_style (tuple): (textStyle, fields) - 글자 스타일
+            paragraph_style (tuple): (paragraphStyle, fields) - 문단 스타일
+            style_trim (int): 글자 스타일 범위 끝에서 제외할 길이 (끝의 줄바꿈 등)
+
+        Returns:
+            tuple: 삽입된 텍스트의 (시작, 끝) 위치
+        """
+        start = self.index
+        end = start + self.utf16_len(text)
+        unit = [{'insertText': {'location': {'index': start}, 'text': text}}]
+        if paragraph_style:
+            unit.append({'updateParagraphStyle': {'range': {'startIndex': start, 'endIndex': end},
+                                                  'paragraphStyle': paragraph_style[0], 'fields': paragraph_style[1]}})
+        if text_style and end - style_trim > start:
+            unit.append({'updateTextStyle': {'range': {'startIndex': start, 'endIndex': end - style_trim},
+                                             'textStyle': text_style[0], 'fields': text_style[1]}})
+        self.units.append((unit, end))
+        self.index = end
+        return start, end
+
+    def batches(self, max_requests: int = DOCS_BATCH_MAX_REQUESTS, max_bytes: int = DOCS_BATCH_MAX_BYTES) -> list:
+        """
+        요청 단위들을 크기 제한에 맞는 배치로 나눕니다.
+
+        Returns:
+            list: [{'requests': [...], 'end_index': 배치 적용 후 마지막 삽입 위치}, ...]
+        """
+        batches, current, current_bytes, end_index = [], [], 0, self.start_index
+        for unit, unit_end in self.units:
+            unit_bytes = len(json.dumps(unit, ensure_ascii=False).encode('utf-8'))
+            if current and (len(current) + len(unit) > max_requests or current_bytes + unit_bytes > max_bytes):
+                batches.append({'requests': current, 'end_index': end_index})
+                current, current_bytes = [], 0
+            current.extend(unit)
+            current_bytes += unit_bytes
+            end_index = unit_end
+        if current:
+            batches.append({'requests': current, 'end_index': end_index})
+        return batches
+
+
+class DocsJobStore:
+    """
+    문서 작성 진행 상황(문서 ID, 반영 완료된 배치 수)을 상태 저장소에 기록합니다.
+    같은 요청 목록으로 다시 실행하면 새 문서를 만들지 않고 마지막으로 반영된 배치 다음부터 이어 씁니다.
+    """
+
+    def __init__(self):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS docs_jobs (
+                    job_key TEXT PRIMARY KEY,
+                    document_id TEXT NOT NULL,
+                    document_url TEXT NOT NULL,
+                    batches_total INTEGER NOT NULL,
+                    batches_done INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            db.commit()
+
+    @staticmethod
+    def make_key(document_title: str, batches: list) -> str:
+        payload = json.dumps([document_title, [batch['requests'] for batch in batches]], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, job_key: str) -> tuple:
+        """(document_id, document_url, batches_done)를 반환합니다. 기록이 없으면 None."""
+        with _state_db_lock:
+            return get_state_db().execute(
+                "SELECT document_id, document_url, batches_done FROM docs_jobs WHERE job_key = ?", (job_key,)
+            ).fetchone()
+
+    def start(self, job_key: str, document_id: str, document_url: str, batches_total: int):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR REPLACE INTO docs_jobs (job_key, document_id, document_url, batches_total, batches_done, updated_at) "
+                "VALUES (?, ?, ?, ?, 0, ?)",
+                (job_key, document_id, document_url, batches_total, time.time())
+            )
+            db.commit()
+
+    def update(self, job_key: str, batches_done: int):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("UPDATE docs_jobs SET batches_done = ?, updated_at = ? WHERE job_key = ?",
+                       (batches_done, time.time(), job_key))
+            db.commit()
+
+    def finish(self, job_key: str):
+        """완료된 작업과 일주일 넘게 방치된 미완료 작업 기록을 지웁니다."""
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("DELETE FROM docs_jobs WHERE job_key = ? OR updated_at < ?", (job_key, time.time() - 7 * 86400))
+            db.commit()
+
+
+_docs_job_store = None
+
+
+def get_docs_job_store():
+    """문서 작성 진행 기록 저장소를 반환합니다. 상태 저장소를 열 수 없으면 None (이어 쓰기 없이 동작)."""
+    global _docs_job_store
+    with _state_db_lock:
+        if _docs_job_store is None:
+            try:
+                _docs_job_store = DocsJobStore()
+            except sqlite3.Error as e:
+                print(f"    (경고) 문서 작성 기록을 열 수 없어 이어 쓰기 없이 진행합니다: {e}")
+                return None
+        return _docs_job_store
+
+
+def _docs_end_index(docs_service, document_id: str) -> int:
+    """문서 본문의 끝 위치(마지막 줄바꿈 다음)를 조회합니다."""
+    document = docs_service.documents().get(documentId=document_id, fields='body.content(endIndex)').execute()
+    content = document.get('body', {}).get('content', [])
+    return content[-1].get('endIndex', 1) if content else 1
+
+
+def committed_batch_count(docs_service, document_id: str, batches: list, start_index: int = 1) -> int:
+    """
+    문서의 현재 끝 위치로 몇 번째 배치까지 실제로 반영되었는지 판단합니다.
+    (모든 배치는 텍스트를 삽입하므로 배치마다 끝 위치가 달라짐)
+
+    Returns:
+        int: 반영된 배치 수 (어느 배치 경계와도 맞지 않으면 None - 다른 내용이 섞인 문서)
+    """
+    end_index = _docs_end_index(docs_service, document_id) - 1
+    if end_index == start_index:
+        return 0
+    for k, batch in enumerate(batches):
+        if batch['end_index'] == end_index:
+            return k + 1
+    return None
+
+
+def _is_retryable_docs_error(error: Exception) -> bool:
+    from googleapiclient.errors import HttpError
+
+    if isinstance(error, HttpError):
+        return error.resp.status in (429, 500, 502, 503, 504)
+    return isinstance(error, (OSError, ConnectionError))
+
+
+def submit_docs_batches(docs_service, document_id: str, batches: list, first_batch: int = 0,
+                        on_commit=None, max_retries: int = DOCS_MAX_RETRIES, start_index: int = 1) -> int:
+    """
+    배치들을 순서대로 batchUpdate로 보내고, 일시적 오류는 지수 백오프 후 재시도합니다.
+    재시도 전에는 문서 끝 위치를 확인해, 응답만 유실되고 실제로는 반영된 배치를 중복 삽입하지 않습니다.
+
+    Args:
+        docs_service: Docs API 서비스
+        document_id (str): 문서 ID
+        batches (list): DocsRequestBuilder.batches() 결과
+        first_batch (int): 이어 쓰기 시작할 배치 번호
+        on_commit (callable): 배치가 반영될 때마다 반영된 배치 수를 넘겨 호출
+        max_retries (int): 배치별 최대 재시도 횟수
+        start_index (int): 첫 배치가 삽입을 시작하는 위치
+
+    Returns:
+        int: 반영된 배치 수
+    """
+    for k in range(first_batch, len(batches)):
+        for attempt in range(max_retries + 1):
+            try:
+                docs_service.documents().batchUpdate(
+                    documentId=document_id, body={'requests': batches[k]['requests']}
+                ).execute()
+                break
+            except Exception as e:
+                if attempt >= max_retries or not _is_retryable_docs_error(e):
+                    raise
+                delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+                print(f"      (재시도 {attempt + 1}/{max_retries}) 문서 배치 {k + 1}/{len(batches)}: "
+                      f"{type(e).__name__}, {delay:.1f}초 후 다시 시도합니다.")
+                time.sleep(delay)
+                try:
+                    if committed_batch_count(docs_service, document_id, batches, start_index) == k + 1:
+                        break  # 요청은 반영되었고 응답만 유실됨
+                except Exception:
+                    pass
+        if on_commit:
+            on_commit(k + 1)
+    return len(batches)
+
 
-    formatted_news_list = ""
-    for i, item in enumerate(news_items):
-        formatted_news_list += f"{i}: {item['title']}\n"
+_DOCS_GRAY = {'color': {'rgbColor': {'red': 0.5, 'green': 0.5, 'blue': 0.5}}}
 
-    prompt = f"""
-    당신은 ICT 표준 정책 최고 전문가의 수석 보좌관입니다.
-    당신의 임무는 아래 뉴스 목록에서 먼저 내용이 중복되는 기사들을 제거한 뒤, '표준 정책 입안자'의 관점에서 가장 중요한 뉴스 20개를 선별하는 것입니다.
 
-    [작업 절차]
-    1. **중복 제거**: 아래 뉴스 목록에서 사실상 동일한 사건이나 주제를 다루는 기사들을 하나의 그룹으로 묶고, 각 그룹에서 가장 포괄적인 대표 기사 하나만 남깁니다.
-    2. **최종 선별**: 중복이 제거된 뉴스 목록에서, 아래 [선별 최우선 기준]에 따라 가장 중요한 뉴스 20개를 최종적으로 선별합니다.
+def report_document_title() -> str:
+    current_date = datetime.date.today().strftime('%Y년 %m월 %d일')
+    return f"전파·이동통신 동향 보고서 ({current_date})"
 
-    [선별 최우선 기준]
-    정책적 중요도를 최우선으로 고려하며, 특히 아래 주제를 다루는 국내외 뉴스에 높은 가중치를 부여합니다.
-    - **해외 주요국 정책/규제**: 미국(FCC), 유럽(ETSI) 등 해외 주요국의 ICT 정책, 법안, 규제 변화
-    - **국제 표준화 동향**: 3GPP, ITU 등 국제 표준화 기구의 주요 결정 및 논의 사항
-    - **국내 정부 계획 및 발표**: 국내 정부 부처가 발표하는 ICT 정책, 법안, 기술 개발 계획
-    - **산업계 핵심 동향**: ICT 산업 및 시장 판도에 큰 영향을 미치는 국내외 기업의 기술 개발 및 사업 전략
-    - **정책 비판 및 대안**: 현재 정책의 문제점을 지적하거나 새로운 대안을 제시하는 기사
 
+# ------------------------------------------------------------------------------
+# 보고서 모델 (한 번 만들어 구글 문서 / 이메일 HTML / 이메일 텍스트로 렌더링)
+# ------------------------------------------------------------------------------
+@dataclass
+class ReportItem:
+    """심층 분석된 뉴스 1건"""
+    number: int
+    title: str
+    source: str
+    published: str
+    link: str
+    analysis: AnalysisRecord
 
-    [뉴스 목록]
-    {formatted_news_list}
+    @classmethod
+    def from_news(cls, number: int, data: dict):
+        return cls(
+            number=number,
+            title=str(data.get('title', '제목 없음')),
+            source=str(data.get('source', '출처 불명')),
+            published=str(data.get('published', '날짜 없음')),
+            link=str(data.get('link', '#')),
+            analysis=data.get('analysis_result') or AnalysisRecord.failed(),
+        )
 
-    [요청]
-    위 절차와 기준에 따라 최종적으로 선별된 뉴스의 번호 20개만 쉼표(,)로 구분하여 응답해 주십시오.
-    예시: 3, 8, 12, 15, 21, 23, 25, 30, 31, 33, 40, 41, 42, 45, 50
-    (설명이나 다른 텍스트는 절대 포함하지 마세요. 번호만 응답해야 합니다.)
-    """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "당신은 ICT 표준 정책 전문가의 유능한 보좌관입니다. 주어진 뉴스 목록에서 중복을 제거하고, 정책적 중요도가 가장 높은 20개를 골라 번호만 응답합니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.0,
-        )
-        selected_indices_str = response.choices[0].message.content
-        print(f"  > AI가 선별한 뉴스 인덱스: {selected_indices_str}")
+@dataclass
+class OtherNewsEntry:
+    """선별되지 않은 기타 뉴스 1건"""
+    title: str
+    source: str
+    link: str
 
-        selected_indices = [int(i.strip()) for i in selected_indices_str.split(',')]
-        
-        filtered_news = [news_items[i] for i in selected_indices if i < len(news_items)]
-        
-        if not filtered_news:
-             raise ValueError("AI가 유효한 인덱스를 반환하지 않았습니다.")
-            
-        return filtered_news
 
-    except Exception as e:
-        print(f"  (경고) AI 뉴스 선별 실패: {e}. 최신 뉴스 20개로 대체합니다.")
-        return news_items[:20]
+@dataclass
+class Report:
+    """보고서 전체 (doc_url은 구글 문서가 만들어진 뒤 채워짐)"""
+    title: str
+    items: list
+    other_news: list
+    doc_url: str = None
 
-# ==============================================================================
-# --- 4. AI 심층 분석 함수 (프롬프트 수정) ---
-# ==============================================================================
-def analyze_news_with_ai(news_item):
-    """AI에게 뉴스를 보내 새로운 형식으로 심층 분석을 요청하는 함수"""
-    if not OPENAI_API_KEY or OPENAI_API_KEY == "YOUR_OPENAI_API_KEY":
-        return "OpenAI API 키가 설정되지 않아 분석을 건너뜁니다."
-        
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-    
-    # 💡💡💡 --- [수정] 프롬프트에 '뉴스 본문' 추가 --- 💡💡💡
-    prompt = f"""
-    # Mission
-    당신은 주어진 뉴스 기사 1개를 분석하여, ICT 표준·정책 전문가를 위한 '심층 분석 보고서'를 생성하는 AI 애널리스트입니다. 보고서의 모든 내용은 반드시 기사 본문에 명시된 사실, 데이터, 인용에 근거해야 하며, 당신의 사전 지식이나 외부 정보를 추가해서는 안 됩니다. 분석은 기사의 단편적 정보를 연결하여 기술, 정책, 시장 관점의 구체적인 시사점을 도출하는 데 초점을 맞춥니다.
 
-    # Persona
-    - **정체성:** 20년 경력의 ICT 표준·정책 전문 애널리스트.
-    - **전문성:** 기사 속 데이터와 인용문을 근거로, 기술적·정책적·시장적 인과관계를 분석하고 실질적인 파급효과를 예측하는 데 능숙함.
-    - **핵심 원칙:** 철저한 '기사 기반(Article-Based)' 분석. 모든 분석과 전망은 기사의 특정 문장이나 수치에 기반하여 논리를 전개함.
+REPORT_DISCLAIMER = "※ 본 보고서의 내용은 AI가 생성한 분석으로, 개인적인 의견을 포함하지 않습니다."
 
-    # Process (Step-by-Step)
-    1.  **[1단계: 핵심 정보 추출]**
-    - 기사에서 '누가, 언제, 어디서, 무엇을, 어떻게, 왜'에 해당하는 6하 원칙 기반의 핵심 사실(fact)을 모두 추출하여 목록화합니다.
-    - 기사에 언급된 모든 구체적인 수치, 통계, 일정, 고유명사(인물, 기업, 기관, 기술명)를 정확히 식별합니다.
-    - 주요 이해관계자들의 발언을 인용문 형태로 그대로 추출합니다.
 
-    2.  **[2단계: 분석 및 보고서 작성]**
-    - 아래 **[OUTPUT FORMAT]**에 정의된 구조에 따라 보고서를 작성합니다.
-    - **[주요 내용 요약]** 파트: 1단계에서 추출한 객관적 사실만을 사용하여 기사의 핵심 내용을 재구성합니다. 어떠한 주관적 해석이나 외부 정보도 포함하지 않습니다.
-    - **[시사점 및 전망]** 파트: **[주요 내용 요약]**에서 정리된 특정 사실이나 발언을 직접 인용하며, 그것이 왜 중요한지, 어떤 구체적인 영향을 미칠 것인지를 논리적으로 연결하여 분석합니다. "A라는 발언은 B라는 기술 표준 논의에 C와 같은 영향을 미칠 것"과 같이 명확하게 서술합니다.
-    - 문장은 '~로 분석됨', '~로 판단됨', '~를 시사함' 등 **전문가적 판단을 가미한 서술형 문체**로 작성할 것.
+def build_report(analyzed_data: list, other_news: list, report_title: str = None) -> Report:
+    """분석 결과와 기타 뉴스 목록으로 보고서 모델을 만듭니다."""
+    return Report(
+        title=report_title or report_document_title(),
+        items=[ReportItem.from_news(i + 1, data) for i, data in enumerate(analyzed_data)],
+        other_news=[
+            OtherNewsEntry(str(item.get('title', '제목 없음')), str(item.get('source', '출처 불명')), str(item.get('link', '#')))
+            for item in other_news
+        ],
+    )
 
-    # CONSTRAINTS
-    - **엄격한 근거 제시:** 모든 분석과 전망은 "기사에 따르면...", "OOO의 발언을 통해 볼 때..." 와 같이 명확한 근거를 제시해야 합니다.
-    - **추론 금지:** 기사에 명시되지 않은 내용은 절대 언급하지 마십시오.
-    - **구체성:** "큰 영향을 미칠 것"과 같은 추상적 표현 대신, "어떤 가치사슬(e.g., 칩셋, 단말, 플랫폼)에 어떤 변화를 유발할 것"처럼 구체적으로 서술하십시오.
-    - **전문가적 문체:** '~로 판단됨', '~를 의미함', '~가 예상됨' 등 전문가의 분석적 어조를 일관되게 사용하십시오.
-        
-    # Input Data
-    - 뉴스 제목: {news_item['title']}
-    - 원문 링크: {news_item['link']}
-    - 뉴스 본문:
-    ---
-    {news_item.get('content', '본문 내용을 가져올 수 없었습니다.')}
-    ---
 
-    # OUTPUT FORMAT
+def add_report_header(builder: DocsRequestBuilder, document_title: str):
+    """문서 제목과 AI 분석 고지 문구를 추가합니다."""
+    # --- 문서 제목 스타일링 ---
+    builder.add_text(f"{document_title}\n",
+                     text_style=({'fontSize': {'magnitude': 18, 'unit': 'PT'}, 'bold': True}, 'fontSize,bold'),
+                     paragraph_style=({'alignment': 'CENTER'}, 'alignment'), style_trim=1)
 
-    ## **뉴스 심층 분석 보고서**
+    # --- AI 분석 고지 문구 ---
+    builder.add_text(f"{REPORT_DISCLAIMER}\n\n",
+                     text_style=({'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'italic': True, 'foregroundColor': _DOCS_GRAY},
+                                 'fontSize,italic,foregroundColor'),
+                     paragraph_style=({'alignment': 'CENTER'}, 'alignment'), style_trim=2)
 
-    ### **1. 주요 내용 요약**
-    ㅇ [기사 본문을 기반으로 핵심 내용을 1-2개의 문장으로 요약. 누가, 무엇을 했는가에 초점을 맞추고, 문장을 'ㅇ'으로 시작하는 글머리 기호로 작성]
-    ㅇ [기사에 나타난 사건의 배경과 원인을 객관적으로 서술. 문장을 'ㅇ'으로 시작하는 글머리 기호로 작성, 해당 내용이 없으면 해당 섹션을 생략]
-    ㅇ [기사에 언급된 핵심 수치, 일정, 데이터를 인용하고 그것이 의미하는 팩트를 설명. 문장을 'ㅇ'으로 시작하는 글머리 기호로 작성, 해당 내용이 없으면 해당 섹션을 생략]
-    ㅇ [주요 인물 또는 기관의 발언이나 공식 입장을 인용하여 정리. 문장을 'ㅇ'으로 시작하는 글머리 기호로 작성, 해당 내용이 없으면 해당 섹션을 생략]
 
-    ### **2. 시사점 및 전망**
-    ㅇ [기사 내용이 ICT 기술, 표준, 정책, 산업에 미치는 영향과 전망을 'ㅇ'으로 시작하는 글머리 기호로 1~2문장으로 압축하여 서술, 일부 해당 내용이 없으면 해당 섹션을 생략]
-    """
+def add_report_item(builder: DocsRequestBuilder, item: ReportItem):
+    """뉴스 1건(제목, 메타데이터, 분석 섹션)을 추가합니다."""
+    # 뉴스 제목
+    builder.add_text(f"[{item.number}] {item.title}\n",
+                     text_style=({'fontSize': {'magnitude': 14, 'unit': 'PT'}, 'bold': True}, 'fontSize,bold'))
+
+    # 메타데이터 (출처, 발행일, 링크)
+    builder.add_text(f"출처: {item.source} | 발행일: {item.published}\n",
+                     text_style=({'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'foregroundColor': _DOCS_GRAY},
+                                 'fontSize,foregroundColor'))
+    builder.add_text(f"원본 링크: {item.link}\n\n",
+                     text_style=({'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'link': {'url': item.link}},
+                                 'fontSize,link'))
+
+    # 분석 결과 레코드를 섹션별로 스타일링
+    record = item.analysis
+    if not record.ok:
+        builder.add_text(f"{record.error}\n\n")
+        return
+
+    sections = [
+        ("1. 주요 내용 요약", record.summary, {'red': 0.91, 'green': 0.95, 'blue': 1.0}),
+        ("2. 시사점 및 전망", record.implications, {'red': 1.0, 'green': 0.96, 'blue': 0.9}),
+    ]
+    for section_name, bullets, bg_color in sections:
+        if not bullets:
+            continue
+        # 섹션 타이틀 (배경색 포함)
+        builder.add_text(section_name + "\n", text_style=({'bold': True}, 'bold'),
+                         paragraph_style=({'shading': {'backgroundColor': {'color': {'rgbColor': bg_color}}}}, 'shading'))
+        # 섹션 본문
+        builder.add_text('\n'.join(f"ㅇ {bullet}" for bullet in bullets) + "\n\n")
+
+
+def create_shared_document(docs_service, drive_service, document_title: str) -> tuple:
+    """새 문서를 만들고 링크가 있는 누구나 읽을 수 있게 공유합니다. (document_id, document_url) 반환."""
+    document = docs_service.documents().create(body={'title': document_title}).execute()
+    document_id = document.get('documentId')
     
+    permission = {'type': 'anyone', 'role': 'reader'}
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "당신은 ICT 표준 정책 분석 최고 전문가입니다. 제공된 기사 본문만을 근거로 '주요 내용 요약'과 '시사점 및 전망'을 작성합니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3, max_tokens=1500, # 토큰 길이 상향
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"  (경고) AI 심층 분석 실패 ({news_item['title']}): {e}")
-        return "AI 심층 분석에 실패했습니다."
+        drive_service.permissions().create(fileId=document_id, body=permission).execute()
+    except Exception:
+        # 공유 설정에 실패한 빈 문서를 남기지 않음
+        trash_document(drive_service, document_id)
+        raise
+    print("  > 문서 접근 권한을 공개로 설정했습니다.")
+    
+    document_url = f"https://docs.google.com/document/d/{document_id}/edit"
+    print(f"  > 새 문서가 생성되었습니다: {document_url}")
+    return document_id, document_url
 
-# ==============================================================================
-# --- 5. 구글 문서 생성 함수 (디자인 개선) ---
-# ==============================================================================
+
+def trash_document(drive_service, document_id: str):
+    """작성이 중단된 문서를 휴지통으로 옮깁니다 (실패해도 예외를 내지 않음)."""
+    try:
+        drive_service.files().update(fileId=document_id, body={'trashed': True}).execute()
+        print(f"  > 작성이 중단된 문서를 휴지통으로 옮겼습니다: {document_id}")
+    except Exception as e:
+        print(f"  (경고) 작성이 중단된 문서를 정리하지 못했습니다 ({document_id}): {str(e)[:100]}")
 
 
-def get_google_docs_service():
-    """Google Docs와 Drive API 서비스를 인증하고 생성하는 함수"""
-    creds = None
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-            
-    docs_service = build('docs', 'v1', credentials=creds)
-    drive_service = build('drive', 'v3', credentials=creds)
-    return docs_service, drive_service
+def render_docs_report(report: Report, builder: DocsRequestBuilder):
+    """보고서 모델 전체를 Docs 요청으로 렌더링합니다."""
+    add_report_header(builder, report.title)
+    for item in report.items:
+        add_report_item(builder, item)
 
 
-def generate_google_doc_report(analyzed_data):
+def generate_google_doc_report(report: Report):
     try:
         docs_service, drive_service = get_google_docs_service()
     except FileNotFoundError:
@@ -722,331 +3735,587 @@ def generate_google_doc_report(analyzed_data):
         print(f"  (오류) 구글 서비스 연결에 실패했습니다: {e}")
         return None, None
         
-    current_date = datetime.date.today().strftime('%Y년 %m월 %d일')
-    document_title = f"전파·이동통신 동향 보고서 ({current_date})"
+    document_title = report.title
 
-    try:
-        # 1. 문서 생성
-        document = docs_service.documents().create(body={'title': document_title}).execute()
-        document_id = document.get('documentId')
-        
-        permission = {'type': 'anyone', 'role': 'reader'}
-        drive_service.permissions().create(fileId=document_id, body=permission).execute()
-        print("  > 문서 접근 권한을 공개로 설정했습니다.")
-        
-        document_url = f"https://docs.google.com/document/d/{document_id}/edit"
-        print(f"  > 새 문서가 생성되었습니다: {document_url}")
-
-        # 2. 스타일링된 내용 추가
-        requests_list = []
-        index = 1
-
-        # --- 문서 제목 스타일링 ---
-        title_text = f"{document_title}\n"
-        requests_list.append({'insertText': {'location': {'index': index}, 'text': title_text}})
-        requests_list.append({'updateParagraphStyle': {'range': {'startIndex': index, 'endIndex': index + len(title_text)}, 'paragraphStyle': {'alignment': 'CENTER'}, 'fields': 'alignment'}})
-        requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(title_text) - 1}, 'textStyle': {'fontSize': {'magnitude': 18, 'unit': 'PT'}, 'bold': True}, 'fields': 'fontSize,bold'}})
-        index += len(title_text)
-        
-        # --- AI 분석 고지 문구 ---
-        disclaimer_text = "※ 본 보고서의 내용은 AI가 생성한 분석으로, 개인적인 의견을 포함하지 않습니다.\n\n"
-        requests_list.append({'insertText': {'location': {'index': index}, 'text': disclaimer_text}})
-        requests_list.append({'updateParagraphStyle': {'range': {'startIndex': index, 'endIndex': index + len(disclaimer_text)}, 'paragraphStyle': {'alignment': 'CENTER'}, 'fields': 'alignment'}})
-        requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(disclaimer_text) - 2}, 'textStyle': {'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'italic': True, 'foregroundColor': {'color': {'rgbColor': {'red': 0.5, 'green': 0.5, 'blue': 0.5}}}}, 'fields': 'fontSize,italic,foregroundColor'}})
-        index += len(disclaimer_text)
-
-
-        # --- 각 뉴스 아이템 스타일링 ---
-        for i, data in enumerate(analyzed_data):
-            # 뉴스 제목
-            news_title = f"[{i+1}] {data['title']}\n"
-            requests_list.append({'insertText': {'location': {'index': index}, 'text': news_title}})
-            requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(news_title)}, 'textStyle': {'fontSize': {'magnitude': 14, 'unit': 'PT'}, 'bold': True}, 'fields': 'fontSize,bold'}})
-            index += len(news_title)
-            
-            # 메타데이터 (출처, 발행일, 링크)
-            meta_text = f"출처: {data['source']} | 발행일: {data['published']}\n"
-            requests_list.append({'insertText': {'location': {'index': index}, 'text': meta_text}})
-            requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(meta_text)}, 'textStyle': {'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'foregroundColor': {'color': {'rgbColor': {'red': 0.5, 'green': 0.5, 'blue': 0.5}}}}, 'fields': 'fontSize,foregroundColor'}})
-            index += len(meta_text)
-            
-            link_text = f"원본 링크: {data['link']}\n\n"
-            requests_list.append({'insertText': {'location': {'index': index}, 'text': link_text}})
-            requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(link_text)}, 'textStyle': {'fontSize': {'magnitude': 9, 'unit': 'PT'}, 'link': {'url': data['link']}}, 'fields': 'fontSize,link'}})
-            index += len(link_text)
+    # 1. 스타일링된 내용 요청 구성 (위치는 UTF-16 기준으로 계산)
+    builder = DocsRequestBuilder()
+    render_docs_report(report, builder)
 
-            # 분석 내용 파싱 (정규식 수정)
-            analysis_text = data.get('analysis_result', '')
-            
-            # 보고서 전체를 파싱
-            report_match = re.search(r'## \*\*뉴스 심층 분석 보고서\*\*(.*)', analysis_text, re.DOTALL)
-            if report_match:
-                report_content = report_match.group(1).strip()
-            else:
-                report_content = analysis_text # 매치 안되면 그냥 전체 사용
-            
-            # 섹션 제목과 내용을 분리하여 스타일링
-            sections = re.split(r'### \*\*(.*?)\*\*', report_content)
-            
-            # sections[0]은 보통 빈 문자열
-            for k in range(1, len(sections), 2):
-                section_title = sections[k].strip() + "\n"
-                section_body = sections[k+1].strip() + "\n\n"
-
-                # 섹션 타이틀
-                requests_list.append({'insertText': {'location': {'index': index}, 'text': section_title}})
-                requests_list.append({'updateTextStyle': {'range': {'startIndex': index, 'endIndex': index + len(section_title)}, 'textStyle': {'bold': True}, 'fields': 'bold'}})
-                
-                # 배경색
-                if "주요 내용" in section_title:
-                    bg_color = {'red': 0.91, 'green': 0.95, 'blue': 1.0}
-                elif "시사점" in section_title:
-                    bg_color = {'red': 1.0, 'green': 0.96, 'blue': 0.9}
-                else:
-                    bg_color = None
+    batches = builder.batches()
+    job_store = get_docs_job_store()
+    job_key = DocsJobStore.make_key(document_title, batches)
 
-                if bg_color:
-                    requests_list.append({'updateParagraphStyle': {'range': {'startIndex': index, 'endIndex': index + len(section_title)}, 'paragraphStyle': {'shading': {'backgroundColor': {'color': {'rgbColor': bg_color}}}}, 'fields': 'shading'}})
-                index += len(section_title)
-                
-                # 섹션 본문
-                requests_list.append({'insertText': {'location': {'index': index}, 'text': section_body}})
-                index += len(section_body)
+    try:
+        # 2. 같은 내용으로 작성하다 중단된 문서가 있으면 이어 쓰기, 없으면 새 문서 생성
+        first_batch = 0
+        job = job_store.get(job_key) if job_store else None
+        if job:
+            document_id, document_url, _ = job
+            try:
+                first_batch = committed_batch_count(docs_service, document_id, batches)
+            except Exception as e:
+                print(f"  (정보) 중단된 문서를 확인할 수 없어 새로 만듭니다: {str(e)[:100]}")
+                first_batch = None
+            if first_batch is None:
+                job = None
+            else:
+                print(f"  > 중단된 문서에 이어 씁니다 ({first_batch}/{len(batches)} 배치 반영됨): {document_url}")
 
+        if not job:
+            document_id, document_url = create_shared_document(docs_service, drive_service, document_title)
+            first_batch = 0
+            if job_store:
+                job_store.start(job_key, document_id, document_url, len(batches))
 
-        # 3. 일괄 업데이트 실행
-        docs_service.documents().batchUpdate(documentId=document_id, body={'requests': requests_list}).execute()
+        # 3. 배치 단위로 순서대로 반영 (배치마다 진행 상황 기록)
+        submit_docs_batches(
+            docs_service, document_id, batches, first_batch=first_batch,
+            on_commit=(lambda done: job_store.update(job_key, done)) if job_store else None
+        )
+        print(f"  > 문서 내용 반영 완료 ({len(batches)}개 배치, 요청 {sum(len(batch['requests']) for batch in batches)}건)")
+        if job_store:
+            job_store.finish(job_key)
         
         return document_url, document_title
     except Exception as e:
         print(f"  (오류) 구글 문서 생성/스타일링 실패: {e}")
+        if job_store and job_store.get(job_key):
+            print("  > 반영된 배치까지 기록했습니다. 다시 실행하면 같은 문서에 이어 씁니다.")
         return None, None
 
 
+class IncrementalDocsWriter:
+    """
+    분석 단계 시작 시 문서와 공유 권한을 먼저 만들고, 분석이 끝난 기사를
+    최종 순서대로 하나씩 문서 끝에 덧붙이는 작성기 (run_analysis_pipeline의 on_result로 사용).
+    실행이 중간에 끊겨도 그때까지 덧붙인 기사로 이루어진 온전한 문서가 남습니다.
+    문서 API 오류로 작성을 중단하면 공유된 미완성 문서를 휴지통으로 옮기고, 보고서는 분석 후 새로 만듭니다.
+    """
+
+    def __init__(self):
+        self.docs_service = None
+        self.drive_service = None
+        self.document_id = None
+        self.document_url = None
+        self.document_title = report_document_title()
+        self.index = 1
+        self.appended = 0
+        self.failed = False
+        self.busy_seconds = 0.0
+
+    def _submit(self, builder: DocsRequestBuilder):
+        started = time.monotonic()
+        submit_docs_batches(self.docs_service, self.document_id, builder.batches(), start_index=self.index)
+        self.index = builder.index
+        self.busy_seconds += time.monotonic() - started
+
+    def open(self) -> bool:
+        """문서를 만들고 제목·고지 문구를 씁니다. 실패하면 False (보고서는 분석 후 한 번에 생성)."""
+        try:
+            self.docs_service, self.drive_service = get_google_docs_service()
+            self.document_id, self.document_url = create_shared_document(self.docs_service, self.drive_service, self.document_title)
+            builder = DocsRequestBuilder(self.index)
+            add_report_header(builder, self.document_title)
+            self._submit(builder)
+            return True
+        except FileNotFoundError:
+            print("  (오류) 'credentials.json' 파일을 찾을 수 없습니다. 구글 인증 설정을 확인하세요.")
+        except Exception as e:
+            print(f"  (경고) 구글 문서를 미리 만들지 못했습니다. 분석 후 한 번에 생성합니다: {e}")
+        self._abandon()
+        return False
+
+    def _abandon(self):
+        """점진 작성을 중단하고, 이미 만든 문서는 새 문서와 함께 남지 않도록 휴지통으로 옮깁니다."""
+        self.failed = True
+        if self.document_id:
+            trash_document(self.drive_service, self.document_id)
+            self.document_id = self.document_url = None
+
+    def append(self, position: int, item: dict):
+        """분석이 끝난 기사 1건을 문서 끝에 덧붙입니다 (position은 0부터 시작하는 최종 순서)."""
+        if self.failed:
+            return
+        try:
+            builder = DocsRequestBuilder(self.index)
+            add_report_item(builder, ReportItem.from_news(position + 1, item))
+            self._submit(builder)
+            self.appended += 1
+        except Exception as e:
+            # 이후 기사까지 어긋나지 않도록 중단하고, 분석이 끝난 뒤 전체 문서를 새로 생성
+            print(f"  (경고) 문서에 {position + 1}번 기사를 덧붙이지 못해 점진 작성을 중단합니다: {e}")
+            self._abandon()
+
+    def close(self) -> tuple:
+        """(document_url, document_title)을 반환합니다. 점진 작성에 실패했으면 (None, None)."""
+        if self.failed or not self.document_id:
+            return None, None
+        print(f"  > 문서 점진 작성 완료: {self.appended}건 반영 (문서 API 소요 {self.busy_seconds:.1f}초)")
+        return self.document_url, self.document_title
+
+
 # ==============================================================================
 # --- 6. Gmail 전송 함수 (템플릿 및 파싱 로직 수정) ---
 # ==============================================================================
-def send_gmail_report(report_title, analyzed_data, doc_url, other_news):
-    """분석 리포트를 새로운 형식의 이메일로 전송하는 함수"""
-    # 1. 심층 분석된 뉴스 HTML 생성
-    news_items_html = ""
-    for i, data in enumerate(analyzed_data):
-        analysis_text = data.get('analysis_result', '')
-        main_content = "주요내용 정보를 찾을 수 없습니다."
-        implications = "시사점 정보를 찾을 수 없습니다."
+# 이메일 템플릿 (모듈 로드 시 한 번만 준비하고, 반복 항목은 리스트로 모아 join)
+_EMAIL_CSS = """
+        @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;500;700&display=swap');
+        body { margin: 0; padding: 0; background-color: #f4f7fa; font-family: 'Noto Sans KR', sans-serif; }
+        .email-container { max-width: 700px; margin: 20px auto; background-color: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 10px 40px rgba(0, 0, 0, 0.05); border: 1px solid #e9e9e9; }
+        .header { background: linear-gradient(135deg, #1D2B4A 0%, #2C3E6A 100%); color: #ffffff; padding: 40px; text-align: center; }
+        .header h1 { margin: 0; font-size: 28px; font-weight: 700; } .header p { margin: 8px 0 0; font-size: 16px; font-weight: 300; opacity: 0.8; }
+        .disclaimer { font-size: 12px; opacity: 0.7; font-style: italic; margin-top: 15px;}
+        .main-content { padding: 40px; }
+        .report-intro { text-align: center; padding-bottom: 30px; border-bottom: 1px solid #eaeaea; margin-bottom: 30px; }
+        .button { display: inline-block; background: linear-gradient(135deg, #4A6DFF 0%, #6284FF 100%); color: #ffffff; padding: 14px 28px; border-radius: 50px; text-decoration: none; font-weight: 500; font-size: 15px; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(74, 109, 255, 0.3); }
+        .button:hover { transform: translateY(-2px); box-shadow: 0 8px 25px rgba(74, 109, 255, 0.4); }
+        .news-item { border: 1px solid #e9e9e9; border-radius: 12px; margin-bottom: 25px; overflow: hidden; transition: all 0.3s ease; }
+        .news-item:hover { transform: translateY(-2px); box-shadow: 0 8px 25px rgba(0, 0, 0, 0.07); }
+        .news-header { padding: 25px; } .news-title { font-size: 20px; font-weight: 700; color: #1D2B4A; margin: 0 0 15px; }
+        .news-meta { font-size: 13px; color: #777; } .news-meta a { color: #4A6DFF; text-decoration: none; font-weight: 500; } .news-meta span { margin-right: 15px; }
+        .analysis-container { padding: 0 25px 25px 25px; border-top: 1px solid #e9e9e9; background-color: #f8f9fc; }
+        .analysis-section { padding: 20px; border-radius: 8px; margin-top: 15px; }
+        .analysis-section.summary { background-color: #e9f3ff; border-left: 4px solid #4A6DFF; }
+        .analysis-section.implications { background-color: #fff6e9; border-left: 4px solid #ff9f43; }
+        .analysis-title { display: flex; align-items: center; font-size: 16px; font-weight: 700; color: #1D2B4A; margin-bottom: 10px; }
+        .analysis-title .icon { font-size: 20px; margin-right: 10px; }
+        .analysis-text { font-size: 14px; line-height: 1.7; color: #333; margin: 0; }
+        .other-news-section { margin-top: 40px; padding-top: 30px; border-top: 1px solid #eaeaea; }
+        .other-news-section h2 { font-size: 20px; font-weight: 700; color: #1D2B4A; margin-bottom: 20px; text-align: center; }
+        .other-news-list { list-style-type: none; padding: 0; margin: 0; }
+        .other-news-list li { border-radius: 8px; margin-bottom: 5px; border-left: 3px solid #ccc; background-color: #f8f9fc; transition: background-color 0.2s ease; }
+        .other-news-list li:hover { background-color: #f1f3f8; }
+        .other-news-link { display: flex; justify-content: space-between; align-items: center; padding: 12px 15px; text-decoration: none; color: inherit; }
+        .other-news-title { color: #333; font-size: 14px; }
+        .other-news-source { color: #888; font-size: 12px; white-space: nowrap; margin-left: 15px; }
+        .footer { text-align: center; padding: 30px; background-color: #f4f7fa; font-size: 13px; color: #999; }
+"""
 
-        # 🔧 수정된 파싱 로직 - 다양한 형식을 처리할 수 있도록 개선
-        try:
-            print(f"  [디버그] 분석 텍스트 일부: {analysis_text[:200]}...")
-            
-            # 패턴 1: ### **1. 주요 내용 요약** 형식
-            main_pattern1 = re.search(r'### \*\*1\. 주요 내용 요약\*\*(.*?)### \*\*2\. 시사점 및 전망\*\*', analysis_text, re.DOTALL)
-            if main_pattern1:
-                main_content = main_pattern1.group(1).strip()
-                print(f"  [디버그] 패턴1로 주요내용 추출 성공")
-            else:
-                # 패턴 2: **1. 주요 내용 요약** 형식 (### 없이)
-                main_pattern2 = re.search(r'\*\*1\. 주요 내용 요약\*\*(.*?)\*\*2\. 시사점 및 전망\*\*', analysis_text, re.DOTALL)
-                if main_pattern2:
-                    main_content = main_pattern2.group(1).strip()
-                    print(f"  [디버그] 패턴2로 주요내용 추출 성공")
-                else:
-                    # 패턴 3: 1. 주요 내용 요약 형식 (별표 없이)
-                    main_pattern3 = re.search(r'1\. 주요 내용 요약(.*?)2\. 시사점 및 전망', analysis_text, re.DOTALL)
-                    if main_pattern3:
-                        main_content = main_pattern3.group(1).strip()
-                        print(f"  [디버그] 패턴3으로 주요내용 추출 성공")
-                    else:
-                        print(f"  [디버그] 주요내용 패턴 매칭 실패")
-
-            # 시사점 파싱도 동일하게 다양한 패턴 지원
-            # 패턴 1: ### **2. 시사점 및 전망** 형식
-            impl_pattern1 = re.search(r'### \*\*2\. 시사점 및 전망\*\*(.*)', analysis_text, re.DOTALL)
-            if impl_pattern1:
-                implications = impl_pattern1.group(1).strip()
-                print(f"  [디버그] 패턴1로 시사점 추출 성공")
-            else:
-                # 패턴 2: **2. 시사점 및 전망** 형식
-                impl_pattern2 = re.search(r'\*\*2\. 시사점 및 전망\*\*(.*)', analysis_text, re.DOTALL)
-                if impl_pattern2:
-                    implications = impl_pattern2.group(1).strip()
-                    print(f"  [디버그] 패턴2로 시사점 추출 성공")
-                else:
-                    # 패턴 3: 2. 시사점 및 전망 형식
-                    impl_pattern3 = re.search(r'2\. 시사점 및 전망(.*)', analysis_text, re.DOTALL)
-                    if impl_pattern3:
-                        implications = impl_pattern3.group(1).strip()
-                        print(f"  [디버그] 패턴3으로 시사점 추출 성공")
-                    else:
-                        print(f"  [디버그] 시사점 패턴 매칭 실패")
-            
-            # 마크다운 문법 정리 (*, ** 제거)
-            main_content = re.sub(r'\*+', '', main_content).strip()
-            implications = re.sub(r'\*+', '', implications).strip()
-            
-        except Exception as e:
-            print(f"  (경고) AI 분석 결과 파싱 중 오류 발생: {e}")
+_EMAIL_PAGE_TEMPLATE = string.Template(string.Template("""
+    <!DOCTYPE html>
+    <html lang="ko"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>ICT 주요기술 동향 리포트</title>
+    <style>$css</style></head>
+    <body><div class="email-container">
+        <div class="header"><h1>$$report_title</h1><p class="disclaimer">※ 본 보고서의 내용은 IRONAGE AI가 생성한 분석으로, 개인적인 의견을 포함하지 않습니다.</p></div>
+        <div class="main-content">
+            <div class="report-intro">
+                <a href="$$doc_url" class="button" target="_blank">📄 전체 보고서 보기</a>
+            </div>
+            $$news_items_html
+            $$other_news_html
+        </div>
+        <div class="footer"><p>본 리포트는 AI 기술을 활용해 자동 생성된 분석 보고서입니다.</p><p>Powered by Advanced IRONAGE AI Analytics</p></div>
+    </div></body></html>""").substitute(css=_EMAIL_CSS))
 
-        # 백슬래시 문제를 해결하기 위해 replace 메서드를 사용
-        main_content_formatted = main_content.replace('ㅇ', '&#8226;').replace('\n', '<br>')
-        implications_formatted = implications.replace('ㅇ', '&#8226;').replace('\n', '<br>')
-        
-        # HTML을 안전하게 생성
-        news_items_html += f"""
+_EMAIL_NEWS_ITEM_TEMPLATE = string.Template("""
         <div class="news-item">
             <div class="news-header">
-                <h3 class="news-title">{str(data.get('title', '제목 없음'))}</h3>
+                <h3 class="news-title">$title</h3>
                 <div class="news-meta">
-                    <span><strong>출처:</strong> {str(data.get('source', '출처 불명'))}</span>
-                    <span><strong>발행일:</strong> {str(data.get('published', '날짜 없음'))}</span>
-                    <span><a href="{str(data.get('link', '#'))}" target="_blank">원문 기사 보기 &rarr;</a></span>
+                    <span><strong>출처:</strong> $source</span>
+                    <span><strong>발행일:</strong> $published</span>
+                    <span><a href="$link" target="_blank">원문 기사 보기 &rarr;</a></span>
                 </div>
             </div>
             <div class="analysis-container">
                 <div class="analysis-section summary">
                     <div class="analysis-title"><span class="icon">📝</span><strong>주요 내용</strong></div>
-                    <p class="analysis-text">{main_content_formatted}</p>
+                    <p class="analysis-text">$summary</p>
                 </div>
                 <div class="analysis-section implications">
                     <div class="analysis-title"><span class="icon">💡</span><strong>시사점 및 전망</strong></div>
-                    <p class="analysis-text">{implications_formatted}</p>
+                    <p class="analysis-text">$implications</p>
                 </div>
             </div>
-        </div>"""
+        </div>""")
 
-    # 2. 기타 뉴스 HTML 생성 (안전한 문자열 처리)
-    other_news_html = ""
-    if other_news:
-        other_news_html += """
+_EMAIL_OTHER_NEWS_SECTION_TEMPLATE = string.Template("""
         <div class="other-news-section">
             <h2>기타 수집된 뉴스</h2>
             <ul class="other-news-list">
-        """
-        for item in other_news:
-            other_news_html += f'<li><a href="{str(item.get("link", "#"))}" target="_blank" class="other-news-link"><span class="other-news-title">{str(item.get("title", "제목 없음"))}</span><span class="other-news-source">({str(item.get("source", "출처 불명"))})</span></a></li>'
-        
-        other_news_html += "</ul></div>"title"><span class="icon">📝</span><strong>주요 내용</strong></div>
-                    <p class="analysis-text">{main_content_formatted}</p>
-                </div>
-                <div class="analysis-section implications">
-                    <div class="analysis-title"><span class="icon">💡</span><strong>시사점 및 전망</strong></div>
-                    <p class="analysis-text">{implications_formatted}</p>
-                </div>
-            </div>
-        </div>"""
+        $items</ul></div>""")
+
+_EMAIL_OTHER_NEWS_ITEM_TEMPLATE = string.Template(
+    '<li><a href="$link" target="_blank" class="other-news-link"><span class="other-news-title">$title</span>'
+    '<span class="other-news-source">($source)</span></a></li>'
+)
+
+
+def _html_bullets(bullets: list) -> str:
+    return '<br>'.join(f"&#8226; {html.escape(bullet)}" for bullet in bullets)
+
 
-    # 2. 기타 뉴스 HTML 생성 (변경 없음)
+def render_email_html(report: Report) -> str:
+    """보고서 모델을 이메일 HTML 본문으로 렌더링합니다."""
+    # 1. 심층 분석된 뉴스 HTML 생성
+    news_items = []
+    for item in report.items:
+        record = item.analysis
+        if record.ok:
+            summary = _html_bullets(record.summary)
+            implications = _html_bullets(record.implications) or "기사에서 별도의 시사점을 도출하지 않았습니다."
+        else:
+            summary, implications = html.escape(record.error), "-"
+        news_items.append(_EMAIL_NEWS_ITEM_TEMPLATE.substitute(
+            title=html.escape(item.title), source=html.escape(item.source), published=html.escape(item.published),
+            link=html.escape(item.link, quote=True), summary=summary, implications=implications,
+        ))
+
+    # 2. 기타 뉴스 HTML 생성
     other_news_html = ""
-    if other_news:
-        other_news_html += """
-        <div class="other-news-section">
-            <h2>기타 수집된 뉴스</h2>
-            <ul class="other-news-list">
+    if report.other_news:
+        other_news_html = _EMAIL_OTHER_NEWS_SECTION_TEMPLATE.substitute(items=''.join(
+            _EMAIL_OTHER_NEWS_ITEM_TEMPLATE.substitute(
+                link=html.escape(entry.link, quote=True), title=html.escape(entry.title), source=html.escape(entry.source)
+            )
+            for entry in report.other_news
+        ))
+
+    # 3. 전체 이메일 본문 조합
+    return _EMAIL_PAGE_TEMPLATE.substitute(
+        report_title=html.escape(report.title), doc_url=html.escape(report.doc_url or '#', quote=True),
+        news_items_html=''.join(news_items), other_news_html=other_news_html,
+    )
+
+
+def render_email_text(report: Report) -> str:
+    """보고서 모델을 이메일 일반 텍스트 본문으로 렌더링합니다 (HTML을 표시하지 못하는 메일 클라이언트용)."""
+    lines = [report.title, REPORT_DISCLAIMER, ""]
+    if report.doc_url:
+        lines += [f"전체 보고서: {report.doc_url}", ""]
+    for item in report.items:
+        lines += [f"[{item.number}] {item.title}", f"출처: {item.source} | 발행일: {item.published}", item.link, ""]
+        if not item.analysis.ok:
+            lines += [item.analysis.error, ""]
+            continue
+        lines.append("■ 주요 내용")
+        lines += [f"  ㅇ {bullet}" for bullet in item.analysis.summary]
+        if item.analysis.implications:
+            lines.append("■ 시사점 및 전망")
+            lines += [f"  ㅇ {bullet}" for bullet in item.analysis.implications]
+        lines.append("")
+    if report.other_news:
+        lines.append("기타 수집된 뉴스")
+        lines += [f"- {entry.title} ({entry.source}) {entry.link}" for entry in report.other_news]
+    return '\n'.join(lines)
+
+
+# ------------------------------------------------------------------------------
+# 이메일 발송 (SMTP 연결 재사용, 수신자 묶음 병렬 발송, 실패 수신자 재시도 대기열)
+# ------------------------------------------------------------------------------
+class SmtpConnectionPool:
+    """
+    로그인까지 마친 SMTP 연결을 최대 size개까지 만들어 재사용하는 연결 풀.
+    꺼낼 때 NOOP으로 연결 상태를 확인하고, 끊긴 연결은 버리고 새로 연결합니다.
+    """
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle = queue.LifoQueue()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if SMTP_STARTTLS:
+                server.starttls()
+            if SMTP_USERNAME and GMAIL_PASSWORD:
+                server.login(SMTP_USERNAME, GMAIL_PASSWORD)
+        except Exception:
+            # TLS·로그인에 실패한 연결은 풀에 넣지 않고 바로 닫음
+            self._discard(server)
+            raise
+        self.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP):
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        server = None
+        try:
+            while server is None:
+                try:
+                    server = self._idle.get_nowait()
+                except queue.Empty:
+                    server = self._connect()
+                    break
+                try:
+                    if server.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP 실패")
+                except (smtplib.SMTPException, OSError):
+                    self._discard(server)
+                    server = None
+            try:
+                yield server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._discard(server)
+                server = None
+                raise
+        finally:
+            if server is not None:
+                self._idle.put(server)
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                server.quit()
+            except Exception:
+                self._discard(server)
+
+
+class EmailRetryQueue:
+    """
+    발송에 실패한 (메시지, 수신자)를 상태 저장소에 보관하는 재시도 대기열.
+    다음 실행이 시작될 때 먼저 재발송하며, 다음 실행에서의 재발송이 SMTP_RETRY_MAX_RUNS번 실패하면 포기합니다.
+    """
+
+    def __init__(self):
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS email_outbox (
+                    message_id TEXT PRIMARY KEY,
+                    subject TEXT,
+                    message TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS email_retry_queue (
+                    message_id TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    last_error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (message_id, recipient)
+                )
+            """)
+            db.commit()
+
+    def enqueue(self, subject: str, message_text: str, failures: dict):
         """
-        for item in other_news:
-            other_news_html += f'<li><a href="{item["link"]}" target="_blank" class="other-news-link"><span class="other-news-title">{item["title"]}</span><span class="other-news-source">({item["source"]})</span></a></li>'
-        
-        other_news_html += "</ul></div>"
+        실패한 수신자들을 기록합니다 (이미 있으면 시도 횟수 증가, 한도를 넘으면 제거).
+        attempts는 처음 실패를 포함한 실패 횟수이므로 SMTP_RETRY_MAX_RUNS + 1을 넘지 않는 동안 보관합니다.
+        """
+        if not failures:
+            return
+        message_id = hashlib.sha256(message_text.encode('utf-8')).hexdigest()
+        now = time.time()
+        with _state_db_lock:
+            db = get_state_db()
+            db.execute(
+                "INSERT OR IGNORE INTO email_outbox (message_id, subject, message, created_at) VALUES (?, ?, ?, ?)",
+                (message_id, subject, message_text, now)
+            )
+            db.executemany("""
+                INSERT INTO email_retry_queue (message_id, recipient, attempts, last_error, updated_at)
+                VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT(message_id, recipient) DO UPDATE SET
+                    attempts = attempts + 1, last_error = excluded.last_error, updated_at = excluded.updated_at
+            """, [(message_id, recipient, error[:500], now) for recipient, error in failures.items()])
+            db.execute("DELETE FROM email_retry_queue WHERE attempts > ?", (SMTP_RETRY_MAX_RUNS,))
+            db.execute("DELETE FROM email_outbox WHERE message_id NOT IN (SELECT message_id FROM email_retry_queue)")
+            db.commit()
 
+    def pending(self) -> list:
+        """[(message_id, subject, message_text, [수신자, ...]), ...]를 오래된 메시지 순으로 반환합니다."""
+        with _state_db_lock:
+            rows = get_state_db().execute("""
+                SELECT o.message_id, o.subject, o.message, q.recipient
+                FROM email_retry_queue q JOIN email_outbox o ON o.message_id = q.message_id
+                ORDER BY o.created_at, q.recipient
+            """).fetchall()
+        grouped = OrderedDict()
+        for message_id, subject, message_text, recipient in rows:
+            grouped.setdefault(message_id, (subject, message_text, []))[2].append(recipient)
+        return [(message_id, subject, message_text, recipients)
+                for message_id, (subject, message_text, recipients) in grouped.items()]
 
-    # 3. 전체 이메일 본문 조합 (템플릿 수정)
-    html_body = f"""
-    <!DOCTYPE html>
-    <html lang="ko"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>ICT 주요기술 동향 리포트</title>
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;500;700&display=swap');
-        body {{ margin: 0; padding: 0; background-color: #f4f7fa; font-family: 'Noto Sans KR', sans-serif; }}
-        .email-container {{ max-width: 700px; margin: 20px auto; background-color: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 10px 40px rgba(0, 0, 0, 0.05); border: 1px solid #e9e9e9; }}
-        .header {{ background: linear-gradient(135deg, #1D2B4A 0%, #2C3E6A 100%); color: #ffffff; padding: 40px; text-align: center; }}
-        .header h1 {{ margin: 0; font-size: 28px; font-weight: 700; }} .header p {{ margin: 8px 0 0; font-size: 16px; font-weight: 300; opacity: 0.8; }}
-        .disclaimer {{ font-size: 12px; opacity: 0.7; font-style: italic; margin-top: 15px;}}
-        .main-content {{ padding: 40px; }}
-        .report-intro {{ text-align: center; padding-bottom: 30px; border-bottom: 1px solid #eaeaea; margin-bottom: 30px; }}
-        .button {{ display: inline-block; background: linear-gradient(135deg, #4A6DFF 0%, #6284FF 100%); color: #ffffff; padding: 14px 28px; border-radius: 50px; text-decoration: none; font-weight: 500; font-size: 15px; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(74, 109, 255, 0.3); }}
-        .button:hover {{ transform: translateY(-2px); box-shadow: 0 8px 25px rgba(74, 109, 255, 0.4); }}
-        .news-item {{ border: 1px solid #e9e9e9; border-radius: 12px; margin-bottom: 25px; overflow: hidden; transition: all 0.3s ease; }}
-        .news-item:hover {{ transform: translateY(-2px); box-shadow: 0 8px 25px rgba(0, 0, 0, 0.07); }}
-        .news-header {{ padding: 25px; }} .news-title {{ font-size: 20px; font-weight: 700; color: #1D2B4A; margin: 0 0 15px; }}
-        .news-meta {{ font-size: 13px; color: #777; }} .news-meta a {{ color: #4A6DFF; text-decoration: none; font-weight: 500; }} .news-meta span {{ margin-right: 15px; }}
-        .analysis-container {{ padding: 0 25px 25px 25px; border-top: 1px solid #e9e9e9; background-color: #f8f9fc; }}
-        .analysis-section {{ padding: 20px; border-radius: 8px; margin-top: 15px; }}
-        .analysis-section.summary {{ background-color: #e9f3ff; border-left: 4px solid #4A6DFF; }}
-        .analysis-section.implications {{ background-color: #fff6e9; border-left: 4px solid #ff9f43; }}
-        .analysis-title {{ display: flex; align-items: center; font-size: 16px; font-weight: 700; color: #1D2B4A; margin-bottom: 10px; }}
-        .analysis-title .icon {{ font-size: 20px; margin-right: 10px; }}
-        .analysis-text {{ font-size: 14px; line-height: 1.7; color: #333; margin: 0; }}
-        .other-news-section {{ margin-top: 40px; padding-top: 30px; border-top: 1px solid #eaeaea; }}
-        .other-news-section h2 {{ font-size: 20px; font-weight: 700; color: #1D2B4A; margin-bottom: 20px; text-align: center; }}
-        .other-news-list {{ list-style-type: none; padding: 0; margin: 0; }}
-        .other-news-list li {{ border-radius: 8px; margin-bottom: 5px; border-left: 3px solid #ccc; background-color: #f8f9fc; transition: background-color 0.2s ease; }}
-        .other-news-list li:hover {{ background-color: #f1f3f8; }}
-        .other-news-link {{ display: flex; justify-content: space-between; align-items: center; padding: 12px 15px; text-decoration: none; color: inherit; }}
-        .other-news-title {{ color: #333; font-size: 14px; }}
-        .other-news-source {{ color: #888; font-size: 12px; white-space: nowrap; margin-left: 15px; }}
-        .footer {{ text-align: center; padding: 30px; background-color: #f4f7fa; font-size: 13px; color: #999; }}
-    </style></head>
-    <body><div class="email-container">
-        <div class="header"><h1>{report_title}</h1><p class="disclaimer">※ 본 보고서의 내용은 IRONAGE AI가 생성한 분석으로, 개인적인 의견을 포함하지 않습니다.</p></div>
-        <div class="main-content">
-            <div class="report-intro">
-                <a href="{doc_url}" class="button" target="_blank">📄 전체 보고서 보기</a>
-            </div>
-            {news_items_html}
-            {other_news_html}
-        </div>
-        <div class="footer"><p>본 리포트는 AI 기술을 활용해 자동 생성된 분석 보고서입니다.</p><p>Powered by Advanced IRONAGE AI Analytics</p></div>
-    </div></body></html>"""
+    def remove(self, message_id: str, recipients: list):
+        with _state_db_lock:
+            db = get_state_db()
+            db.executemany("DELETE FROM email_retry_queue WHERE message_id = ? AND recipient = ?",
+                           [(message_id, recipient) for recipient in recipients])
+            db.execute("DELETE FROM email_outbox WHERE message_id NOT IN (SELECT message_id FROM email_retry_queue)")
+            db.commit()
+
+
+_email_retry_queue = None
+
+
+def get_email_retry_queue():
+    """이메일 재시도 대기열을 반환합니다. 상태 저장소를 열 수 없으면 None (실패 기록 없이 동작)."""
+    global _email_retry_queue
+    with _state_db_lock:
+        if _email_retry_queue is None:
+            try:
+                _email_retry_queue = EmailRetryQueue()
+            except sqlite3.Error as e:
+                print(f"    (경고) 이메일 재시도 대기열을 열 수 없습니다: {e}")
+                return None
+        return _email_retry_queue
+
+
+def _is_permanent_smtp_error(error: Exception) -> bool:
+    """5xx 응답과 인증 실패는 같은 실행 안에서 다시 보내도 소용없는 오류로 봅니다."""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def _send_chunk(pool: SmtpConnectionPool, recipients: list, message_text: str, max_retries: int) -> dict:
+    """
+    수신자 묶음 하나를 발송합니다. 일시적 오류(연결 끊김, 4xx)는 지수 백오프 후 남은 수신자만 재시도합니다.
+
+    Returns:
+        dict: 실패한 수신자 → 오류 내용
+    """
+    pending, failed = list(recipients), {}
+    for attempt in range(max_retries + 1):
+        try:
+            with pool.connection() as server:
+                refused = server.sendmail(SENDER_EMAIL, pending, message_text)
+        except smtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients
+        except (smtplib.SMTPException, OSError) as e:
+            if attempt >= max_retries or _is_permanent_smtp_error(e):
+                failed.update({recipient: f"{type(e).__name__}: {e}" for recipient in pending})
+                return failed
+            time.sleep(min(30.0, 2 ** attempt) + random.uniform(0, 1))
+            continue
+
+        # 일부 수신자만 거부된 경우: 5xx는 영구 실패, 4xx는 재시도
+        for recipient, (code, response) in refused.items():
+            if code >= 500 or attempt >= max_retries:
+                failed[recipient] = f"{code} {response.decode('utf-8', 'replace') if isinstance(response, bytes) else response}"
+        pending = [recipient for recipient, (code, _) in refused.items() if recipient not in failed]
+        if not pending:
+            return failed
+        time.sleep(min(30.0, 2 ** attempt) + random.uniform(0, 1))
+    return failed
+
+
+def deliver_email(subject: str, message_text: str, recipients: list, pool: SmtpConnectionPool = None,
+                  chunk_size: int = SMTP_CHUNK_SIZE, max_retries: int = SMTP_MAX_RETRIES) -> dict:
+    """
+    수신자를 chunk_size명씩 나누어 연결 풀의 연결 수만큼 병렬로 발송하고 결과를 출력합니다.
 
+    Args:
+        subject (str): 로그에 표시할 제목
+        message_text (str): 직렬화된 MIME 메시지
+        recipients (list): 수신자 목록
+        pool (SmtpConnectionPool): 연결 풀 (None이면 새로 만들고 끝나면 닫음)
+        chunk_size (int): 한 번의 SMTP 트랜잭션에 넣을 수신자 수
+        max_retries (int): 묶음별 최대 재시도 횟수
+
+    Returns:
+        dict: 실패한 수신자 → 오류 내용
+    """
+    if not recipients:
+        return {}
+    own_pool = pool is None
+    pool = pool or SmtpConnectionPool()
+    chunks = [recipients[i:i + chunk_size] for i in range(0, len(recipients), max(1, chunk_size))]
+    started = time.monotonic()
+    failures = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(SMTP_POOL_SIZE, len(chunks))) as executor:
+            for chunk_failures in executor.map(lambda chunk: _send_chunk(pool, chunk, message_text, max_retries), chunks):
+                failures.update(chunk_failures)
+    finally:
+        if own_pool:
+            pool.close()
+
+    elapsed = time.monotonic() - started
+    delivered = len(recipients) - len(failures)
+    print(f"  > 📨 '{subject[:40]}' 발송: 성공 {delivered}명 / 실패 {len(failures)}명 "
+          f"({elapsed:.1f}초, {delivered / elapsed if elapsed > 0 else delivered:.1f}명/초, "
+          f"{len(chunks)}개 묶음, 연결 {pool.connections_opened}개)")
+    for recipient, error in failures.items():
+        print(f"    - ❌ {recipient}: {error[:150]}")
+    return failures
+
+
+def drain_email_retry_queue():
+    """지난 실행에서 발송하지 못한 메시지를 먼저 재발송합니다."""
+    retry_queue = get_email_retry_queue()
+    if not retry_queue or not SENDER_EMAIL:
+        return
+    pending = retry_queue.pending()
+    if not pending:
+        return
+    print(f"\n[📮 재발송] 지난 실행에서 실패한 이메일 {sum(len(r) for _, _, _, r in pending)}건을 먼저 발송합니다...")
+    pool = SmtpConnectionPool()
+    try:
+        for message_id, subject, message_text, recipients in pending:
+            failures = deliver_email(subject or "(제목 없음)", message_text, recipients, pool=pool)
+            retry_queue.remove(message_id, [recipient for recipient in recipients if recipient not in failures])
+            retry_queue.enqueue(subject, message_text, failures)
+    finally:
+        pool.close()
+
+
+def send_gmail_report(report: Report):
+    """보고서 모델을 HTML + 일반 텍스트 이메일로 전송하는 함수 (실패한 수신자는 재시도 대기열에 기록)"""
     msg = MIMEMultipart("alternative")
-    msg["Subject"] = report_title
+    msg["Subject"] = report.title
     msg["From"] = SENDER_EMAIL
-    msg["To"] = ", ".join(RECEIVER_EMAIL)
+    # 수신자를 여러 묶음으로 나눠 보내면 각 묶음이 서로의 주소를 볼 필요가 없으므로 헤더에는 표시하지 않음
+    msg["To"] = ", ".join(RECEIVER_EMAIL) if len(RECEIVER_EMAIL) <= SMTP_CHUNK_SIZE else "undisclosed-recipients:;"
     msg["Date"] = formatdate(localtime=True)
-    msg.attach(MIMEText(html_body, 'html', 'utf-8'))
-    
+    # multipart/alternative는 뒤에 붙인 형식을 우선 표시하므로 텍스트 → HTML 순서로 첨부
+    msg.attach(MIMEText(render_email_text(report), 'plain', 'utf-8'))
+    msg.attach(MIMEText(render_email_html(report), 'html', 'utf-8'))
+    message_text = msg.as_string()
+
     try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(SENDER_EMAIL, GMAIL_PASSWORD)
-        server.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, msg.as_string())
-        server.quit()
-        print(f"  > ✅ 이메일이 {', '.join(RECEIVER_EMAIL)} 주소로 성공적으로 발송되었습니다.")
+        failures = deliver_email(report.title, message_text, RECEIVER_EMAIL)
     except Exception as e:
         print(f"  (오류) 이메일 발송에 실패했습니다: {e}")
+        failures = {recipient: str(e) for recipient in RECEIVER_EMAIL}
+
+    if not failures:
+        print(f"  > ✅ 이메일이 {len(RECEIVER_EMAIL)}명에게 성공적으로 발송되었습니다.")
+        return
+    retry_queue = get_email_retry_queue()
+    if retry_queue:
+        retry_queue.enqueue(report.title, message_text, failures)
+        print(f"  > 발송하지 못한 {len(failures)}명은 재시도 대기열에 기록했습니다 (다음 실행에서 먼저 재발송).")
 
 
 # ==============================================================================
 # --- 7. 디버깅 함수 추가 ---
 # ==============================================================================
 def debug_analysis_parsing(analyzed_data):
-    """AI 분석 결과 파싱을 디버깅하는 함수"""
-    print("\n🔍 [디버그] AI 분석 결과 파싱 테스트...")
+    """AI 분석 결과 레코드의 형식과 항목 수를 점검하는 함수"""
+    print("\n🔍 [디버그] AI 분석 결과 점검...")
+    formats = {}
+    for data in analyzed_data:
+        record = data.get('analysis_result') or AnalysisRecord.failed()
+        formats[record.source_format] = formats.get(record.source_format, 0) + 1
+    print("  응답 형식: " + ", ".join(f"{name} {count}건" for name, count in formats.items()))
     
-    for i, data in enumerate(analyzed_data[:3]):  # 처음 3개만 테스트
+    for i, data in enumerate(analyzed_data[:3]):  # 처음 3개만 출력
         print(f"\n--- 뉴스 {i+1}: {data['title'][:50]}... ---")
-        analysis_text = data.get('analysis_result', '')
-        
-        if not analysis_text or analysis_text == "AI 심층 분석에 실패했습니다.":
-            print("❌ AI 분석 결과가 없음")
+        record = data.get('analysis_result') or AnalysisRecord.failed()
+        if not record.ok:
+            print(f"❌ {record.error}")
             continue
-            
-        print(f"📄 AI 응답 전체 길이: {len(analysis_text)} 문자")
-        print(f"📄 AI 응답 첫 300자:")
-        print(analysis_text[:300])
-        print("...")
-        
-        # 주요 패턴들을 테스트
-        patterns_to_test = [
-            (r'### \*\*1\. 주요 내용 요약\*\*', "패턴1: ### **1. 주요 내용 요약**"),
-            (r'\*\*1\. 주요 내용 요약\*\*', "패턴2: **1. 주요 내용 요약**"),
-            (r'1\. 주요 내용 요약', "패턴3: 1. 주요 내용 요약"),
-            (r'## \*\*뉴스 심층 분석 보고서\*\*', "패턴4: ## **뉴스 심층 분석 보고서**"),
-        ]
-        
-        print("🔍 패턴 매칭 테스트:")
-        for pattern, description in patterns_to_test:
-            match = re.search(pattern, analysis_text)
-            print(f"  {description}: {'✅ 발견' if match else '❌ 없음'}")
+        print(f"📄 형식: {record.source_format} | 주요 내용 {len(record.summary)}개 | 시사점 {len(record.implications)}개")
+        if record.summary:
+            print(f"  첫 항목: {record.summary[0][:100]}")
 
 
 # ==============================================================================
@@ -1057,10 +4326,22 @@ if __name__ == "__main__":
     print("AI 뉴스 리포트 자동 생성 스크립트를 시작합니다.")
     print("==============================================")
     
+    # 지난 실행에서 발송하지 못한 이메일부터 처리
+    drain_email_retry_queue()
+
     print("\n[작업 시작] 뉴스 수집 및 중복 제거를 시작합니다...")
     unique_news_items = get_news_data()
     print(f"  > 총 {len(unique_news_items)}개의 고유한 뉴스를 수집했습니다.")
 
+    # 기사 저장소에 기록하고, 증분 모드면 새로 들어온 기사만 이후 단계로 전달
+    article_store = get_article_store()
+    if article_store:
+        new_news_items = article_store.record_seen(unique_news_items)
+        print(f"  > 이번 실행에서 새로 처리할 기사: {len(new_news_items)}개")
+        if INCREMENTAL_MODE:
+            print(f"  > 증분 모드: 이미 처리된 {len(unique_news_items) - len(new_news_items)}개 기사를 제외합니다.")
+            unique_news_items = new_news_items
+
     # AI를 사용해 정책 입안자에게 중요한 뉴스를 필터링합니다.
     news_to_analyze = filter_news_by_ai(unique_news_items)
     print(f"  > AI가 선별한 {len(news_to_analyze)}개의 핵심 뉴스를 심층 분석합니다.")
@@ -1068,35 +4349,89 @@ if __name__ == "__main__":
     # 선별되지 않은 나머지 뉴스를 찾습니다.
     analyzed_links = {item['link'] for item in news_to_analyze}
     other_news = [item for item in unique_news_items if item['link'] not in analyzed_links]
+    if article_store:
+        article_store.update_status(news_to_analyze, 'selected')
+
+    # 지연 추적 모드: 선별된 뉴스만 지금 추적하고, 기타 뉴스는 분석과 병행하여 백그라운드로 추적
+    other_news_resolver = None
+    if LAZY_URL_RESOLUTION:
+        print(f"\n🔗 선별된 {len(news_to_analyze)}개 뉴스의 최종 URL을 추적합니다...")
+        news_to_analyze = resolve_news_items(news_to_analyze)
+        if LAZY_RESOLVE_OTHER_NEWS:
+            other_news_resolver = start_background_resolution(other_news)
 
 
     analyzed_results = []
+    docs_writer = None
     if news_to_analyze:
+        # 문서 생성·공유 설정을 분석 시작 전에 끝내고, 분석 결과는 나오는 대로 문서에 덧붙임
+        if DOCS_INCREMENTAL:
+            print("\n[🚀 작업 중] 구글 문서 보고서를 미리 생성합니다...")
+            docs_writer = IncrementalDocsWriter()
+            if not docs_writer.open():
+                docs_writer = None
+
         print("\n[🚀 작업 중] 선택된 뉴스에 대한 심층 분석을 시작합니다...")
-        for i, item in enumerate(news_to_analyze):
-            print(f"  ({i+1}/{len(news_to_analyze)}) 분석 중: {item['title'][:40]}...")
-            
-            # 💡💡💡 --- [수정] AI 분석 전, 뉴스 본문 수집 단계 추가 --- 💡💡💡
-            print(f"      -> 본문 수집 중...")
-            item['content'] = get_article_content(item['link'])
-            if "실패" in item['content'] or "추출하지 못했습니다" in item['content']:
-                 print(f"      (경고) {item['content']}")
+        # 본문 수집과 AI 분석을 겹쳐 진행하는 스트리밍 파이프라인 (결과는 원래 순서 유지)
+        analyzed_results = run_analysis_pipeline(news_to_analyze, on_result=docs_writer.append if docs_writer else None)
+
+    unselected_news = other_news
+    if other_news_resolver:
+        try:
+            other_news = other_news_resolver.result()
+        except Exception as e:
+            print(f"  (경고) 기타 뉴스 URL 백그라운드 추적 실패: {str(e)[:100]}")
+        # 추적 결과 선별 기사와 같은 기사로 리디렉션된 기타 뉴스는 보고서에서 제외
+        selected_links = {normalize_news_link(item['link']) for item in news_to_analyze}
+        other_news = [item for item in other_news if normalize_news_link(item['link']) not in selected_links]
+        print(f"  > 기타 뉴스 URL 추적 완료: {len(unselected_news)}개 → 중복 제거 후 {len(other_news)}개")
+
+    if article_store:
+        article_store.update_status([item for item in analyzed_results if item['analysis_result'].ok], 'analyzed')
+        article_store.update_status([item for item in analyzed_results if not item['analysis_result'].ok], 'failed')
+        article_store.update_status(unselected_news, 'not_selected')
+
+    body_store = get_body_store()
+    if body_store.hits or body_store.evicted:
+        print(f"\n📦 본문 재사용: {body_store.hits}건 (재다운로드 생략), 한도 초과로 폐기: {body_store.evicted}건")
+    body_store.clear()
 
-            analysis = analyze_news_with_ai(item)
-            item['analysis_result'] = analysis
-            analyzed_results.append(item)
+    extraction_profiles = get_extraction_profiles()
+    if extraction_profiles and (extraction_profiles.hits or extraction_profiles.misses or extraction_profiles.learned):
+        print(f"🧭 본문 추출 프로필: 적중 {extraction_profiles.hits}건, 실패 {extraction_profiles.misses}건, "
+              f"신규 학습/교체 {extraction_profiles.learned}건")
 
     # 🔍 디버깅 함수 실행
+    run_succeeded = True
     if analyzed_results:
         debug_analysis_parsing(analyzed_results)
         
-        print("\n[🚀 작업 중] 구글 문서 보고서를 생성하고 있습니다...")
-        generated_doc_url, report_title = generate_google_doc_report(analyzed_results)
+        # 보고서 모델을 한 번 만들어 구글 문서(대체 경로)와 이메일에서 함께 사용
+        report = build_report(analyzed_results, other_news, docs_writer.document_title if docs_writer else None)
+        generated_doc_url, report_title = docs_writer.close() if docs_writer else (None, None)
+        if not report_title:
+            print("\n[🚀 작업 중] 구글 문서 보고서를 생성하고 있습니다...")
+            generated_doc_url, report_title = generate_google_doc_report(report)
 
         if report_title:
             print("\n[🚀 작업 중] 생성된 리포트를 이메일로 발송합니다...")
-            # 'other_news' 리스트를 함께 전달합니다.
-            send_gmail_report(report_title, analyzed_results, generated_doc_url, other_news)
+            report.doc_url = generated_doc_url
+            send_gmail_report(report)
+        else:
+            run_succeeded = False
+
+    # 보고서까지 만들어진 경우에만 피드 ETag/Last-Modified를 저장 (실패하면 다음 실행에서 전체 피드를 다시 받음)
+    feed_state = get_feed_state()
+    if feed_state:
+        if run_succeeded:
+            feed_state.commit_pending()
+        else:
+            print("  (정보) 보고서 생성에 실패하여 피드 조건부 요청 정보를 저장하지 않습니다.")
+
+    analysis_cache = get_analysis_cache() if analyzed_results else None
+    if analysis_cache and (analysis_cache.hits or analysis_cache.misses):
+        print(f"\n🧠 분석 캐시: 적중 {analysis_cache.hits}건, 미스 {analysis_cache.misses}건, "
+              f"절약한 토큰 약 {analysis_cache.tokens_saved:,}개")
 
     print("\n==============================================")
     print("🎉 모든 작업이 완료되었습니다!")
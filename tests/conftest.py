@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_automation_script_v4 as news  # noqa: E402
+
+
+@pytest.fixture
+def state_db(tmp_path, monkeypatch):
+    """테스트마다 빈 상태 저장소를 쓰도록 경로를 바꾸고, 저장소를 쓰는 싱글턴을 초기화합니다."""
+    news.close_state_db()
+    monkeypatch.setattr(news, "STATE_DB_PATH", str(tmp_path / "state.sqlite3"))
+    for name in ("_email_retry_queue", "_docs_job_store", "_feed_state"):
+        monkeypatch.setattr(news, name, None)
+    yield news
+    news.close_state_db()
@@ -0,0 +1,111 @@
+"""aiosmtpd 로컬 서버로 연결 풀 발송, 4xx 부분 거부 재시도, 재시도 대기열 적재·재발송을 점검합니다."""
+import socket
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from conftest import news  # noqa: E402
+
+
+class RecordingHandler:
+    """수신자별 응답을 조정할 수 있는 SMTP 처리기 (temporary: 첫 시도만 451, permanent: 항상 550)."""
+
+    def __init__(self):
+        self.temporary = set()
+        self.permanent = set()
+        self.delivered = []
+        self.transactions = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.permanent:
+            return "550 5.1.1 No such user"
+        if address in self.temporary:
+            self.temporary.discard(address)
+            return "451 4.3.0 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.transactions += 1
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(state_db, monkeypatch):
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    monkeypatch.setattr(news, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(news, "SMTP_PORT", port)
+    monkeypatch.setattr(news, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(news, "GMAIL_PASSWORD", None)
+    monkeypatch.setattr(news, "SENDER_EMAIL", "sender@example.com")
+    monkeypatch.setattr(news, "SMTP_POOL_SIZE", 2)
+    monkeypatch.setattr(news.time, "sleep", lambda seconds: None)  # 재시도 백오프 생략
+    yield handler
+    controller.stop()
+
+
+MESSAGE = "Subject: test\r\n\r\nbody\r\n"
+
+
+def test_pooled_delivery_reuses_connections(smtp_server):
+    recipients = [f"user{i}@example.com" for i in range(12)]
+    pool = news.SmtpConnectionPool(size=2)
+    try:
+        failures = news.deliver_email("test", MESSAGE, recipients, pool=pool, chunk_size=3)
+    finally:
+        pool.close()
+
+    assert failures == {}
+    assert sorted(smtp_server.delivered) == sorted(recipients)
+    assert smtp_server.transactions == 4
+    assert pool.connections_opened <= 2
+
+
+def test_partial_4xx_refusal_is_retried(smtp_server):
+    smtp_server.temporary.add("busy@example.com")
+    smtp_server.permanent.add("gone@example.com")
+    recipients = ["ok@example.com", "busy@example.com", "gone@example.com"]
+
+    failures = news.deliver_email("test", MESSAGE, recipients, chunk_size=10)
+
+    assert list(failures) == ["gone@example.com"]
+    assert failures["gone@example.com"].startswith("550")
+    assert sorted(smtp_server.delivered) == ["busy@example.com", "ok@example.com"]
+
+
+def test_failures_are_queued_and_drained_next_run(smtp_server):
+    smtp_server.permanent.add("later@example.com")
+    failures = news.deliver_email("test", MESSAGE, ["now@example.com", "later@example.com"])
+    retry_queue = news.get_email_retry_queue()
+    retry_queue.enqueue("test", MESSAGE, failures)
+    assert [recipients for _, _, _, recipients in retry_queue.pending()] == [["later@example.com"]]
+
+    # 다음 실행: 수신 서버가 복구된 뒤 대기열을 먼저 비움
+    smtp_server.permanent.clear()
+    news.drain_email_retry_queue()
+
+    assert retry_queue.pending() == []
+    assert smtp_server.delivered.count("later@example.com") == 1
+
+
+def test_queue_gives_up_after_max_runs(state_db, monkeypatch):
+    monkeypatch.setattr(news, "SMTP_RETRY_MAX_RUNS", 2)
+    retry_queue = news.get_email_retry_queue()
+    failure = {"later@example.com": "451 Try again later"}
+
+    retry_queue.enqueue("test", MESSAGE, failure)  # 처음 실패
+    for _ in range(2):  # 다음 실행에서의 재발송 2회 실패까지는 보관
+        assert retry_queue.pending()
+        retry_queue.enqueue("test", MESSAGE, failure)
+    assert retry_queue.pending() == []
@@ -0,0 +1,138 @@
+"""로컬 대체 API 서버(GOOGLE_API_ENDPOINT)로 구글 서비스 생성·문서 작성과 토큰 갱신 시점을 점검합니다."""
+import datetime
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+discovery = pytest.importorskip("googleapiclient.discovery")
+google_credentials = pytest.importorskip("google.oauth2.credentials")
+
+from conftest import news  # noqa: E402
+
+
+class StubGoogleApi(BaseHTTPRequestHandler):
+    """Docs v1 / Drive v3 중 보고서 작성에 쓰는 호출만 흉내 내는 처리기 (요청은 server.calls에 기록)."""
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        path = self.path.split("?")[0]
+        self.server.calls.append(("POST", path))
+        if path == "/v1/documents":
+            self._reply(200, {"documentId": "doc-1", "title": body.get("title")})
+        elif path == "/drive/v3/files/doc-1/permissions":
+            self._reply(200, {"id": "anyoneWithLink", **body})
+        elif path == "/v1/documents/doc-1:batchUpdate":
+            if self.server.fail_next_batch:
+                self.server.fail_next_batch = False
+                self._reply(503, {"error": {"code": 503, "message": "backend unavailable"}})
+                return
+            self.server.batches.append(body["requests"])
+            self._reply(200, {"documentId": "doc-1", "replies": []})
+        else:
+            self._reply(404, {"error": {"code": 404, "message": path}})
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        self.server.calls.append(("GET", path))
+        self._reply(200, {"documentId": "doc-1", "body": {"content": [{"endIndex": 1}]}})
+
+
+@pytest.fixture
+def google_api(tmp_path, monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), StubGoogleApi)
+    server.calls, server.batches, server.fail_next_batch = [], [], False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.chdir(tmp_path)  # token.json 없음 → 익명 자격 증명
+    monkeypatch.setattr(news, "GOOGLE_API_ENDPOINT", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setattr(news, "_google_services", None)
+    monkeypatch.setattr(news.time, "sleep", lambda seconds: None)  # 재시도 백오프 생략
+
+    built = []
+    original_build = discovery.build
+
+    def counting_build(service_name, version, **kwargs):
+        built.append((service_name, version, kwargs.get("static_discovery")))
+        return original_build(service_name, version, **kwargs)
+
+    monkeypatch.setattr(discovery, "build", counting_build)
+    server.built = built
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_docs_setup_against_local_endpoint(google_api):
+    docs_service, drive_service = news.get_google_docs_service()
+    assert news.get_google_docs_service() == (docs_service, drive_service)
+    assert google_api.built == [("docs", "v1", True), ("drive", "v3", True)]
+
+    document_id, document_url = news.create_shared_document(docs_service, drive_service, "테스트 보고서")
+    assert document_id == "doc-1"
+    assert document_url.endswith("/doc-1/edit")
+
+    builder = news.DocsRequestBuilder()
+    builder.add_text("제목\n")
+    builder.add_text("본문 문단\n")
+    batches = builder.batches()
+    google_api.fail_next_batch = True  # 첫 batchUpdate는 503 → 끝 위치 확인 후 재전송
+    committed = []
+    assert news.submit_docs_batches(docs_service, document_id, batches, on_commit=committed.append) == len(batches)
+
+    assert committed == list(range(1, len(batches) + 1))
+    assert google_api.batches == [batch["requests"] for batch in batches]
+    assert ("POST", "/drive/v3/files/doc-1/permissions") in google_api.calls
+    assert ("GET", "/v1/documents/doc-1") in google_api.calls
+
+
+def _credentials(expires_in: float = None, token: str = "access-token"):
+    expiry = None
+    if expires_in is not None:
+        expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(seconds=expires_in)
+    return google_credentials.Credentials(token=token, refresh_token="refresh-token", expiry=expiry,
+                                          client_id="id", client_secret="secret", token_uri="http://127.0.0.1/token")
+
+
+def test_token_refresh_only_near_expiry():
+    assert not news._token_needs_refresh(_credentials(expires_in=3600), margin_seconds=300)
+    assert news._token_needs_refresh(_credentials(expires_in=120), margin_seconds=300)
+    assert news._token_needs_refresh(_credentials(expires_in=-60), margin_seconds=300)
+    assert news._token_needs_refresh(_credentials(expires_in=3600, token=None), margin_seconds=300)
+    assert not news._token_needs_refresh(_credentials(expires_in=None), margin_seconds=300)
+
+
+def test_token_file_rewritten_only_after_refresh(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(news, "GOOGLE_TOKEN_REFRESH_MARGIN", 300)
+    refreshed = []
+
+    def fake_refresh(self, request):
+        refreshed.append(True)
+        self.token = "refreshed-token"
+        self.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(google_credentials.Credentials, "refresh", fake_refresh)
+
+    (tmp_path / "token.json").write_text(_credentials(expires_in=3600).to_json())
+    before = (tmp_path / "token.json").read_text()
+    assert news.load_google_credentials().token == "access-token"
+    assert refreshed == [] and (tmp_path / "token.json").read_text() == before
+
+    (tmp_path / "token.json").write_text(_credentials(expires_in=60).to_json())
+    assert news.load_google_credentials().token == "refreshed-token"
+    assert refreshed == [True]
+    assert json.loads((tmp_path / "token.json").read_text())["token"] == "refreshed-token"